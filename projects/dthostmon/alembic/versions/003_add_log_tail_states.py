@@ -0,0 +1,56 @@
+"""
+Database migration: Add log_tail_states table
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Stores per-(host, log path) byte offsets, inodes and rolling hashes so that
+SSHClient tail mode only retrieves bytes appended since the previous run.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# Revision identifiers
+revision = '003_add_log_tail_states'
+down_revision = '002_add_last_report_sent'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Create log_tail_states table
+    
+    - inode: Remote inode at last retrieval (rotation detection)
+    - offset: Number of bytes already retrieved
+    - file_size: Remote file size at last retrieval (truncation detection)
+    - rolling_hash: Chained SHA256 used as the log's content hash in tail mode
+    """
+    op.create_table(
+        'log_tail_states',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('host_id', sa.Integer(), sa.ForeignKey('hosts.id'), nullable=False),
+        sa.Column('log_file_path', sa.String(500), nullable=False),
+        sa.Column('inode', sa.String(32), nullable=True),
+        sa.Column('offset', sa.BigInteger(), nullable=True),
+        sa.Column('file_size', sa.BigInteger(), nullable=True),
+        sa.Column('rolling_hash', sa.String(64), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.UniqueConstraint('host_id', 'log_file_path', name='uq_log_tail_states_host_path')
+    )
+    op.create_index('ix_log_tail_states_host_id', 'log_tail_states', ['host_id'])
+    
+    print("✅ Migration complete: Created log_tail_states table")
+    print("ℹ️  Enable with ssh.tail_mode: true - first run per log still reads the full file")
+
+
+def downgrade():
+    """
+    Drop log_tail_states table
+    
+    WARNING: Next tail-mode run will re-read every log in full!
+    """
+    op.drop_index('ix_log_tail_states_host_id', 'log_tail_states')
+    op.drop_table('log_tail_states')
+    
+    print("⚠️  Migration rollback complete: Dropped log_tail_states table")
@@ -0,0 +1,58 @@
+"""
+Database migration: Add content-addressed log_blobs table
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Log content is stored once per distinct text in log_blobs (keyed by SHA256)
+and referenced from log_entries.blob_hash, instead of inline on every run.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# Revision identifiers
+revision = '004_add_log_blobs'
+down_revision = '003_add_log_tail_states'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Create log_blobs table and add log_entries.blob_hash
+    
+    - hash: SHA256 of the content (UTF-8), primary key
+    - ref_count: Number of log_entries rows referencing the blob
+    
+    Existing rows keep their inline content and stay readable; they are not
+    rewritten here to avoid one huge transaction on large tables.
+    """
+    op.create_table(
+        'log_blobs',
+        sa.Column('hash', sa.String(64), primary_key=True),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=True),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=True)
+    )
+    op.add_column('log_entries', sa.Column('blob_hash', sa.String(64), nullable=True))
+    op.create_foreign_key('fk_log_entries_blob_hash', 'log_entries', 'log_blobs',
+                          ['blob_hash'], ['hash'])
+    op.create_index('ix_log_entries_blob_hash', 'log_entries', ['blob_hash'])
+    
+    print("✅ Migration complete: Created log_blobs table and log_entries.blob_hash")
+    print("ℹ️  New log content is deduplicated; existing rows keep their inline content")
+
+
+def downgrade():
+    """
+    Drop log_blobs table and log_entries.blob_hash
+    
+    WARNING: Content of log entries written after the upgrade is lost!
+    """
+    op.drop_index('ix_log_entries_blob_hash', 'log_entries')
+    op.drop_constraint('fk_log_entries_blob_hash', 'log_entries', type_='foreignkey')
+    op.drop_column('log_entries', 'blob_hash')
+    op.drop_table('log_blobs')
+    
+    print("⚠️  Migration rollback complete: Dropped log_blobs table")
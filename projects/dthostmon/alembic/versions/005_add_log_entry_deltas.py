@@ -0,0 +1,57 @@
+"""
+Database migration: Add delta storage columns to log_entries
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Lets a log entry store only the text appended since the previous snapshot of
+the same (host, path), see database.delta_storage.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# Revision identifiers
+revision = '005_add_log_entry_deltas'
+down_revision = '004_add_log_blobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Add delta storage columns to log_entries
+    
+    - text_hash / text_length: SHA256 and length of the full text (append detection)
+    - delta_base_id: Previous snapshot this entry is a delta against (NULL = keyframe)
+    - delta_prefix_length: Characters of the base kept before the stored text
+    - delta_depth: Deltas since the last keyframe
+    """
+    op.add_column('log_entries', sa.Column('text_hash', sa.String(64), nullable=True))
+    op.add_column('log_entries', sa.Column('text_length', sa.BigInteger(), nullable=True))
+    op.add_column('log_entries', sa.Column('delta_base_id', sa.Integer(), nullable=True))
+    op.add_column('log_entries', sa.Column('delta_prefix_length', sa.BigInteger(), nullable=True))
+    op.add_column('log_entries', sa.Column('delta_depth', sa.Integer(), nullable=True))
+    op.create_foreign_key('fk_log_entries_delta_base_id', 'log_entries', 'log_entries',
+                          ['delta_base_id'], ['id'])
+    op.create_index('ix_log_entries_delta_base_id', 'log_entries', ['delta_base_id'])
+    
+    print("✅ Migration complete: Added delta storage columns to log_entries")
+    print("ℹ️  Enable with database.delta_storage: true - the first snapshot of each log is a keyframe")
+
+
+def downgrade():
+    """
+    Drop delta storage columns from log_entries
+    
+    WARNING: Delta entries can no longer be reconstructed! Disable
+    database.delta_storage and prune delta entries before downgrading.
+    """
+    op.drop_index('ix_log_entries_delta_base_id', 'log_entries')
+    op.drop_constraint('fk_log_entries_delta_base_id', 'log_entries', type_='foreignkey')
+    op.drop_column('log_entries', 'delta_depth')
+    op.drop_column('log_entries', 'delta_prefix_length')
+    op.drop_column('log_entries', 'delta_base_id')
+    op.drop_column('log_entries', 'text_length')
+    op.drop_column('log_entries', 'text_hash')
+    
+    print("⚠️  Migration rollback complete: Dropped delta storage columns")
@@ -0,0 +1,107 @@
+"""
+Database migration: Store large text columns compressed
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Converts log_blobs.content, log_entries.content, monitoring_runs.ai_summary
+and monitoring_runs.ai_recommendations to the CompressedText format: binary
+with a one-byte codec marker (see dthostmon.models.compressed).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from dthostmon.models.compressed import compress_text, decompress_text
+
+
+# Revision identifiers
+revision = '006_compress_text_columns'
+down_revision = '005_add_log_entry_deltas'
+branch_labels = None
+depends_on = None
+
+# (table, column, key column ordering the batches)
+COLUMNS = [
+    ('log_blobs', 'content', 'hash'),
+    ('log_entries', 'content', 'id'),
+    ('monitoring_runs', 'ai_summary', 'id'),
+    ('monitoring_runs', 'ai_recommendations', 'id'),
+]
+
+BATCH_SIZE = 500
+
+
+def _backfill(table: str, column: str, shadow: str, key: str, convert, where: str = 'TRUE') -> int:
+    """Copy converted values of column into shadow in key order, BATCH_SIZE rows at a time"""
+    bind = op.get_bind()
+    last = '' if key == 'hash' else 0
+    total = 0
+    
+    while True:
+        rows = bind.execute(sa.text(
+            f"SELECT {key}, {column} FROM {table} "
+            f"WHERE {key} > :last AND {column} IS NOT NULL AND {where} "
+            f"ORDER BY {key} LIMIT :limit"
+        ), {'last': last, 'limit': BATCH_SIZE}).all()
+        if not rows:
+            break
+        
+        bind.execute(
+            sa.text(f"UPDATE {table} SET {shadow} = :value WHERE {key} = :key"),
+            [{'key': row[0], 'value': convert(row[1])} for row in rows]
+        )
+        last = rows[-1][0]
+        total += len(rows)
+    
+    return total
+
+
+def _convert_column(table: str, column: str, key: str, type_, convert):
+    """
+    Replace a column by a converted copy without rewriting the table under lock
+    
+    A nullable shadow column is added and backfilled in batches, each committed
+    on its own (autocommit block), so only the rows of one batch are locked at
+    a time. The final step, in the migration transaction, converts rows
+    written during the backfill, then drops the old column and renames the
+    shadow column (catalog changes only).
+    """
+    shadow = f"{column}_converted"
+    nullable = next(
+        info['nullable'] for info in sa.inspect(op.get_bind()).get_columns(table) if info['name'] == column
+    )
+    op.add_column(table, sa.Column(shadow, type_, nullable=True))
+    
+    with op.get_context().autocommit_block():
+        total = _backfill(table, column, shadow, key, convert)
+    
+    total += _backfill(table, column, shadow, key, convert, where=f"{shadow} IS NULL")
+    op.drop_column(table, column)
+    op.alter_column(table, shadow, new_column_name=column, nullable=nullable)
+    
+    print(f"   {table}.{column}: {total} rows rewritten")
+
+
+def upgrade():
+    """
+    Convert text columns to compressed binary
+    
+    Values above the size threshold are compressed, the rest are marked raw
+    (0x00). Stop the monitor while the migration runs; rows changed after
+    their batch was copied would keep their old value.
+    """
+    for table, column, key in COLUMNS:
+        _convert_column(table, column, key, sa.LargeBinary(), compress_text)
+    
+    print("✅ Migration complete: Text columns stored compressed")
+
+
+def downgrade():
+    """
+    Convert compressed columns back to text
+    
+    Requires the zstandard package if values were written with zstd.
+    """
+    for table, column, key in COLUMNS:
+        _convert_column(table, column, key, sa.Text(), lambda value: decompress_text(bytes(value)))
+    
+    print("⚠️  Migration rollback complete: Text columns stored uncompressed")
@@ -0,0 +1,63 @@
+"""
+Database migration: Composite and partial indexes for hot queries
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Replaces single-column indexes that the orchestrator, report scheduler and
+API queries could only partially use. Query plans are checked by
+tests/integration/test_query_plans.py.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# Revision identifiers
+revision = '007_add_composite_indexes'
+down_revision = '006_compress_text_columns'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Create composite/partial indexes
+    
+    - monitoring_runs (host_id, run_date): latest run / history per host,
+      replaces ix_monitoring_runs_host_id
+    - baselines (host_id, log_file_path) WHERE is_active: active baseline lookups
+    - detected_changes (monitoring_run_id, detected_at): changes of a run,
+      replaces ix_detected_changes_monitoring_run_id
+    - log_blobs (hash) WHERE ref_count <= 0: blob garbage collection
+    """
+    op.create_index('ix_monitoring_runs_host_run_date', 'monitoring_runs', ['host_id', 'run_date'])
+    op.drop_index('ix_monitoring_runs_host_id', 'monitoring_runs')
+    
+    op.create_index('ix_baselines_active_host_path', 'baselines', ['host_id', 'log_file_path'],
+                    postgresql_where=sa.text('is_active'))
+    
+    op.create_index('ix_detected_changes_run_detected_at', 'detected_changes',
+                    ['monitoring_run_id', 'detected_at'])
+    op.drop_index('ix_detected_changes_monitoring_run_id', 'detected_changes')
+    
+    op.create_index('ix_log_blobs_unreferenced', 'log_blobs', ['hash'],
+                    postgresql_where=sa.text('ref_count <= 0'))
+    
+    print("✅ Migration complete: Added composite and partial indexes")
+    print("ℹ️  Run ANALYZE so the planner picks them up immediately")
+
+
+def downgrade():
+    """
+    Restore the single-column indexes
+    """
+    op.drop_index('ix_log_blobs_unreferenced', 'log_blobs')
+    
+    op.create_index('ix_detected_changes_monitoring_run_id', 'detected_changes', ['monitoring_run_id'])
+    op.drop_index('ix_detected_changes_run_detected_at', 'detected_changes')
+    
+    op.drop_index('ix_baselines_active_host_path', 'baselines')
+    
+    op.create_index('ix_monitoring_runs_host_id', 'monitoring_runs', ['host_id'])
+    op.drop_index('ix_monitoring_runs_host_run_date', 'monitoring_runs')
+    
+    print("⚠️  Migration rollback complete: Restored single-column indexes")
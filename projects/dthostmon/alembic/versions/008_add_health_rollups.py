@@ -0,0 +1,59 @@
+"""
+Database migration: Add health_rollups table
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Hourly and daily health summaries per host, written by the maintain command
+so history outlives the raw monitoring runs (maintenance.raw_days).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# Revision identifiers
+revision = '008_add_health_rollups'
+down_revision = '007_add_composite_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Create health_rollups table
+    
+    - period: 'hour' or 'day'; period_start is the UTC start of the period
+    - health_sum / health_count: average = sum / count (runs with a score)
+    """
+    op.create_table(
+        'health_rollups',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('host_id', sa.Integer(), sa.ForeignKey('hosts.id'), nullable=False),
+        sa.Column('period', sa.String(10), nullable=False),
+        sa.Column('period_start', sa.DateTime(), nullable=False),
+        sa.Column('run_count', sa.Integer(), nullable=True),
+        sa.Column('failed_count', sa.Integer(), nullable=True),
+        sa.Column('health_count', sa.Integer(), nullable=True),
+        sa.Column('health_sum', sa.Integer(), nullable=True),
+        sa.Column('health_min', sa.Integer(), nullable=True),
+        sa.Column('health_max', sa.Integer(), nullable=True),
+        sa.Column('anomalies_total', sa.Integer(), nullable=True),
+        sa.Column('changes_total', sa.Integer(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.UniqueConstraint('host_id', 'period', 'period_start', name='uq_health_rollups_host_period')
+    )
+    op.create_index('ix_health_rollups_period_start', 'health_rollups', ['period_start'])
+    
+    print("✅ Migration complete: Created health_rollups table")
+    print("ℹ️  Run 'dthostmon_cli.py maintain' to roll up existing history")
+
+
+def downgrade():
+    """
+    Drop health_rollups table
+    
+    WARNING: History older than maintenance.raw_days is lost!
+    """
+    op.drop_index('ix_health_rollups_period_start', 'health_rollups')
+    op.drop_table('health_rollups')
+    
+    print("⚠️  Migration rollback complete: Dropped health_rollups table")
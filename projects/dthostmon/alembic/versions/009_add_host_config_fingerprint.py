@@ -0,0 +1,42 @@
+"""
+Database migration: Add config_fingerprint column to hosts table
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+The host sync only writes hosts whose configuration fingerprint changed and
+disables config-managed hosts removed from the configuration.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# Revision identifiers
+revision = '009_add_host_config_fingerprint'
+down_revision = '008_add_health_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Add config_fingerprint column to hosts table
+    
+    - config_fingerprint: VARCHAR(64) - SHA256 of the host's configuration block
+    
+    Existing hosts start with NULL: the next monitoring cycle rewrites every
+    configured host once and records its fingerprint. Hosts that are not in the
+    configuration (e.g. registered through the API) keep NULL and are never
+    disabled by the sync.
+    """
+    op.add_column('hosts', sa.Column('config_fingerprint', sa.String(64), nullable=True))
+    
+    print("✅ Migration complete: Added config_fingerprint column to hosts table")
+
+
+def downgrade():
+    """
+    Remove config_fingerprint column from hosts table
+    """
+    op.drop_column('hosts', 'config_fingerprint')
+    
+    print("⚠️  Migration rolled back: Removed config_fingerprint column from hosts table")
@@ -0,0 +1,55 @@
+"""
+Database migration: Add analysis_cache table
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+AI analyses keyed by host, log content hashes, model and prompt version, so
+hosts whose logs did not change skip the model call (ai.cache).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# Revision identifiers
+revision = '010_add_analysis_cache'
+down_revision = '009_add_host_config_fingerprint'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Create analysis_cache table
+    
+    - cache_key: SHA256 of host ID, prompt version and the sorted log hashes
+    - analysis: JSON, stored like other large text columns (marker byte + compressed)
+    """
+    op.create_table(
+        'analysis_cache',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('host_id', sa.Integer(), sa.ForeignKey('hosts.id'), nullable=False),
+        sa.Column('cache_key', sa.String(64), nullable=False),
+        sa.Column('model', sa.String(255), nullable=False),
+        sa.Column('analysis', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('last_used_at', sa.DateTime(), nullable=True),
+        sa.Column('hit_count', sa.Integer(), nullable=True),
+        sa.UniqueConstraint('cache_key', 'model', name='uq_analysis_cache_key_model')
+    )
+    op.create_index('ix_analysis_cache_host_id', 'analysis_cache', ['host_id'])
+    op.create_index('ix_analysis_cache_created_at', 'analysis_cache', ['created_at'])
+    op.create_index('ix_analysis_cache_last_used_at', 'analysis_cache', ['last_used_at'])
+    
+    print("✅ Migration complete: Created analysis_cache table")
+
+
+def downgrade():
+    """
+    Drop analysis_cache table (cached analyses are simply recomputed)
+    """
+    op.drop_index('ix_analysis_cache_last_used_at', 'analysis_cache')
+    op.drop_index('ix_analysis_cache_created_at', 'analysis_cache')
+    op.drop_index('ix_analysis_cache_host_id', 'analysis_cache')
+    op.drop_table('analysis_cache')
+    
+    print("⚠️  Migration rollback complete: Dropped analysis_cache table")
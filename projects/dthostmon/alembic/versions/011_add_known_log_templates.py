@@ -0,0 +1,50 @@
+"""
+Database migration: Add known_log_templates table
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Log line templates seen per host, so the local pre-classifier (ai.pre_classifier)
+can send hosts with never-seen lines to the AI model.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# Revision identifiers
+revision = '011_add_known_log_templates'
+down_revision = '010_add_analysis_cache'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Create known_log_templates table
+    
+    - template: mined template text (variable tokens as <*>)
+    - template_hash: SHA256 of the template (unique per host)
+    - last_seen: templates not seen for ai.pre_classifier.template_ttl_days are forgotten
+    """
+    op.create_table(
+        'known_log_templates',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('host_id', sa.Integer(), sa.ForeignKey('hosts.id'), nullable=False),
+        sa.Column('template_hash', sa.String(64), nullable=False),
+        sa.Column('template', sa.Text(), nullable=False),
+        sa.Column('first_seen', sa.DateTime(), nullable=True),
+        sa.Column('last_seen', sa.DateTime(), nullable=True),
+        sa.UniqueConstraint('host_id', 'template_hash', name='uq_known_log_templates_host_hash')
+    )
+    op.create_index('ix_known_log_templates_last_seen', 'known_log_templates', ['last_seen'])
+    
+    print("✅ Migration complete: Created known_log_templates table")
+
+
+def downgrade():
+    """
+    Drop known_log_templates table (every template counts as new again)
+    """
+    op.drop_index('ix_known_log_templates_last_seen', 'known_log_templates')
+    op.drop_table('known_log_templates')
+    
+    print("⚠️  Migration rollback complete: Dropped known_log_templates table")
@@ -0,0 +1,53 @@
+"""
+Database migration: Add run_date to log_entries
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Copies the date of the owning monitoring run into each log entry, so
+log_entries can be partitioned by the same key as monitoring_runs (a run and
+its entries always land in the same month, see models/partitioning.py).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# Revision identifiers
+revision = '012_add_log_entry_run_date'
+down_revision = '011_add_known_log_templates'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+
+def upgrade():
+    """
+    Add log_entries.run_date and fill it from monitoring_runs
+    
+    The backfill runs in id ranges, each committed on its own.
+    """
+    op.add_column('log_entries', sa.Column('run_date', sa.DateTime(), nullable=True))
+    
+    bind = op.get_bind()
+    last = bind.execute(sa.text("SELECT max(id) FROM log_entries")).scalar() or 0
+    with op.get_context().autocommit_block():
+        for start in range(0, last, BATCH_SIZE):
+            bind.execute(sa.text(
+                "UPDATE log_entries SET run_date = "
+                "(SELECT run_date FROM monitoring_runs WHERE monitoring_runs.id = log_entries.monitoring_run_id) "
+                "WHERE id > :start AND id <= :end"
+            ), {'start': start, 'end': start + BATCH_SIZE})
+    
+    print("✅ Migration complete: Added run_date to log_entries")
+
+
+def downgrade():
+    """
+    Drop log_entries.run_date
+    
+    Convert partitioned log_entries back to a plain table first; run_date is
+    its partition key.
+    """
+    op.drop_column('log_entries', 'run_date')
+    
+    print("⚠️  Migration rollback complete: Dropped run_date from log_entries")
@@ -1,6 +1,6 @@
 #!/bin/bash
 # Docker entrypoint for dthostmon
-# Last Updated: 11/14/2025 12:00:00 PM CDT
+# Last Updated: 10/16/2026 12:00:00 PM CDT
 
 set -e
 
@@ -29,6 +29,8 @@ start_combined() {
     CRON_SCHEDULE="0 */$((CRON_INTERVAL / 3600)) * * *"
     
     echo "$CRON_SCHEDULE cd /app && /usr/local/bin/python3 src/dthostmon_cli.py -c /opt/dthostmon/config/dthostmon.yaml monitor >> /opt/dthostmon/logs/cron.log 2>&1" > /etc/cron.d/dthostmon
+    # Daily history retention/rollups outside the hourly monitoring slot
+    echo "${MAINTAIN_SCHEDULE:-30 3 * * *} cd /app && /usr/local/bin/python3 src/dthostmon_cli.py -c /opt/dthostmon/config/dthostmon.yaml maintain >> /opt/dthostmon/logs/cron.log 2>&1" >> /etc/cron.d/dthostmon
     chmod 0644 /etc/cron.d/dthostmon
     crontab /etc/cron.d/dthostmon
     
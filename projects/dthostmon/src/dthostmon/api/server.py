@@ -1,19 +1,21 @@
 """
 REST API server for dthostmon
-Last Updated: 11/14/2025 12:00:00 PM CDT
+Last Updated: 10/16/2026 12:00:00 PM CDT
 
 FastAPI server exposing read-only endpoints for monitoring results.
 """
 
 from fastapi import FastAPI, HTTPException, Depends, Security
 from fastapi.security import APIKeyHeader
-from typing import List, Optional
+from typing import List, Literal, Optional
 from datetime import datetime, timedelta
 from pydantic import BaseModel
 import logging
 
 from ..models.database import Host, MonitoringRun, DetectedChange, LogEntry
 from ..models import DatabaseManager
+from ..models.health_series import history_resolution, history_series
+from ..models.log_history import reconstruct_entries
 
 logger = logging.getLogger(__name__)
 
@@ -244,8 +246,12 @@ def create_app(db_manager: DatabaseManager, api_key: str) -> FastAPI:
             ]
     
     @app.get("/logs/{run_id}", tags=["Logs"])
-    async def get_logs(run_id: int, api_key_value: str = Depends(verify_api_key)):
-        """Get log entries for a monitoring run"""
+    async def get_logs(
+        run_id: int,
+        include_content: bool = False,
+        api_key_value: str = Depends(verify_api_key)
+    ):
+        """Get log entries for a monitoring run (optionally with their full content)"""
         with db_manager.get_session() as session:
             run = session.query(MonitoringRun).filter(MonitoringRun.id == run_id).first()
             if not run:
@@ -257,6 +263,9 @@ def create_app(db_manager: DatabaseManager, api_key: str) -> FastAPI:
                 .all()
             )
             
+            # Delta-encoded entries are rebuilt together in one query
+            texts = reconstruct_entries(session, [log.id for log in logs]) if include_content else None
+            
             return [
                 {
                     "id": log.id,
@@ -264,7 +273,8 @@ def create_app(db_manager: DatabaseManager, api_key: str) -> FastAPI:
                     "line_count": log.line_count,
                     "file_size": log.file_size,
                     "hash": log.content_hash,
-                    "retrieved_at": log.retrieved_at.isoformat()
+                    "retrieved_at": log.retrieved_at.isoformat(),
+                    **({"content": texts.get(log.id)} if include_content else {})
                 }
                 for log in logs
             ]
@@ -273,9 +283,17 @@ def create_app(db_manager: DatabaseManager, api_key: str) -> FastAPI:
     async def get_history(
         host_id: int,
         days: int = 7,
+        resolution: Literal['auto', 'raw', 'hour', 'day'] = 'auto',
         api_key_value: str = Depends(verify_api_key)
     ):
-        """Get monitoring history for a host"""
+        """
+        Get monitoring history for a host
+        
+        resolution is 'raw' (every run), 'hour' or 'day' (health rollups); 'auto'
+        returns raw runs up to 7 days, hourly points up to 31 days and daily beyond.
+        """
+        resolution = history_resolution(days, resolution)
+        
         with db_manager.get_session() as session:
             host = session.query(Host).filter(Host.id == host_id).first()
             if not host:
@@ -283,31 +301,12 @@ def create_app(db_manager: DatabaseManager, api_key: str) -> FastAPI:
             
             cutoff_date = datetime.utcnow() - timedelta(days=days)
             
-            runs = (
-                session.query(MonitoringRun)
-                .filter(
-                    MonitoringRun.host_id == host_id,
-                    MonitoringRun.run_date >= cutoff_date
-                )
-                .order_by(MonitoringRun.run_date.asc())
-                .all()
-            )
-            
             return {
                 "host_id": host_id,
                 "host_name": host.name,
                 "period_days": days,
-                "total_runs": len(runs),
-                "runs": [
-                    {
-                        "run_date": run.run_date.isoformat(),
-                        "health_score": run.health_score,
-                        "status": run.status,
-                        "anomalies": run.anomalies_detected,
-                        "changes": run.changes_detected
-                    }
-                    for run in runs
-                ]
+                "resolution": resolution,
+                **history_series(session, host_id, cutoff_date, resolution)
             }
     
     @app.post("/hosts/register", response_model=HostRegistrationResponse, tags=["Hosts"])
@@ -1,18 +1,26 @@
 """
 Core monitoring modules for dthostmon
-Last Updated: 11/14/2025 12:00:00 PM CDT
+Last Updated: 10/16/2026 12:00:00 PM CDT
 """
 
 from .orchestrator import MonitoringOrchestrator
 from .ssh_client import SSHClient, SSHConnectionError, LogRetrievalError
+from .ssh_pool import SSHConnectionPool
+from .host_health import HostHealthTracker
+from .baseline_cache import BaselineCache
+from .async_engine import AsyncCollectionEngine
 from .ai_analyzer import AIAnalyzer, AIAnalysisError
 from .email_alert import EmailAlert, EmailError
 
 __all__ = [
     'MonitoringOrchestrator',
+    'AsyncCollectionEngine',
     'SSHClient',
     'SSHConnectionError',
     'LogRetrievalError',
+    'SSHConnectionPool',
+    'HostHealthTracker',
+    'BaselineCache',
     'AIAnalyzer',
     'AIAnalysisError',
     'EmailAlert',
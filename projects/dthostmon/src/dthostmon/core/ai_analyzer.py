@@ -1,6 +1,6 @@
 """
 AI analysis module for dthostmon using OpenCode Server
-Last Updated: 11/14/2025 12:00:00 PM CDT
+Last Updated: 10/16/2026 12:00:00 PM CDT
 
 Integrates with OpenCode Server for headless access to all available models (Grok, Copilot, etc).
 Authentication credentials are loaded from ~/.local/share/opencode/auth.json
@@ -10,12 +10,24 @@ import json
 import requests
 import time
 import subprocess
-from typing import Dict, List, Optional, Any
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 import logging
 
+from .analysis_cache import AnalysisCache
+from .analysis_chunks import chunk_sections, estimate_tokens, merge_analyses, split_section
+from .log_templates import fit_logs, summarize_log
+from .ssh_client import iter_log_lines
+from ..utils.config import Config
+
 logger = logging.getLogger(__name__)
 
+# Part of every analysis cache key - bump when the prompt or response format changes
+PROMPT_VERSION = '1'
+
 
 class AIAnalysisError(Exception):
     """Raised when AI analysis fails"""
@@ -70,7 +82,7 @@ class OpenCodeServerManager:
             
             logger.error("OpenCode Server failed to start within timeout")
             return False
-            
+        
         except Exception as e:
             logger.error(f"Failed to start OpenCode Server: {e}")
             return False
@@ -108,7 +120,7 @@ class OpenCodeServerManager:
             
             logger.info(f"Available models: {models_by_provider}")
             return models_by_provider
-            
+        
         except Exception as e:
             logger.error(f"Failed to get available models: {e}")
             return {}
@@ -168,7 +180,7 @@ class OpenCodeServerManager:
             
             logger.warning(f"Unexpected response format: {message_data}")
             return str(message_data)
-            
+        
         except Exception as e:
             raise AIAnalysisError(f"OpenCode Server request failed: {e}")
 
@@ -176,14 +188,16 @@ class OpenCodeServerManager:
 class AIAnalyzer:
     """AI-powered log analysis using OpenCode Server"""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], cache: Optional[AnalysisCache] = None):
         """
         Initialize AI analyzer
         
         Args:
             config: AI configuration with model settings and OpenCode server config
+            cache: Optional analysis cache (used when host_info carries the host 'id')
         """
         self.config = config
+        self.cache = cache
         
         # OpenCode Server configuration
         opencode_config = config.get('opencode', {})
@@ -199,6 +213,26 @@ class AIAnalyzer:
             'ollama/llama3.1'  # Local fallback
         ])
         
+        # Log template mining: cover every log within the prompt budget
+        templates_config = config.get('log_templates', {})
+        self.log_templates = Config._to_bool(templates_config.get('enabled', False))
+        self.prompt_budget = int(templates_config.get('budget_chars', 50000))
+        self.rare_count = int(templates_config.get('rare_count', 2))
+        
+        # Map-reduce: split oversized log sets into concurrently analyzed chunks
+        map_reduce_config = config.get('map_reduce', {})
+        self.map_reduce = Config._to_bool(map_reduce_config.get('enabled', False))
+        self.max_prompt_tokens = int(map_reduce_config.get('max_prompt_tokens', 12000))
+        self.max_chunks = int(map_reduce_config.get('max_chunks', 8))
+        self.map_workers = max(1, int(map_reduce_config.get('workers', 4)))
+        
+        # Concurrent model calls per provider or provider/model (unlisted: unlimited)
+        self.model_limits = {
+            str(name): threading.BoundedSemaphore(int(limit))
+            for name, limit in (config.get('model_concurrency') or {}).items()
+            if int(limit) > 0
+        }
+        
         # Initialize server manager
         self.server = OpenCodeServerManager(self.server_host, self.server_port)
         self.available_models = {}
@@ -221,6 +255,10 @@ class AIAnalyzer:
                 - recommendations: Suggested actions
                 - severity: INFO, WARN, or CRITICAL
         """
+        cached = self._cached_analysis(host_info, logs)
+        if cached is not None:
+            return cached
+        
         # Ensure OpenCode server is running
         if not self.server.is_running():
             if self.auto_start:
@@ -236,10 +274,56 @@ class AIAnalyzer:
         if not self.available_models:
             self.available_models = self.server.get_available_models()
         
+        return self._analyze_uncached(host_info, logs, baseline)
+    
+    def _cached_analysis(self, host_info: Dict, logs: List[Dict]) -> Optional[Dict[str, Any]]:
+        """Cached analysis of these logs, None on a miss or without a cache"""
+        host_id = host_info.get('id') if self.cache else None
+        if host_id is None:
+            return None
+        cached = self.cache.get(host_id, logs, self.preferred_models)
+        if not cached:
+            return None
+        model_id, analysis = cached
+        logger.info(f"Using cached AI analysis by {model_id} for {host_info.get('name')}")
+        return analysis
+    
+    def _store_analysis(self, host_info: Dict, logs: List[Dict], model_id: str, analysis: Dict[str, Any]):
+        """Cache an analysis of these logs (needs the host 'id')"""
+        host_id = host_info.get('id') if self.cache else None
+        if host_id is not None:
+            self.cache.put(host_id, logs, model_id, analysis)
+    
+    def _analyze_uncached(self, host_info: Dict, logs: List[Dict],
+                          baseline: Optional[Dict] = None) -> Dict[str, Any]:
+        """Analyze logs with the models in one prompt, or in chunks if oversized"""
+        if self.map_reduce:
+            sections = self._log_sections(logs)
+            if sum(estimate_tokens(text) for _, text in sections) > self.max_prompt_tokens:
+                return self._analyze_chunked(host_info, logs, sections, baseline)
+        
         # Build analysis prompt
         prompt = self._build_analysis_prompt(host_info, logs, baseline)
         
-        # Try preferred models in order
+        result = self._run_models(prompt)
+        if result is None:
+            logger.error("All preferred models unavailable or failed")
+            return self._fallback_analysis(host_info, logs)
+        
+        model_id, response = result
+        analysis = self._parse_structured_response(response)
+        if analysis is None:
+            return self._unstructured_analysis(response)
+        self._store_analysis(host_info, logs, model_id, analysis)
+        return analysis
+    
+    def _run_models(self, prompt: str) -> Optional[Tuple[str, str]]:
+        """
+        Send a prompt to the preferred models in order until one answers
+        
+        Returns:
+            (model ID, response) or None if every model is unavailable or failed
+        """
         for model_id in self.preferred_models:
             # Check if model is available
             provider, model = model_id.split('/', 1)
@@ -249,16 +333,101 @@ class AIAnalyzer:
             
             try:
                 logger.info(f"Attempting analysis with {model_id}")
-                response = self.server.analyze_with_model(model_id, prompt, timeout=120)
+                with self._model_slot(model_id):
+                    response = self.server.analyze_with_model(model_id, prompt, timeout=120)
                 logger.info(f"AI analysis completed using {model_id}")
-                return self._parse_analysis_response(response)
-                
+                return model_id, response
+            
             except Exception as e:
                 logger.warning(f"Model {model_id} failed: {e}. Trying next...")
                 continue
         
-        logger.error("All preferred models unavailable or failed")
-        return self._fallback_analysis(host_info, logs)
+        return None
+    
+    def _model_slot(self, model_id: str):
+        """Semaphore limiting concurrent calls to a model (model limit before provider limit)"""
+        provider = model_id.split('/', 1)[0]
+        return self.model_limits.get(model_id) or self.model_limits.get(provider) or nullcontext()
+    
+    def _log_sections(self, logs: List[Dict]) -> List[Tuple[str, str]]:
+        """
+        (label, text) of every log with content, template-summarized in template mode
+        
+        Logs are read line by line (spilled logs from their spool file) and cut
+        into pieces of at most max_prompt_tokens as they are read.
+        """
+        sections = []
+        for log in logs:
+            if log.get('content'):
+                text = iter_log_lines(log)
+                if self.log_templates:
+                    text = summarize_log(text, rare_count=self.rare_count)
+                sections.extend(split_section(log['path'], text, self.max_prompt_tokens))
+        return sections
+    
+    def _analyze_chunked(self, host_info: Dict, logs: List[Dict], sections: List[Tuple[str, str]],
+                         baseline: Optional[Dict]) -> Dict[str, Any]:
+        """
+        Analyze log chunks concurrently and merge the partial results
+        
+        Args:
+            host_info: Host information
+            logs: Log entries (cache key)
+            sections: (path, text) of the logs to analyze
+            baseline: Previous baseline for comparison (optional)
+        
+        Returns:
+            Merged analysis dictionary
+        """
+        chunks = chunk_sections(sections, self.max_prompt_tokens, self.max_chunks)
+        logger.info(f"Analyzing {host_info.get('name')} in {len(chunks)} chunks")
+        prompts = [
+            self._render_prompt(
+                host_info,
+                "".join(f"\n\n=== {label} ===\n{text}" for label, text in chunk),
+                baseline,
+                part=(number, len(chunks))
+            )
+            for number, chunk in enumerate(chunks, 1)
+        ]
+        
+        with ThreadPoolExecutor(max_workers=min(self.map_workers, len(prompts))) as executor:
+            results = list(executor.map(self._run_models, prompts))
+        
+        partials = []
+        models = []
+        cacheable = True
+        for number, result in enumerate(results, 1):
+            if result is None:
+                cacheable = False
+                continue
+            model_id, response = result
+            analysis = self._parse_structured_response(response)
+            if analysis is None:
+                analysis = self._unstructured_analysis(response)
+                cacheable = False
+            partials.append((number, analysis))
+            models.append(model_id)
+        
+        if not partials:
+            logger.error("All preferred models unavailable or failed")
+            return self._fallback_analysis(host_info, logs)
+        
+        merged = merge_analyses(partials, len(chunks))
+        if cacheable:
+            # Recorded under the least preferred model that contributed
+            self._store_analysis(host_info, logs, max(models, key=self.preferred_models.index), merged)
+        return merged
+    
+    @property
+    def prompt_version(self) -> str:
+        """Version of the prompt this analyzer builds (analysis cache key)"""
+        version = PROMPT_VERSION
+        if self.log_templates:
+            version += '-templates'
+        if self.map_reduce:
+            version += f'-chunks{self.max_prompt_tokens}'
+        return version
     
     def _build_analysis_prompt(self, host_info: Dict, logs: List[Dict],
                                baseline: Optional[Dict]) -> str:
@@ -268,16 +437,42 @@ class AIAnalyzer:
         max_log_size = 50000  # characters
         total_log_content = ""
         
-        for log in logs[:5]:  # Analyze first 5 logs
-            if log.get('content'):
-                content = log['content']
-                if len(total_log_content) + len(content) > max_log_size:
-                    # Truncate to fit
-                    remaining = max_log_size - len(total_log_content)
-                    content = content[:remaining] + "\n... (truncated)"
+        if self.log_templates:
+            total_log_content = self._summarize_logs(logs)
+        else:
+            for log in logs[:5]:  # Analyze first 5 logs
+                if log.get('content'):
+                    content = log['content']
+                    if log.get('content_truncated'):
+                        # Spilled logs only carry a preview; add the streamed highlights
+                        content += "\n... (truncated)"
+                        if log.get('highlights'):
+                            content += "\nNotable lines:\n" + "\n".join(log['highlights'])
+                    if len(total_log_content) + len(content) > max_log_size:
+                        # Truncate to fit
+                        remaining = max_log_size - len(total_log_content)
+                        content = content[:remaining] + "\n... (truncated)"
+                        total_log_content += f"\n\n=== {log['path']} ===\n{content}"
+                        break
                     total_log_content += f"\n\n=== {log['path']} ===\n{content}"
-                    break
-                total_log_content += f"\n\n=== {log['path']} ===\n{content}"
+        
+        return self._render_prompt(host_info, total_log_content, baseline)
+    
+    def _render_prompt(self, host_info: Dict, total_log_content: str, baseline: Optional[Dict],
+                       part: Optional[Tuple[int, int]] = None) -> str:
+        """
+        Fill the analysis prompt template
+        
+        Args:
+            host_info: Host information
+            total_log_content: Log sections
+            baseline: Previous baseline for comparison (optional)
+            part: (number, total) when the logs are analyzed in chunks
+        """
+        part_note = ""
+        if part:
+            part_note = (f"\nThese are part {part[0]} of {part[1]} of the host's logs; "
+                         f"analyze only the lines below.\n")
         
         prompt = f"""You are a system administrator analyzing logs from a monitored host.
 
@@ -292,7 +487,7 @@ Analysis Request:
 3. Provide a health score (0-100) where 90-100 = healthy, 70-89 = minor issues, <70 = critical
 4. Categorize severity as: INFO, WARN, or CRITICAL
 
-{"Baseline Comparison: Previous log hash was " + baseline.get('content_hash', 'N/A') if baseline else "First monitoring run - no baseline available"}
+{part_note}{"Baseline Comparison: Previous log hash was " + baseline.get('content_hash', 'N/A') if baseline else "First monitoring run - no baseline available"}
 
 Log Files:
 {total_log_content}
@@ -311,6 +506,20 @@ Respond in JSON format:
 """
         return prompt
     
+    def _summarize_logs(self, logs: List[Dict]) -> str:
+        """
+        Every log with content, compressed into counted templates within the prompt budget
+        
+        Args:
+            logs: Log entries (spilled logs are mined line by line from their spool file)
+        
+        Returns:
+            Log sections for the prompt
+        """
+        texts = [(log['path'], iter_log_lines(log)) for log in logs if log.get('content')]
+        sections = fit_logs(texts, self.prompt_budget, self.rare_count)
+        return "".join(f"\n\n=== {path} (repeated lines as [count] template) ===\n{summary}"
+                       for path, summary in sections)
     
     def _parse_analysis_response(self, response: str) -> Dict[str, Any]:
         """
@@ -322,6 +531,19 @@ Respond in JSON format:
         Returns:
             Parsed analysis dictionary
         """
+        analysis = self._parse_structured_response(response)
+        return analysis if analysis is not None else self._unstructured_analysis(response)
+    
+    def _parse_structured_response(self, response: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse the JSON analysis from an AI model response
+        
+        Args:
+            response: Raw model response
+        
+        Returns:
+            Parsed analysis dictionary, or None if the response is not valid JSON
+        """
         try:
             # Try to extract JSON from response
             # Look for JSON block in markdown code blocks or raw JSON
@@ -347,19 +569,21 @@ Respond in JSON format:
                     data[field] = self._get_default_value(field)
             
             return data
-            
+        
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse AI response as JSON: {e}")
             logger.debug(f"Raw response: {response[:500]}")
-            
-            # Return basic structure with response as summary
-            return {
-                'health_score': 50,
-                'severity': 'WARN',
-                'anomalies': [],
-                'summary': response[:1000],  # First 1000 chars
-                'recommendations': 'Unable to parse structured analysis'
-            }
+            return None
+    
+    def _unstructured_analysis(self, response: str) -> Dict[str, Any]:
+        """Basic structure with the raw response as summary (not cached)"""
+        return {
+            'health_score': 50,
+            'severity': 'WARN',
+            'anomalies': [],
+            'summary': response[:1000],  # First 1000 chars
+            'recommendations': 'Unable to parse structured analysis'
+        }
     
     def _get_default_value(self, field: str) -> Any:
         """Get default value for missing field"""
@@ -392,5 +616,6 @@ Respond in JSON format:
             'summary': f"Logs retrieved successfully from {host_info.get('name')}. "
                       f"Analyzed {len(logs)} log files with {total_lines} total lines. "
                       f"AI analysis unavailable - manual review recommended.",
-            'recommendations': 'Check logs manually for any issues. AI analysis failed.'
+            'recommendations': 'Check logs manually for any issues. AI analysis failed.',
+            'fallback': True  # No model analyzed the logs
         }
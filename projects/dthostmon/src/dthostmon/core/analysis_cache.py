@@ -0,0 +1,168 @@
+"""
+Persistent AI analysis cache for dthostmon
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+An AI analysis depends on the host, the content of its logs, the model and the
+prompt. Entries are keyed by the SHA256 of (host ID, prompt version, sorted
+log hashes) plus the model that produced them, so a host whose logs hash the
+same as in an earlier run gets that run's analysis back without calling the
+OpenCode server. Entries expire after ttl_hours; evict() also trims the cache
+to the max_entries most recently used.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, select, update
+
+from ..models import DatabaseManager
+from ..models.database import AnalysisCacheEntry
+from ..models.upsert import upsert
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisCache:
+    """AI analyses keyed by host, log content hashes, model and prompt version"""
+    
+    def __init__(self, db_manager: DatabaseManager, prompt_version: str,
+                 ttl_hours: float = 24, max_entries: int = 10000):
+        """
+        Initialize analysis cache
+        
+        Args:
+            db_manager: Database manager
+            prompt_version: Version of the analysis prompt (part of every key)
+            ttl_hours: Entries older than this are not used
+            max_entries: Entries kept by evict() (most recently used first)
+        """
+        self.db_manager = db_manager
+        self.prompt_version = str(prompt_version)
+        self.ttl = timedelta(hours=ttl_hours)
+        self.max_entries = max(1, int(max_entries))
+    
+    def key(self, host_id: int, logs: List[Dict]) -> Optional[str]:
+        """
+        Cache key of a host's logs (None if there are no logs)
+        
+        Each log contributes path:hash, or path:skipped / path:unavailable
+        when it has no content, so an unreadable log still yields a key that
+        changes once the log is readable again.
+        
+        Args:
+            host_id: Host ID
+            logs: Log data from the collection stage
+        """
+        if not logs:
+            return None
+        states = sorted(
+            f"{log.get('path')}:{log.get('hash') or ('skipped' if log.get('skipped') else 'unavailable')}"
+            for log in logs
+        )
+        material = '\n'.join([str(host_id), self.prompt_version] + states)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+    
+    def get(self, host_id: int, logs: List[Dict], models: List[str]) -> Optional[Tuple[str, Dict]]:
+        """
+        Cached analysis of these logs by the most preferred model
+        
+        Args:
+            host_id: Host ID
+            logs: Log data from the collection stage
+            models: Acceptable models in order of preference
+        
+        Returns:
+            (model, analysis) or None on a miss
+        """
+        cache_key = self.key(host_id, logs)
+        if cache_key is None or not models:
+            return None
+        
+        now = datetime.utcnow()
+        with self.db_manager.get_session() as session:
+            entries = {
+                entry.model: entry
+                for entry in session.execute(
+                    select(AnalysisCacheEntry.id, AnalysisCacheEntry.model, AnalysisCacheEntry.analysis)
+                    .where(
+                        AnalysisCacheEntry.cache_key == cache_key,
+                        AnalysisCacheEntry.model.in_(models),
+                        AnalysisCacheEntry.created_at >= now - self.ttl
+                    )
+                ).all()
+            }
+            model = next((m for m in models if m in entries), None)
+            if model is None:
+                return None
+            
+            entry = entries[model]
+            session.execute(
+                update(AnalysisCacheEntry)
+                .where(AnalysisCacheEntry.id == entry.id)
+                .values(last_used_at=now, hit_count=AnalysisCacheEntry.hit_count + 1)
+            )
+        
+        try:
+            return model, json.loads(entry.analysis)
+        except ValueError as e:
+            logger.warning(f"Ignoring unreadable cached analysis {entry.id}: {e}")
+            return None
+    
+    def put(self, host_id: int, logs: List[Dict], model: str, analysis: Dict):
+        """
+        Store the analysis of these logs by a model (replacing an older one)
+        
+        Args:
+            host_id: Host ID
+            logs: Log data the analysis was made from
+            model: Model that produced the analysis
+            analysis: Parsed analysis dictionary
+        """
+        cache_key = self.key(host_id, logs)
+        if cache_key is None:
+            return
+        
+        now = datetime.utcnow()
+        row = {
+            'host_id': host_id,
+            'cache_key': cache_key,
+            'model': model,
+            'analysis': json.dumps(analysis, default=str),
+            'created_at': now,
+            'last_used_at': now,
+            'hit_count': 0
+        }
+        with self.db_manager.get_session() as session:
+            upsert(session, AnalysisCacheEntry, [row],
+                   index_elements=[AnalysisCacheEntry.cache_key, AnalysisCacheEntry.model],
+                   update_cols=['analysis', 'created_at', 'last_used_at', 'hit_count'])
+    
+    def evict(self, now: Optional[datetime] = None) -> int:
+        """
+        Delete expired entries and trim the cache to max_entries
+        
+        Returns:
+            Number of entries deleted
+        """
+        now = now or datetime.utcnow()
+        with self.db_manager.get_session() as session:
+            deleted = session.execute(
+                delete(AnalysisCacheEntry).where(AnalysisCacheEntry.created_at < now - self.ttl)
+            ).rowcount
+            
+            # Least recently used beyond max_entries
+            keep = (
+                select(AnalysisCacheEntry.id)
+                .order_by(AnalysisCacheEntry.last_used_at.desc(), AnalysisCacheEntry.id.desc())
+                .limit(self.max_entries)
+            )
+            deleted += session.execute(
+                delete(AnalysisCacheEntry).where(AnalysisCacheEntry.id.notin_(keep))
+            ).rowcount
+        
+        if deleted:
+            logger.debug(f"Evicted {deleted} cached AI analyses")
+        return deleted
@@ -0,0 +1,156 @@
+"""
+Chunked (map-reduce) AI analysis helpers for dthostmon
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Log sets whose estimated size exceeds the prompt token budget are split into
+chunks that are analyzed independently and concurrently (map). The partial
+analyses are merged with deterministic rules (reduce) rather than another
+model call, so a big host costs one round of model latency:
+
+- health_score: lowest partial score (the worst part determines health)
+- severity: highest partial severity (INFO < WARN < CRITICAL)
+- anomalies: all partial anomalies, duplicates removed
+- summary/recommendations: partial texts labelled by part
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+# Rough average for English text and log lines; no tokenizer dependency
+CHARS_PER_TOKEN = 4
+
+SEVERITY_RANK = {'INFO': 0, 'WARN': 1, 'CRITICAL': 2}
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimated number of model tokens in text"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def split_section(label: str, text: Union[str, Iterable[str]], max_tokens: int) -> List[Tuple[str, str]]:
+    """
+    Split one log into pieces of at most max_tokens, at line boundaries
+    
+    Args:
+        label: Log path
+        text: Log text, or its lines (e.g. read from a spool file) so pieces
+              are built without holding the whole text
+        max_tokens: Token budget per piece
+    
+    Returns:
+        (label, text) pairs; labels get "(part i of n)" when the log is split
+    """
+    max_chars = max(1, max_tokens * CHARS_PER_TOKEN)
+    if isinstance(text, str):
+        if len(text) <= max_chars:
+            return [(label, text)]
+        text = text.splitlines()
+    
+    pieces, current, size = [], [], 0
+    for line in text:
+        # Lines longer than a whole piece are cut
+        while len(line) > max_chars:
+            if current:
+                pieces.append('\n'.join(current))
+                current, size = [], 0
+            pieces.append(line[:max_chars])
+            line = line[max_chars:]
+        if size + len(line) + 1 > max_chars and current:
+            pieces.append('\n'.join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        pieces.append('\n'.join(current))
+    
+    if len(pieces) == 1:
+        return [(label, pieces[0])]
+    return [(f"{label} (part {i} of {len(pieces)})", piece) for i, piece in enumerate(pieces, 1)]
+
+
+def chunk_sections(sections: List[Tuple[str, str]], max_tokens: int,
+                   max_chunks: Optional[int] = None) -> List[List[Tuple[str, str]]]:
+    """
+    Pack log sections into chunks of at most max_tokens, keeping log order
+    
+    Args:
+        sections: (label, text) per log
+        max_tokens: Token budget per chunk
+        max_chunks: Upper bound on the number of chunks; the budget per chunk
+                    grows instead of logs being dropped
+    
+    Returns:
+        List of chunks, each a list of (label, text)
+    """
+    total = sum(estimate_tokens(text) for _, text in sections)
+    if max_chunks and total > max_tokens * max_chunks:
+        max_tokens = math.ceil(total / max_chunks)
+    
+    chunks = _pack(sections, max_tokens)
+    while max_chunks and len(chunks) > max_chunks:
+        # Whole sections left gaps; widen until the packing fits
+        max_tokens = math.ceil(max_tokens * 1.25)
+        chunks = _pack(sections, max_tokens)
+    return chunks
+
+
+def _pack(sections: List[Tuple[str, str]], max_tokens: int) -> List[List[Tuple[str, str]]]:
+    """Greedy in-order packing of sections (split when oversized) into chunks"""
+    chunks: List[List[Tuple[str, str]]] = []
+    current: List[Tuple[str, str]] = []
+    used = 0
+    for label, text in sections:
+        for piece_label, piece in split_section(label, text, max_tokens):
+            tokens = estimate_tokens(piece)
+            if current and used + tokens > max_tokens:
+                chunks.append(current)
+                current, used = [], 0
+            current.append((piece_label, piece))
+            used += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def merge_analyses(partials: List[Tuple[int, Dict[str, Any]]], total_parts: int) -> Dict[str, Any]:
+    """
+    Merge partial analyses into one result
+    
+    Args:
+        partials: (part number, analysis) for every part that was analyzed
+        total_parts: Number of parts the logs were split into
+    
+    Returns:
+        Analysis dictionary (health_score, severity, anomalies, summary, recommendations)
+    """
+    scores = [a.get('health_score') for _, a in partials if isinstance(a.get('health_score'), (int, float))]
+    severities = [str(a.get('severity', 'INFO')).upper() for _, a in partials]
+    
+    anomalies, seen = [], set()
+    for _, analysis in partials:
+        for anomaly in analysis.get('anomalies') or []:
+            key = (anomaly.get('type'), anomaly.get('description')) if isinstance(anomaly, dict) else str(anomaly)
+            if key not in seen:
+                seen.add(key)
+                anomalies.append(anomaly)
+    
+    summary = [f"Part {part}/{total_parts}: {analysis.get('summary', '')}" for part, analysis in partials]
+    missing = total_parts - len(partials)
+    if missing:
+        summary.append(f"{missing} of {total_parts} parts could not be analyzed.")
+    
+    recommendations = []
+    for _, analysis in partials:
+        text = analysis.get('recommendations')
+        if isinstance(text, list):
+            text = '\n'.join(str(item) for item in text)
+        if text and text not in recommendations:
+            recommendations.append(text)
+    
+    return {
+        'health_score': min(scores) if scores else 50,
+        'severity': max(severities, key=lambda s: SEVERITY_RANK.get(s, 0)) if severities else 'INFO',
+        'anomalies': anomalies,
+        'summary': '\n'.join(summary),
+        'recommendations': '\n'.join(recommendations)
+    }
@@ -0,0 +1,147 @@
+"""
+Pipelined monitoring engine for dthostmon
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Decouples SSH collection from AI analysis. Collector threads only connect and
+retrieve logs, then hand the host to a bounded queue and move on to the next
+host. A separate pool of analysis workers takes hosts from the queue and runs
+the analysis and persistence stages. When analysis falls behind, the queue
+fills up and collectors block on it (backpressure), so no more than
+queue_size collected log sets wait in memory. Cycle time approaches
+max(collection, analysis) instead of their sum.
+
+Model calls are further limited per provider or model by AIAnalyzer
+(ai.model_concurrency).
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from ..core.ssh_client import SSHConnectionError, LogRetrievalError, release_log_spools
+
+if TYPE_CHECKING:
+    from ..core.orchestrator import MonitoringOrchestrator
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisPipeline:
+    """Runs collection and analysis of hosts as separate stages joined by a queue"""
+    
+    def __init__(self, orchestrator: 'MonitoringOrchestrator', max_collections: int = 5,
+                 max_analyses: int = 10, queue_size: int = 20, connect_retries: int = 3):
+        """
+        Initialize analysis pipeline
+        
+        Args:
+            orchestrator: Orchestrator providing the stage implementations
+            max_collections: Concurrent SSH collections (connect + log retrieval)
+            max_analyses: Analysis workers (AI analysis + persistence)
+            queue_size: Collected hosts waiting for analysis before collectors block
+            connect_retries: SSH connection attempts per host
+        """
+        self.orchestrator = orchestrator
+        self.max_collections = max(1, int(max_collections))
+        self.max_analyses = max(1, int(max_analyses))
+        self.queue_size = max(1, int(queue_size))
+        self.connect_retries = max(1, int(connect_retries))
+    
+    def run(self, hosts: List[Dict]) -> List[Dict]:
+        """
+        Monitor all hosts and return per-host result dictionaries
+        
+        Args:
+            hosts: Host configuration dictionaries
+        
+        Returns:
+            Result dictionaries in host order, same shape as
+            MonitoringOrchestrator._monitor_single_host
+        """
+        self._results: List[Optional[Dict]] = [None] * len(hosts)
+        self._pending: 'queue.Queue' = queue.Queue(maxsize=self.queue_size)
+        
+        workers = [
+            threading.Thread(target=self._analysis_worker, name=f'analyze-{number}', daemon=True)
+            for number in range(min(self.max_analyses, len(hosts)) or 1)
+        ]
+        for worker in workers:
+            worker.start()
+        
+        try:
+            with ThreadPoolExecutor(self.max_collections, thread_name_prefix='collect') as executor:
+                for index, result in enumerate(executor.map(self._collect, range(len(hosts)), hosts)):
+                    if result is not None:
+                        self._results[index] = result
+        finally:
+            # One stop marker per worker, queued behind the collected hosts
+            for _ in workers:
+                self._pending.put(None)
+            for worker in workers:
+                worker.join()
+        
+        return [
+            result or {'host': host, 'status': 'failed', 'error': 'No result'}
+            for host, result in zip(hosts, self._results)
+        ]
+    
+    def _collect(self, index: int, host: Dict) -> Optional[Dict]:
+        """
+        Collection stage for one host
+        
+        Returns:
+            Result dictionary if the host is done (skipped or failed), None once
+            its logs are queued for analysis
+        """
+        orchestrator = self.orchestrator
+        start_time = time.time()
+        
+        try:
+            allowed, probe = orchestrator._check_circuit(host)
+            if not allowed:
+                return orchestrator._skip_host(host)
+            
+            logger.info(f"Starting monitoring for {host['name']} ({host['hostname']})")
+            logs = orchestrator._collect_host_logs(host, 1 if probe else self.connect_retries)
+        
+        except (SSHConnectionError, LogRetrievalError) as e:
+            return self._failure(host, start_time, e, unexpected=False)
+        
+        except Exception as e:
+            logger.exception(f"Unexpected error monitoring {host['name']}")
+            return self._failure(host, start_time, e)
+        
+        if self._pending.full():
+            logger.debug(f"Analysis queue full, {host['name']} waits for an analysis worker")
+        self._pending.put((index, host, logs, start_time))
+        return None
+    
+    def _analysis_worker(self):
+        """Analyze and persist queued hosts until a stop marker arrives"""
+        orchestrator = self.orchestrator
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            
+            index, host, logs, start_time = item
+            try:
+                analysis = orchestrator._analyze_host(host, logs)
+                self._results[index] = orchestrator._finalize_host(host, logs, analysis, start_time)
+                logger.info(f"✓ Completed monitoring for {host['name']}")
+            except Exception as e:
+                logger.exception(f"Unexpected error monitoring {host['name']}")
+                release_log_spools(logs)
+                self._results[index] = self._failure(host, start_time, e)
+    
+    def _failure(self, host: Dict, start_time: float, error: Exception,
+                 unexpected: bool = True) -> Dict:
+        """Record a failed host, never raising into a worker"""
+        try:
+            return self.orchestrator._handle_host_failure(host, start_time, error, unexpected)
+        except Exception as e:
+            logger.error(f"✗ Failed monitoring for {host['name']}: {e}")
+            return {'host': host, 'status': 'failed', 'error': str(error)}
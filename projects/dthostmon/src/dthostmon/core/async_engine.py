@@ -0,0 +1,148 @@
+"""
+Asyncio collection engine for dthostmon
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Runs the orchestrator's collection, analysis and persistence stages for many
+hosts concurrently. Each stage has its own bounded semaphore, so hundreds of
+host collections can be in flight while AI calls and database writes stay
+within their own limits. SSH connect backoff uses asyncio.sleep and never
+holds a worker slot.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List
+
+from ..core.ssh_client import SSHConnectionError, LogRetrievalError
+
+if TYPE_CHECKING:
+    from ..core.orchestrator import MonitoringOrchestrator
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCollectionEngine:
+    """Schedules per-host monitoring stages on an asyncio event loop"""
+    
+    def __init__(self, orchestrator: 'MonitoringOrchestrator', max_collections: int = 200,
+                 max_analyses: int = 10, max_db_writes: int = 5, connect_retries: int = 3):
+        """
+        Initialize async collection engine
+        
+        Args:
+            orchestrator: Orchestrator providing the stage implementations
+            max_collections: Concurrent SSH collections (connect + log retrieval)
+            max_analyses: Concurrent AI analysis calls
+            max_db_writes: Concurrent persistence stages (keep within the DB pool size)
+            connect_retries: SSH connection attempts per host
+        """
+        self.orchestrator = orchestrator
+        self.max_collections = max(1, int(max_collections))
+        self.max_analyses = max(1, int(max_analyses))
+        self.max_db_writes = max(1, int(max_db_writes))
+        self.connect_retries = max(1, int(connect_retries))
+    
+    def run(self, hosts: List[Dict]) -> List[Dict]:
+        """
+        Monitor all hosts and return per-host result dictionaries
+        
+        Args:
+            hosts: Host configuration dictionaries
+        
+        Returns:
+            Result dictionaries, same shape as MonitoringOrchestrator._monitor_single_host
+        """
+        return asyncio.run(self._run_all(hosts))
+    
+    async def _run_all(self, hosts: List[Dict]) -> List[Dict]:
+        """Run every host concurrently on dedicated thread pools per stage"""
+        self._collect_sem = asyncio.Semaphore(self.max_collections)
+        self._analysis_sem = asyncio.Semaphore(self.max_analyses)
+        self._db_sem = asyncio.Semaphore(self.max_db_writes)
+        
+        # Blocking libraries (paramiko, requests, SQLAlchemy) run in threads sized
+        # to each semaphore, so no stage can starve the others of workers
+        executors = {
+            'collect': ThreadPoolExecutor(self.max_collections, thread_name_prefix='collect'),
+            'analyze': ThreadPoolExecutor(self.max_analyses, thread_name_prefix='analyze'),
+            'persist': ThreadPoolExecutor(self.max_db_writes, thread_name_prefix='persist'),
+        }
+        self._executors = executors
+        
+        try:
+            results = await asyncio.gather(
+                *(self._run_host(host) for host in hosts), return_exceptions=True
+            )
+        finally:
+            for executor in executors.values():
+                executor.shutdown(wait=True)
+        
+        final = []
+        for host, result in zip(hosts, results):
+            if isinstance(result, BaseException):
+                logger.error(f"✗ Failed monitoring for {host['name']}: {result}")
+                final.append({'host': host, 'status': 'failed', 'error': str(result)})
+            else:
+                final.append(result)
+        return final
+    
+    async def _in_stage(self, stage: str, func: Callable, *args) -> Any:
+        """Run a blocking stage function on the stage's thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executors[stage], func, *args)
+    
+    async def _collect(self, host: Dict, retries: int) -> List[Dict]:
+        """Collect logs with non-blocking exponential backoff between connect attempts"""
+        for attempt in range(retries):
+            try:
+                async with self._collect_sem:
+                    return await self._in_stage(
+                        'collect', self.orchestrator._collect_host_logs, host, 1
+                    )
+            except SSHConnectionError:
+                if attempt == retries - 1:
+                    raise
+                # Exponential backoff: 1s, 2s, 4s - without holding a slot
+                await asyncio.sleep(2 ** attempt)
+        raise SSHConnectionError(f"Failed to connect to {host['hostname']}")
+    
+    async def _run_host(self, host: Dict) -> Dict:
+        """Run collection, analysis and persistence for one host"""
+        orchestrator = self.orchestrator
+        start_time = time.time()
+        
+        # Hosts with an open circuit are skipped; a half-open probe gets one attempt
+        allowed, probe = orchestrator._check_circuit(host)
+        if not allowed:
+            async with self._db_sem:
+                return await self._in_stage('persist', orchestrator._skip_host, host)
+        
+        logger.info(f"Starting monitoring for {host['name']} ({host['hostname']})")
+        
+        try:
+            logs = await self._collect(host, 1 if probe else self.connect_retries)
+            
+            async with self._analysis_sem:
+                analysis = await self._in_stage('analyze', orchestrator._analyze_host, host, logs)
+            
+            async with self._db_sem:
+                result = await self._in_stage(
+                    'persist', orchestrator._finalize_host, host, logs, analysis, start_time
+                )
+            logger.info(f"✓ Completed monitoring for {host['name']}")
+            return result
+        
+        except (SSHConnectionError, LogRetrievalError) as e:
+            async with self._db_sem:
+                return await self._in_stage(
+                    'persist', orchestrator._handle_host_failure, host, start_time, e
+                )
+        
+        except Exception as e:
+            logger.exception(f"Unexpected error monitoring {host['name']}")
+            async with self._db_sem:
+                return await self._in_stage(
+                    'persist', orchestrator._handle_host_failure, host, start_time, e, True
+                )
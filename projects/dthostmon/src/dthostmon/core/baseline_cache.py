@@ -0,0 +1,127 @@
+"""
+Per-cycle baseline cache for dthostmon
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Loads the active baselines of all monitored hosts with a single query at the
+start of a monitoring cycle and serves change detection, hash prechecks and
+analysis from memory. The persistence stage reports written baselines back
+(after its commit) so the cache stays current without re-reading.
+"""
+
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from ..models import DatabaseManager
+from ..models.database import Baseline
+
+logger = logging.getLogger(__name__)
+
+
+class BaselineCache:
+    """Active baselines keyed by host ID, then by log path"""
+    
+    def __init__(self, db_manager: DatabaseManager):
+        """
+        Initialize baseline cache
+        
+        Args:
+            db_manager: Database manager
+        """
+        self.db_manager = db_manager
+        self._baselines: Dict[int, Dict[str, Dict]] = {}
+        self._lock = threading.Lock()
+    
+    def load(self, host_ids: Iterable[int]):
+        """
+        Replace the cache with the active baselines of the given hosts (one query)
+        
+        Args:
+            host_ids: Host IDs monitored this cycle
+        """
+        host_ids = list(host_ids)
+        baselines: Dict[int, Dict[str, Dict]] = {host_id: {} for host_id in host_ids}
+        
+        if host_ids:
+            with self.db_manager.get_session() as session:
+                rows = session.query(
+                    Baseline.host_id, Baseline.log_file_path,
+                    Baseline.content_hash, Baseline.line_count
+                ).filter(
+                    Baseline.host_id.in_(host_ids),
+                    Baseline.is_active.is_(True)
+                ).order_by(Baseline.id).all()
+            
+            # Later rows win should a log ever have several active baselines
+            for host_id, path, content_hash, line_count in rows:
+                baselines[host_id][path] = {'hash': content_hash, 'line_count': line_count}
+        
+        with self._lock:
+            self._baselines = baselines
+        logger.debug(f"Baseline cache loaded for {len(host_ids)} hosts")
+    
+    def get(self, host_id: int) -> Dict[str, Dict]:
+        """
+        Active baselines of a host keyed by log path
+        
+        Hosts not loaded for this cycle are loaded on demand.
+        
+        Returns:
+            Dictionary of path to {'hash', 'line_count'} (a copy)
+        """
+        with self._lock:
+            baselines = self._baselines.get(host_id)
+        
+        if baselines is None:
+            with self.db_manager.get_session() as session:
+                rows = session.query(
+                    Baseline.log_file_path, Baseline.content_hash, Baseline.line_count
+                ).filter(
+                    Baseline.host_id == host_id,
+                    Baseline.is_active.is_(True)
+                ).order_by(Baseline.id).all()
+            baselines = {path: {'hash': h, 'line_count': n} for path, h, n in rows}
+            with self._lock:
+                self._baselines.setdefault(host_id, baselines)
+        
+        return dict(baselines)
+    
+    def changed(self, host_id: int, logs: List[Dict]) -> List[Dict]:
+        """
+        Logs with content whose hash differs from the active baseline
+        
+        Args:
+            host_id: Host ID
+            logs: Log data from the collection stage
+        
+        Returns:
+            Subset of logs that need a new baseline
+        """
+        baselines = self.get(host_id)
+        return [
+            log for log in logs
+            if log.get('content') and baselines.get(log['path'], {}).get('hash') != log['hash']
+        ]
+    
+    def update(self, host_id: int, logs: List[Dict]):
+        """
+        Record baselines written for a host (call after the write committed)
+        
+        Args:
+            host_id: Host ID
+            logs: Logs whose hash became the active baseline
+        """
+        with self._lock:
+            baselines = self._baselines.get(host_id)
+            if baselines is None:
+                return  # Not cached - the next get() reads the committed rows
+            for log in logs:
+                baselines[log['path']] = {'hash': log['hash'], 'line_count': log['line_count']}
+    
+    def invalidate(self, host_id: Optional[int] = None):
+        """Forget one host (or every host) so the next lookup re-reads the database"""
+        with self._lock:
+            if host_id is None:
+                self._baselines = {}
+            else:
+                self._baselines.pop(host_id, None)
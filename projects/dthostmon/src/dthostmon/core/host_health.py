@@ -0,0 +1,167 @@
+"""
+Per-host connection health tracking for dthostmon
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Records consecutive SSH connect failures and connect latency per host.
+Hosts that keep failing trip a circuit breaker: they are skipped until a
+cool-down expires, then probed with a single connect attempt. Successful
+connects feed an EWMA of the connect latency that is used to derive an
+adaptive connect timeout, so healthy hosts are not held up by the generous
+timeout needed for the worst case.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class HostHealthTracker:
+    """Circuit breaker and adaptive connect timeouts keyed by host name"""
+    
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 300,
+                 max_cooldown: float = 3600, min_timeout: float = 2,
+                 max_timeout: float = 10, timeout_multiplier: float = 4,
+                 latency_alpha: float = 0.3, clock: Callable[[], float] = time.time):
+        """
+        Initialize health tracker
+        
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            cooldown: Seconds an open circuit skips the host before a probe
+            max_cooldown: Upper bound for the cool-down, which doubles after
+                every failed probe
+            min_timeout: Lower bound for the adaptive connect timeout
+            max_timeout: Connect timeout before any latency is known (and upper bound)
+            timeout_multiplier: Adaptive timeout = multiplier x latency EWMA
+            latency_alpha: EWMA smoothing factor for connect latency
+            clock: Time source (wall clock, so history from the database can seed it)
+        """
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown = float(cooldown)
+        self.max_cooldown = max(float(max_cooldown), self.cooldown)
+        self.min_timeout = float(min_timeout)
+        self.max_timeout = max(float(max_timeout), self.min_timeout)
+        self.timeout_multiplier = float(timeout_multiplier)
+        self.latency_alpha = float(latency_alpha)
+        self.clock = clock
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def _get(self, host: str) -> Dict[str, Any]:
+        """Health record of a host (caller holds the lock)"""
+        return self._hosts.setdefault(host, {
+            'consecutive_failures': 0,
+            'latency_ewma': None,
+            'opened_at': None,   # Circuit open since (None = closed)
+            'cooldown': 0.0,
+            'probing': False
+        })
+    
+    def allow(self, host: str) -> Tuple[bool, bool]:
+        """
+        Decide whether to connect to a host this cycle
+        
+        Args:
+            host: Host name
+        
+        Returns:
+            Tuple of (allowed, probe). probe is True for the single trial
+            connect of a half-open circuit, which should not retry.
+        """
+        with self._lock:
+            health = self._get(host)
+            if health['opened_at'] is None:
+                return True, False
+            if self.clock() - health['opened_at'] < health['cooldown']:
+                return False, False
+            # Restart the cool-down so a probe whose outcome is never recorded
+            # cannot leave the host skipped forever or probed every cycle
+            health['probing'] = True
+            health['opened_at'] = self.clock()
+            logger.info(f"Circuit half-open for {host}, probing with a single connect attempt")
+            return True, True
+    
+    def record_success(self, host: str, latency: Optional[float] = None):
+        """
+        Record a successful connect and close the circuit
+        
+        Args:
+            host: Host name
+            latency: Seconds the connect took (None when a pooled connection was reused)
+        """
+        with self._lock:
+            health = self._get(host)
+            if health['opened_at'] is not None:
+                logger.info(f"Circuit closed for {host} after {health['consecutive_failures']} failures")
+            health['consecutive_failures'] = 0
+            health['opened_at'] = None
+            health['cooldown'] = 0.0
+            health['probing'] = False
+            if latency is not None:
+                if health['latency_ewma'] is None:
+                    health['latency_ewma'] = latency
+                else:
+                    health['latency_ewma'] += self.latency_alpha * (latency - health['latency_ewma'])
+    
+    def record_failure(self, host: str):
+        """Record a failed connect, opening the circuit at the failure threshold"""
+        with self._lock:
+            health = self._get(host)
+            health['consecutive_failures'] += 1
+            
+            if health['probing']:
+                # Failed probe: stay open and back off further
+                health['cooldown'] = min(health['cooldown'] * 2, self.max_cooldown)
+                health['opened_at'] = self.clock()
+                health['probing'] = False
+                logger.warning(f"Probe failed for {host}, next probe in {health['cooldown']:.0f}s")
+            elif health['opened_at'] is None and health['consecutive_failures'] >= self.failure_threshold:
+                health['cooldown'] = self.cooldown
+                health['opened_at'] = self.clock()
+                logger.warning(f"Circuit opened for {host} after {health['consecutive_failures']} "
+                               f"consecutive failures, skipping for {health['cooldown']:.0f}s")
+    
+    def seed(self, host: str, consecutive_failures: int, last_failure: Optional[float]):
+        """
+        Restore state from monitoring history (e.g. after a restart)
+        
+        Args:
+            host: Host name
+            consecutive_failures: Failed runs since the last successful one
+            last_failure: Epoch seconds of the most recent failure
+        """
+        if consecutive_failures <= 0:
+            return
+        with self._lock:
+            health = self._get(host)
+            health['consecutive_failures'] = consecutive_failures
+            if consecutive_failures >= self.failure_threshold and last_failure is not None:
+                # Each failure beyond the threshold stands for a failed probe
+                extra = consecutive_failures - self.failure_threshold
+                health['cooldown'] = min(self.cooldown * (2 ** min(extra, 16)), self.max_cooldown)
+                health['opened_at'] = last_failure
+    
+    def connect_timeout(self, host: str) -> float:
+        """Adaptive connect timeout derived from the host's latency EWMA"""
+        with self._lock:
+            latency = self._get(host)['latency_ewma']
+        if latency is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, latency * self.timeout_multiplier))
+    
+    def status(self, host: str) -> Dict:
+        """Snapshot of a host's health for logging and results"""
+        with self._lock:
+            health = self._get(host)
+            retry_in = None
+            if health['opened_at'] is not None:
+                retry_in = max(0.0, health['opened_at'] + health['cooldown'] - self.clock())
+            return {
+                'consecutive_failures': health['consecutive_failures'],
+                'latency_ewma': health['latency_ewma'],
+                'circuit_open': health['opened_at'] is not None,
+                'retry_in': retry_in
+            }
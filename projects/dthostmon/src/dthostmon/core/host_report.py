@@ -505,7 +505,7 @@ class HostReportGenerator:
         highlights = []
         
         for entry in log_entries:
-            content = entry.get('content', '')
+            content = entry.get('content') or ''
             lines = content.split('\n')
             
             for line in lines:
@@ -0,0 +1,96 @@
+"""
+Incremental host sync from configuration to database for dthostmon
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Each configured host's block is reduced to a fingerprint (SHA256 of the synced
+columns) stored in hosts.config_fingerprint. A sync reads the stored
+fingerprints with one query, writes only hosts whose fingerprint changed with
+one bulk upsert, and disables config-managed hosts that are no longer
+configured (or are disabled in the configuration). Hosts registered through
+the API have no fingerprint and are left alone.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from ..models.database import Host
+from ..models.upsert import upsert
+
+logger = logging.getLogger(__name__)
+
+
+def host_columns(config_host: Dict[str, Any]) -> Dict[str, Any]:
+    """Host columns managed by the configuration"""
+    return {
+        'name': config_host['name'],
+        'hostname': config_host['hostname'],
+        'port': config_host.get('port', 22),
+        'user': config_host['user'],
+        'enabled': config_host.get('enabled', True),
+        'tags': config_host.get('tags', []),
+        'logs_to_monitor': config_host.get('logs', [])
+    }
+
+
+def host_fingerprint(config_host: Dict[str, Any]) -> str:
+    """
+    Fingerprint of a host's configuration block
+    
+    Args:
+        config_host: Host entry from the configuration
+    
+    Returns:
+        SHA256 hex digest of the synced columns
+    """
+    canonical = json.dumps(host_columns(config_host), sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def sync_hosts(session: Session, config_hosts: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Apply configured hosts to the hosts table (no commit)
+    
+    Args:
+        session: Database session
+        config_hosts: Enabled hosts from the configuration
+    
+    Returns:
+        Dictionary with the number of hosts 'unchanged', 'upserted' and 'disabled'
+    """
+    stored = dict(session.execute(select(Host.name, Host.config_fingerprint)).all())
+    now = datetime.utcnow()
+    
+    rows = []
+    for config_host in config_hosts:
+        fingerprint = host_fingerprint(config_host)
+        if stored.get(config_host['name']) != fingerprint:
+            rows.append({**host_columns(config_host), 'config_fingerprint': fingerprint,
+                         'created_at': now, 'updated_at': now})
+    if rows:
+        _upsert_hosts(session, rows)
+    
+    # Hosts synced from the configuration earlier but no longer (enabled) in it
+    configured = [config_host['name'] for config_host in config_hosts]
+    disabled = session.execute(
+        update(Host)
+        .where(Host.config_fingerprint.isnot(None), Host.name.notin_(configured))
+        .values(enabled=False, config_fingerprint=None, updated_at=now)
+    ).rowcount
+    
+    stats = {'unchanged': len(config_hosts) - len(rows), 'upserted': len(rows), 'disabled': disabled}
+    if rows or disabled:
+        logger.info(f"Synced hosts from configuration: {stats['upserted']} updated, "
+                    f"{stats['disabled']} disabled, {stats['unchanged']} unchanged")
+    return stats
+
+
+def _upsert_hosts(session: Session, rows: List[Dict[str, Any]]):
+    """Insert hosts or update them by name in one statement"""
+    upsert(session, Host, rows, index_elements=[Host.name],
+           update_cols=[key for key in rows[0] if key not in ('name', 'created_at')])
@@ -0,0 +1,250 @@
+"""
+Local rule-based log pre-classifier for dthostmon
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Scores a host's logs before the AI stage so healthy hosts skip the model call.
+All rules are compiled into one alternation (a named group per rule), so a log
+is scanned once however many rules there are. The rules extend the
+error/warning terms highlighted in host reports
+(HostReportGenerator._extract_log_highlights) with the issues the AI prompt
+asks about.
+
+A host goes to the AI model when a line matches a rule of at least
+min_severity, or when its logs contain line templates (see log_templates)
+never seen on that host. Every other host gets a deterministic analysis.
+Known templates are kept per host in known_log_templates and forgotten after
+template_ttl_days without being seen. classify() only reads them; the caller
+stores a host's templates with remember() once the host has been analyzed,
+so templates of a host whose AI analysis failed are flagged again.
+"""
+
+import hashlib
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Pattern, Set, Tuple
+
+from sqlalchemy import delete, select
+
+from ..models import DatabaseManager
+from ..models.database import KnownLogTemplate
+from ..models.upsert import upsert
+from .analysis_chunks import SEVERITY_RANK
+from .log_templates import TemplateMiner, template_text
+from .ssh_client import read_log_content
+
+logger = logging.getLogger(__name__)
+
+# (name, severity, pattern); all patterns are matched case-insensitively
+RULES = [
+    ('oom', 'CRITICAL', r'out of memory|oom-killer|killed process \d+'),
+    ('crash', 'CRITICAL', r'segfault|core dumped|kernel panic|traceback \(most recent call last\)'),
+    ('failed_login', 'WARN', r'failed password|authentication failure|invalid user|failed publickey'),
+    ('permission_denied', 'WARN', r'permission denied|access denied'),
+    ('error', 'WARN', r'\b(?:error|fail|critical|fatal)\b'),
+    ('warning', 'INFO', r'\b(?:warn|warning)\b'),
+]
+
+MAX_SAMPLE_LINES = 10
+
+
+def compile_rules(rules: List[Tuple[str, str, str]]) -> Pattern:
+    """One case-insensitive pattern matching any rule (group r<index> per rule)"""
+    return re.compile('|'.join(f'(?P<r{index}>{pattern})' for index, (_, _, pattern) in enumerate(rules)),
+                      re.IGNORECASE)
+
+
+def template_hash(template: str) -> str:
+    """SHA256 of a template text"""
+    return hashlib.sha256(template.encode('utf-8')).hexdigest()
+
+
+class LogClassifier:
+    """Decides which hosts need AI analysis"""
+    
+    def __init__(self, db_manager: DatabaseManager, min_severity: str = 'WARN',
+                 new_templates: bool = True, template_ttl_days: float = 30,
+                 rules: Optional[List[Tuple[str, str, str]]] = None):
+        """
+        Initialize log classifier
+        
+        Args:
+            db_manager: Database manager (known templates)
+            min_severity: Lowest rule severity that sends a host to the AI model
+            new_templates: Also send hosts whose logs contain never-seen templates
+            template_ttl_days: Known templates not seen for this long count as new again
+            rules: (name, severity, pattern) list (default: RULES)
+        """
+        self.db_manager = db_manager
+        self.threshold = SEVERITY_RANK.get(str(min_severity).upper(), SEVERITY_RANK['WARN'])
+        self.new_templates = new_templates
+        self.template_ttl = timedelta(days=template_ttl_days)
+        self.rules = rules or RULES
+        self.matcher = compile_rules(self.rules)
+    
+    def scan(self, text: str) -> Dict:
+        """
+        Match the rules against a log in one pass
+        
+        Args:
+            text: Log text
+        
+        Returns:
+            Dictionary with 'matches' (rule name -> matching lines), 'flagged'
+            (lines matching a rule of at least min_severity) and 'lines'
+            (the first flagged lines)
+        """
+        matches: Dict[str, int] = {}
+        flagged = 0
+        lines: List[str] = []
+        line_start = line_end = -1
+        line_rules: Set[str] = set()
+        line_flagged = False
+        
+        for match in self.matcher.finditer(text):
+            if match.start() > line_end:
+                # First match on a new line
+                line_start = text.rfind('\n', 0, match.start()) + 1
+                line_end = text.find('\n', match.end())
+                if line_end == -1:
+                    line_end = len(text)
+                line_rules = set()
+                line_flagged = False
+            
+            name, severity, _ = self.rules[int(match.lastgroup[1:])]
+            if name in line_rules:
+                continue
+            line_rules.add(name)
+            matches[name] = matches.get(name, 0) + 1
+            
+            if not line_flagged and SEVERITY_RANK.get(severity, 0) >= self.threshold:
+                line_flagged = True
+                flagged += 1
+                if len(lines) < MAX_SAMPLE_LINES:
+                    lines.append(text[line_start:line_end].strip())
+        
+        return {'matches': matches, 'flagged': flagged, 'lines': lines}
+    
+    def classify(self, host_id: int, logs: List[Dict]) -> Dict:
+        """
+        Classify a host's logs
+        
+        Args:
+            host_id: Host ID
+            logs: Log data from the collection stage
+        
+        Returns:
+            Dictionary with 'suspicious', 'matches', 'flagged', 'lines',
+            'new_templates', 'new_lines', 'line_count' and 'templates'
+            (templates of the logs, new ones included, for remember())
+        """
+        texts = [text for text in (read_log_content(log) for log in logs) if text]
+        
+        verdict = {'matches': {}, 'flagged': 0, 'lines': [], 'new_templates': 0, 'new_lines': [],
+                   'line_count': sum(text.count('\n') + 1 for text in texts), 'templates': []}
+        for text in texts:
+            result = self.scan(text)
+            for name, count in result['matches'].items():
+                verdict['matches'][name] = verdict['matches'].get(name, 0) + count
+            verdict['flagged'] += result['flagged']
+            verdict['lines'].extend(result['lines'][:MAX_SAMPLE_LINES - len(verdict['lines'])])
+        
+        if self.new_templates and texts:
+            self._check_templates(host_id, texts, verdict)
+        
+        verdict['suspicious'] = bool(verdict['flagged'] or verdict['new_templates'])
+        return verdict
+    
+    def _check_templates(self, host_id: int, texts: List[str], verdict: Dict):
+        """Count clusters not joining a known template of the host and collect the logs' templates"""
+        now = datetime.utcnow()
+        with self.db_manager.get_session() as session:
+            known = session.execute(
+                select(KnownLogTemplate.template).where(
+                    KnownLogTemplate.host_id == host_id,
+                    KnownLogTemplate.last_seen >= now - self.template_ttl
+                )
+            ).scalars().all()
+        
+        # Known templates seed the miner; log lines joining them are not new
+        miner = TemplateMiner()
+        seeded = {miner.add(template)['id'] for template in known}
+        seen: Dict[int, Dict] = {}
+        for text in texts:
+            for line in text.splitlines():
+                if not line.strip():
+                    continue
+                cluster = miner.add(line)
+                if cluster['id'] not in seeded and cluster['id'] not in seen:
+                    verdict['new_templates'] += 1
+                    if len(verdict['new_lines']) < MAX_SAMPLE_LINES:
+                        verdict['new_lines'].append(line.strip())
+                seen[cluster['id']] = cluster
+        
+        verdict['templates'] = [template_text(cluster) for cluster in seen.values()]
+    
+    def remember(self, host_id: int, templates: List[str], now: Optional[datetime] = None):
+        """
+        Insert templates of a host or refresh their last_seen
+        
+        Args:
+            host_id: Host ID
+            templates: Template texts (the 'templates' of a classify() verdict)
+            now: Time the templates were seen (default: utcnow)
+        """
+        if not templates:
+            return
+        now = now or datetime.utcnow()
+        rows = [
+            {'host_id': host_id, 'template_hash': template_hash(template), 'template': template,
+             'first_seen': now, 'last_seen': now}
+            for template in templates
+        ]
+        with self.db_manager.get_session() as session:
+            upsert(session, KnownLogTemplate, rows,
+                   index_elements=[KnownLogTemplate.host_id, KnownLogTemplate.template_hash],
+                   update_cols=['last_seen'])
+    
+    def prune(self, now: Optional[datetime] = None) -> int:
+        """
+        Forget templates not seen for template_ttl_days
+        
+        Returns:
+            Number of templates deleted
+        """
+        now = now or datetime.utcnow()
+        with self.db_manager.get_session() as session:
+            deleted = session.execute(
+                delete(KnownLogTemplate).where(KnownLogTemplate.last_seen < now - self.template_ttl)
+            ).rowcount
+        if deleted:
+            logger.debug(f"Forgot {deleted} log templates not seen for {self.template_ttl.days} days")
+        return deleted
+    
+    def analysis(self, host_info: Dict, logs: List[Dict], verdict: Dict) -> Dict:
+        """
+        Deterministic analysis of a host that was not sent to the AI model
+        
+        Args:
+            host_info: Host information
+            logs: Log entries
+            verdict: Result of classify()
+        
+        Returns:
+            Analysis dictionary (same keys as AIAnalyzer.analyze_logs)
+        """
+        minor = sum(verdict['matches'].values())
+        summary = (f"Local pre-classifier found no suspicious lines or new log templates in "
+                   f"{len(logs)} log files ({verdict['line_count']} lines) from "
+                   f"{host_info.get('name')}; AI analysis skipped.")
+        if minor:
+            summary += (f" {minor} lower-severity matches "
+                        f"({', '.join(sorted(verdict['matches']))}).")
+        
+        return {
+            'health_score': max(90, 100 - minor),
+            'severity': 'INFO',
+            'anomalies': [],
+            'summary': summary,
+            'recommendations': 'No action needed.'
+        }
@@ -0,0 +1,209 @@
+"""
+Log template mining for dthostmon
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Compresses logs before they are sent to the AI model. Lines are clustered
+into templates with a Drain-style fixed-depth parse tree: variable fields
+(numbers, IPs, hex values, UUIDs) are masked, lines are routed by token count
+and their first tokens, and joined to the most similar template of the leaf
+or start a new one. Positions where lines of a template differ become <*>.
+
+A summarized log keeps rare lines verbatim, in order, and replaces each
+repeated template by one counted line at its most recent occurrence:
+
+    [412x] Accepted publickey for <*> from <IP> port <NUM> ssh2
+
+When a log still exceeds its character budget, counted templates are dropped
+before rare lines and older lines before recent ones, so unusual lines and
+the recent tail - where current problems show up - are kept.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+WILDCARD = '<*>'
+
+# Masks applied before clustering, in order
+_MASKS = [
+    (re.compile(r'\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b'), '<UUID>'),
+    (re.compile(r'\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b'), '<IP>'),
+    (re.compile(r'\b0x[0-9a-fA-F]+\b'), '<HEX>'),
+    (re.compile(r'\b[0-9a-fA-F]{16,}\b'), '<HEX>'),
+    (re.compile(r'\b\d+(?:[.:,]\d+)*\b'), '<NUM>'),
+]
+
+
+def mask_line(line: str) -> str:
+    """Replace variable fields of a log line by placeholders"""
+    for pattern, placeholder in _MASKS:
+        line = pattern.sub(placeholder, line)
+    return line
+
+
+class TemplateMiner:
+    """Drain-style online log template miner"""
+    
+    def __init__(self, depth: int = 4, similarity: float = 0.5, max_children: int = 100):
+        """
+        Initialize template miner
+        
+        Args:
+            depth: Parse tree depth (token count level + depth - 2 prefix token levels)
+            similarity: Minimum share of equal tokens to join a template
+            max_children: Children per tree node before tokens are routed to <*>
+        """
+        self.prefix_depth = max(1, depth - 2)
+        self.similarity = similarity
+        self.max_children = max_children
+        self.clusters: List[Dict] = []
+        self._root: Dict = {}
+    
+    def add(self, line: str) -> Dict:
+        """
+        Add a line, returning its cluster
+        
+        Clusters are dictionaries with 'id', 'tokens' (the template), 'count'
+        and 'last' (most recent line added).
+        """
+        tokens = mask_line(line).split()
+        node = self._root.setdefault(len(tokens), {})
+        for token in tokens[:self.prefix_depth]:
+            if token not in node:
+                token = token if len(node) < self.max_children and not token.startswith('<') else WILDCARD
+            node = node.setdefault(token, {})
+        leaf = node.setdefault(None, [])
+        
+        cluster = self._best_match(leaf, tokens)
+        if cluster is None:
+            cluster = {'id': len(self.clusters), 'tokens': tokens, 'count': 0, 'last': line}
+            self.clusters.append(cluster)
+            leaf.append(cluster)
+        else:
+            cluster['tokens'] = [
+                t if t == other else WILDCARD for t, other in zip(cluster['tokens'], tokens)
+            ]
+        cluster['count'] += 1
+        cluster['last'] = line
+        return cluster
+    
+    def _best_match(self, leaf: List[Dict], tokens: List[str]) -> Optional[Dict]:
+        """Most similar template of a leaf (equal non-wildcard tokens), if similar enough"""
+        if not tokens:
+            return leaf[0] if leaf else None
+        best, best_score = None, (-1.0, -1)
+        for cluster in leaf:
+            equal = sum(1 for t, other in zip(cluster['tokens'], tokens) if t == other and t != WILDCARD)
+            score = (equal / len(tokens), cluster['tokens'].count(WILDCARD))
+            if score > best_score:
+                best, best_score = cluster, score
+        return best if best is not None and best_score[0] >= self.similarity else None
+
+
+def template_text(cluster: Dict) -> str:
+    """Template of a cluster as text"""
+    return ' '.join(cluster['tokens'])
+
+
+def summarize_log(content: Union[str, Iterable[str]], max_chars: Optional[int] = None, rare_count: int = 2,
+                  known_templates: Optional[Set[str]] = None) -> str:
+    """
+    Collapse repeated lines of a log into counted templates
+    
+    Args:
+        content: Log text, or its lines (mined as they are read)
+        max_chars: Character budget (None: unlimited)
+        rare_count: Templates seen at most this often are kept verbatim
+        known_templates: Templates seen before; lines of other templates are marked [new]
+    
+    Returns:
+        Summarized log text
+    """
+    items = _summary_items(content, rare_count, known_templates)
+    return _fit(items, max_chars)
+
+
+def _summary_items(content: Union[str, Iterable[str]], rare_count: int,
+                   known_templates: Optional[Set[str]]) -> List[Tuple[int, bool, str]]:
+    """
+    (position, verbatim, text) in log order; repeated templates at their last line
+    
+    Only the lines of templates seen at most rare_count times so far are kept
+    while mining, so a long log does not have to be held in memory.
+    """
+    lines = content.splitlines() if isinstance(content, str) else content
+    miner = TemplateMiner()
+    rare: Dict[int, List[Tuple[int, str]]] = {}
+    last_position: Dict[int, int] = {}
+    index = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        cluster = miner.add(line)
+        last_position[cluster['id']] = index
+        if cluster['count'] <= rare_count:
+            rare.setdefault(cluster['id'], []).append((index, line))
+        else:
+            rare.pop(cluster['id'], None)
+        index += 1
+    
+    items: List[Tuple[int, bool, str]] = []
+    for cluster in miner.clusters:
+        new = known_templates is not None and template_text(cluster) not in known_templates
+        if cluster['count'] <= rare_count:
+            items.extend((position, True, f"{line}  [new]" if new else line)
+                         for position, line in rare[cluster['id']])
+        else:
+            items.append((last_position[cluster['id']], False,
+                          f"[{cluster['count']}x]{' [new]' if new else ''} {template_text(cluster)}"))
+    return sorted(items)
+
+
+def _fit(items: List[Tuple[int, bool, str]], max_chars: Optional[int]) -> str:
+    """Drop the oldest templates, then the oldest verbatim lines, until the text fits"""
+    size = sum(len(item[2]) + 1 for item in items) - 1
+    if max_chars is None or size <= max_chars:
+        return '\n'.join(item[2] for item in items)
+    
+    limit = max_chars - 40  # Room for the omission marker
+    dropped = set()
+    for verbatim in (False, True):
+        for index, item in enumerate(items):
+            if size <= limit:
+                break
+            if item[1] == verbatim:
+                dropped.add(index)
+                size -= len(item[2]) + 1
+    
+    kept = [item[2] for index, item in enumerate(items) if index not in dropped]
+    text = '\n'.join([f"... ({len(dropped)} older lines omitted)"] + kept)
+    return text[-max_chars:] if len(text) > max_chars else text
+
+
+def fit_logs(logs: Iterable[Tuple[str, Union[str, Iterable[str]]]], budget: int, rare_count: int = 2,
+             known_templates: Optional[Set[str]] = None) -> List[Tuple[str, str]]:
+    """
+    Summarize several logs into a shared character budget
+    
+    Logs whose summary is small keep all of it; the budget they leave is split
+    evenly between the larger ones.
+    
+    Args:
+        logs: (path, content) pairs; content may be the log's lines
+        budget: Total characters for all summaries
+        rare_count: Templates seen at most this often are kept verbatim
+        known_templates: Templates seen before (see summarize_log)
+    
+    Returns:
+        (path, summary) pairs in the original order
+    """
+    items = [(path, _summary_items(content, rare_count, known_templates)) for path, content in logs]
+    sizes = [max(0, sum(len(item[2]) + 1 for item in log_items) - 1) for _, log_items in items]
+    
+    allowance: Dict[int, int] = {}
+    remaining = budget
+    order = sorted(range(len(items)), key=lambda i: sizes[i])
+    for position, index in enumerate(order):
+        allowance[index] = min(sizes[index], remaining // (len(order) - position))
+        remaining -= allowance[index]
+    
+    return [(path, _fit(log_items, allowance[index])) for index, (path, log_items) in enumerate(items)]
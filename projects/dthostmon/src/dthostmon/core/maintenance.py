@@ -0,0 +1,244 @@
+"""
+Retention, rollup and compaction of monitoring history for dthostmon
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Run with "dthostmon_cli.py maintain" (e.g. daily from cron). Each run:
+
+1. Recomputes the hourly and daily health summaries (min/avg/max health
+   score, failed runs, anomaly and change counts) of the last
+   maintenance.rollup_recompute_hours from raw runs. Saving a run already
+   updates them incrementally (see models/health_series.py); this repairs
+   lost increments. Only complete hours and days are recomputed, so the
+   current ones are left to the incremental updates. Raw runs older than the first hourly rollup (history
+   recorded before rollups existed) are rolled up as well, back to at most
+   maintenance.hourly_days
+2. Deletes raw runs (with their log entries and changes) older than
+   maintenance.raw_days, superseded baselines and expired rollups
+3. Garbage collects log blobs no entry references any more
+
+With database.partitioning on PostgreSQL (see models/partitioning.py), raw
+history is expired by dropping whole monthly partitions instead: upcoming
+partitions are created, and a month is dropped once all of it is older than
+maintenance.raw_days, so raw runs are kept up to a month longer.
+
+Deletes run in batches of maintenance.batch_size rows, each in its own short
+transaction, so the live monitoring path never waits on a long lock.
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, or_, select
+
+from ..models import DatabaseManager
+from ..models.blob_store import delete_runs
+from ..models.database import Baseline, HealthRollup, LogBlob, MonitoringRun
+from ..models.health_series import aggregate_runs, empty_rollup, merge_rollup, truncate_period
+from ..models.partitioning import PartitionManager
+from ..utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class MaintenanceJob:
+    """Applies the configured retention policy to the monitoring history"""
+    
+    def __init__(self, config: Config, db_manager: DatabaseManager):
+        """
+        Initialize maintenance job
+        
+        Args:
+            config: Configuration object (maintenance.* settings)
+            db_manager: Database manager
+        """
+        self.db_manager = db_manager
+        self.raw_days = int(config.get('maintenance.raw_days', 30))
+        self.hourly_days = int(config.get('maintenance.hourly_days', 90))
+        self.daily_days = int(config.get('maintenance.daily_days', 730))
+        self.baseline_days = int(config.get('maintenance.baseline_days', 30))
+        self.rollup_recompute_hours = int(config.get('maintenance.rollup_recompute_hours', 48))
+        self.batch_size = max(1, int(config.get('maintenance.batch_size', 1000)))
+        self.batch_pause = float(config.get('maintenance.batch_pause', 0))
+        self.partitions = None
+        if config._to_bool(config.get('database.partitioning', False)):
+            self.partitions = PartitionManager(
+                db_manager,
+                months_ahead=int(config.get('database.partition_months_ahead', 3)),
+                batch_size=self.batch_size
+            )
+    
+    @property
+    def partitioned(self) -> bool:
+        """Whether raw history is expired by dropping partitions"""
+        return (self.partitions is not None and self.partitions.supported
+                and self.partitions.is_partitioned('monitoring_runs'))
+    
+    def run(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Roll up, expire and compact history
+        
+        Args:
+            now: Reference time (UTC, default: now)
+        
+        Returns:
+            Dictionary with the number of rows written/deleted per step
+        """
+        now = now or datetime.utcnow()
+        started = time.time()
+        
+        # Roll up before deleting so expired runs are summarized first
+        stats = {'rollups': self.update_rollups(now)}
+        raw_cutoff = now - timedelta(days=self.raw_days)
+        if self.partitioned:
+            self.partitions.batch_size = self.batch_size
+            self.partitions.ensure_partitions(now)
+            stats['runs_deleted'] = 0
+            stats['partitions_dropped'] = len(self.partitions.drop_expired(raw_cutoff))
+        else:
+            stats['runs_deleted'] = self._delete_batches(
+                select(MonitoringRun.id).where(MonitoringRun.run_date < raw_cutoff),
+                delete_runs
+            )
+        stats['baselines_deleted'] = self._delete_batches(
+            select(Baseline.id).where(
+                Baseline.is_active.is_(False),
+                Baseline.created_at < now - timedelta(days=self.baseline_days)
+            ),
+            lambda session, ids: session.execute(delete(Baseline).where(Baseline.id.in_(ids))).rowcount
+        )
+        stats['rollups_deleted'] = self._delete_batches(
+            select(HealthRollup.id).where(or_(
+                and_(HealthRollup.period == 'hour',
+                     HealthRollup.period_start < now - timedelta(days=self.hourly_days)),
+                and_(HealthRollup.period == 'day',
+                     HealthRollup.period_start < now - timedelta(days=self.daily_days))
+            )),
+            lambda session, ids: session.execute(delete(HealthRollup).where(HealthRollup.id.in_(ids))).rowcount
+        )
+        stats['blobs_deleted'] = self._delete_batches(
+            select(LogBlob.hash).where(LogBlob.ref_count <= 0),
+            lambda session, hashes: session.execute(
+                delete(LogBlob).where(LogBlob.hash.in_(hashes), LogBlob.ref_count <= 0)
+            ).rowcount
+        )
+        
+        logger.info(f"Maintenance completed in {time.time() - started:.2f}s: "
+                    + ", ".join(f"{key}={value}" for key, value in stats.items()))
+        return stats
+    
+    def _delete_batches(self, id_query, delete_batch: Callable[..., int]) -> int:
+        """
+        Delete rows in batches, one transaction per batch
+        
+        Args:
+            id_query: SELECT of the key column of expired rows
+            delete_batch: Callable(session, keys) deleting one batch, returning the row count
+        
+        Returns:
+            Total number of rows deleted
+        """
+        total = 0
+        while True:
+            with self.db_manager.get_session() as session:
+                keys = session.execute(id_query.order_by(None).limit(self.batch_size)).scalars().all()
+                if not keys:
+                    break
+                deleted = delete_batch(session, keys)
+            total += deleted
+            if len(keys) < self.batch_size:
+                break
+            if self.batch_pause:
+                time.sleep(self.batch_pause)
+        return total
+    
+    def update_rollups(self, now: Optional[datetime] = None) -> int:
+        """
+        Recompute hourly rollups from raw runs and daily rollups from hourly ones
+        
+        Covers the last rollup_recompute_hours complete hours, extended back to
+        the most recent hourly rollup when rollups are behind, and to the
+        oldest run (at most hourly_days back) when runs precede the first
+        hourly rollup. Apart from that backfill it never reaches back beyond
+        raw_days, where runs may already be purged. Days are rebuilt once they
+        are complete; the current hour and day are only updated by record_run.
+        Rollups are replaced, not incremented, which makes re-running safe.
+        
+        Returns:
+            Number of rollup rows written
+        """
+        now = now or datetime.utcnow()
+        end = truncate_period(now, 'hour')  # Only complete hours
+        
+        with self.db_manager.get_session() as session:
+            first, latest = session.execute(
+                select(func.min(HealthRollup.period_start), func.max(HealthRollup.period_start))
+                .where(HealthRollup.period == 'hour')
+            ).one()
+            oldest = session.execute(select(func.min(MonitoringRun.run_date))).scalar()
+            if oldest is None and latest is None:
+                return 0
+            
+            start = end - timedelta(hours=self.rollup_recompute_hours)
+            if latest is not None:
+                start = min(start, truncate_period(latest, 'hour'))
+            if oldest is not None and (first is None or oldest < first):
+                # Runs recorded before the first rollup
+                backfill = max(oldest, now - timedelta(days=self.hourly_days))
+                start = min(start, truncate_period(backfill, 'hour'))
+            else:
+                # Older runs may already be purged; their rollups are kept as they are
+                raw_start = truncate_period(now - timedelta(days=self.raw_days), 'hour') + timedelta(hours=1)
+                start = max(start, raw_start)
+            if start >= end:
+                return 0
+            
+            hourly = aggregate_runs(session, start, end, 'hour')
+            written = self._replace_rollups(session, 'hour', start, end, hourly)
+            
+            # Complete days touched by the new hours, rebuilt from all their hourly rollups
+            day_start = truncate_period(start, 'day')
+            day_end = truncate_period(end, 'day')
+            if day_start < day_end:
+                daily = self._aggregate_hours(session, day_start, day_end)
+                written += self._replace_rollups(session, 'day', day_start, day_end, daily)
+        
+        logger.debug(f"Updated {written} health rollups from {start} to {end}")
+        return written
+    
+    def _aggregate_hours(self, session, start: datetime, end: datetime) -> Dict[Tuple[int, datetime], Dict]:
+        """Aggregate hourly rollups in [start, end) per host and day"""
+        rollups = session.query(HealthRollup).filter(
+            HealthRollup.period == 'hour',
+            HealthRollup.period_start >= start,
+            HealthRollup.period_start < end
+        ).all()
+        
+        aggregates: Dict[Tuple[int, datetime], Dict] = {}
+        for rollup in rollups:
+            agg = aggregates.setdefault((rollup.host_id, truncate_period(rollup.period_start, 'day')),
+                                        empty_rollup())
+            merge_rollup(agg, {key: getattr(rollup, key) for key in empty_rollup()})
+        return aggregates
+    
+    def _replace_rollups(self, session, period: str, start: datetime, end: datetime,
+                         aggregates: Dict[Tuple[int, datetime], Dict]) -> int:
+        """
+        Write aggregates for [start, end), replacing all existing rollups of that window
+        
+        The window is cleared first, so rollups of periods without runs any
+        more (e.g. after a retention purge) do not survive the recompute.
+        """
+        session.execute(delete(HealthRollup).where(
+            HealthRollup.period == period,
+            HealthRollup.period_start >= start,
+            HealthRollup.period_start < end
+        ))
+        session.add_all(
+            HealthRollup(host_id=host_id, period=period, period_start=period_start, **values)
+            for (host_id, period_start), values in aggregates.items()
+        )
+        
+        session.flush()  # Daily aggregation reads the hourly rows back
+        return len(aggregates)
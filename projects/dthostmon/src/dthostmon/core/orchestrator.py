@@ -1,20 +1,35 @@
 """
 Main monitoring orchestrator for dthostmon
-Last Updated: 11/14/2025 12:00:00 PM CDT
+Last Updated: 10/16/2026 12:00:00 PM CDT
 
 Coordinates monitoring runs across multiple hosts with SSH, AI analysis, and alerting.
 """
 
 import logging
 import time
-from datetime import datetime
-from typing import List, Dict, Optional
+from datetime import datetime, timezone
+from typing import List, Dict, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from ..models.database import Host, MonitoringRun, LogEntry, Baseline, DetectedChange
+from sqlalchemy import func, insert, update
+
+from ..models.database import (Host, MonitoringRun, LogEntry, Baseline, DetectedChange,
+                               LogTailState)
 from ..models import DatabaseManager
-from ..core.ssh_client import SSHClient, SSHConnectionError, LogRetrievalError
+from ..models.blob_store import store_blobs
+from ..models.health_series import record_run
+from ..models.log_history import load_delta_bases, plan_snapshot
+from ..core.ssh_client import (MAX_CHANNELS, SSHClient, SSHConnectionError, LogRetrievalError,
+                               read_log_content, release_log_spools)
+from ..core.ssh_pool import SSHConnectionPool
+from ..core.host_health import HostHealthTracker
+from ..core.baseline_cache import BaselineCache
+from ..core.host_sync import sync_hosts
+from ..core.async_engine import AsyncCollectionEngine
+from ..core.analysis_pipeline import AnalysisPipeline
 from ..core.ai_analyzer import AIAnalyzer
+from ..core.analysis_cache import AnalysisCache
+from ..core.log_classifier import LogClassifier
 from ..core.email_alert import EmailAlert
 from ..core.pushover_alert import PushoverAlert
 from ..core.report_scheduler import ReportScheduler
@@ -40,6 +55,27 @@ class MonitoringOrchestrator:
         # Initialize AI analyzer
         ai_config = config.get('ai', {})
         self.ai_analyzer = AIAnalyzer(ai_config)
+        self.analysis_cache = None
+        if config._to_bool(config.get('ai.cache.enabled', False)):
+            self.analysis_cache = AnalysisCache(
+                db_manager,
+                prompt_version=self.ai_analyzer.prompt_version,
+                ttl_hours=float(config.get('ai.cache.ttl_hours', 24)),
+                max_entries=int(config.get('ai.cache.max_entries', 10000))
+            )
+            self.ai_analyzer.cache = self.analysis_cache
+        
+        # Local pre-classifier: only hosts with suspicious lines or new templates reach the AI model
+        self.log_classifier = None
+        if config._to_bool(config.get('ai.pre_classifier.enabled', False)):
+            self.log_classifier = LogClassifier(
+                db_manager,
+                min_severity=config.get('ai.pre_classifier.min_severity', 'WARN'),
+                new_templates=config._to_bool(config.get('ai.pre_classifier.new_templates', True)),
+                template_ttl_days=float(config.get('ai.pre_classifier.template_ttl_days', 30))
+            )
+        # Templates of hosts sent to the AI model, remembered once their analysis is saved
+        self._pending_templates: Dict[int, List[str]] = {}
         
         # Initialize email alerter
         email_config = config.get('email', {})
@@ -66,19 +102,68 @@ class MonitoringOrchestrator:
         # Initialize report scheduler
         self.report_scheduler = ReportScheduler(config, db_manager, self.email_alert)
         
+        # Active baselines, loaded once per cycle
+        self.baseline_cache = BaselineCache(db_manager)
+        
         # Configuration
         self.max_concurrent = config.get('global.max_concurrent_hosts', 5)
+        self.engine = config.get('global.engine', 'threads')
         self.ssh_key_path = config.get('ssh.key_path')
         self.ssh_timeout = config.get('ssh.timeout', 10)
+        self.tail_mode = config._to_bool(config.get('ssh.tail_mode', False))
+        self.batched_retrieval = config._to_bool(config.get('ssh.batched_retrieval', False))
+        self.hash_precheck = config._to_bool(config.get('ssh.hash_precheck', False))
+        self.ssh_compression = config.get('ssh.compression', 'none')
+        self.ssh_max_channels = int(config.get('ssh.max_channels', 1))
+        if self.ssh_max_channels > MAX_CHANNELS:
+            logger.warning(f"ssh.max_channels {self.ssh_max_channels} exceeds the sshd default "
+                           f"MaxSessions, using {MAX_CHANNELS}")
+            self.ssh_max_channels = MAX_CHANNELS
+        self.delta_storage = config._to_bool(config.get('database.delta_storage', False))
+        self.delta_keyframe_interval = int(config.get('database.delta_keyframe_interval', 20))
+        
+        # Streaming retrieval spills logs above spool_threshold bytes to temp files
+        self.ssh_spool_threshold = None
+        if config._to_bool(config.get('ssh.streaming', False)):
+            self.ssh_spool_threshold = int(config.get('ssh.spool_threshold', 8 * 1024 * 1024))
+        
+        # Persistent connections are only useful when the process outlives a cycle
+        self.ssh_pool = None
+        if config._to_bool(config.get('ssh.connection_pool', False)):
+            self.ssh_pool = SSHConnectionPool(
+                keepalive_interval=int(config.get('ssh.keepalive_interval', 30)),
+                max_idle=int(config.get('ssh.pool_max_idle', 900))
+            )
+        
+        # Circuit breaker and adaptive connect timeouts for unreliable hosts
+        self.health_tracker = None
+        self._health_seeded = False
+        if config._to_bool(config.get('ssh.circuit_breaker.enabled', False)):
+            self.health_tracker = HostHealthTracker(
+                failure_threshold=int(config.get('ssh.circuit_breaker.failure_threshold', 3)),
+                cooldown=float(config.get('ssh.circuit_breaker.cooldown', 300)),
+                max_cooldown=float(config.get('ssh.circuit_breaker.max_cooldown', 3600)),
+                min_timeout=float(config.get('ssh.circuit_breaker.min_timeout', 2)),
+                max_timeout=float(self.ssh_timeout or 10),
+                timeout_multiplier=float(config.get('ssh.circuit_breaker.timeout_multiplier', 4))
+            )
         
         logger.info("Monitoring orchestrator initialized")
     
+    def close(self):
+        """Release long-lived resources (pooled SSH connections)"""
+        if self.ssh_pool:
+            self.ssh_pool.close_all()
+    
     def run_monitoring_cycle(self):
         """Execute monitoring cycle for all enabled hosts"""
         logger.info("=" * 70)
         logger.info("Starting monitoring cycle")
         cycle_start = time.time()
         
+        if self.ssh_pool:
+            self.ssh_pool.prune_idle()
+        
         # Sync hosts from config to database
         self._sync_hosts()
         
@@ -102,6 +187,75 @@ class MonitoringOrchestrator:
             logger.warning("No enabled hosts found in configuration")
             return
         
+        if self.health_tracker and not self._health_seeded:
+            self._seed_health_tracker(host_data)
+        
+        # All active baselines for the cycle in one query
+        self.baseline_cache.load(h['id'] for h in host_data)
+        
+        if self.engine == 'asyncio':
+            results = self._run_async_engine(host_data)
+        elif self.engine == 'pipeline':
+            results = self._run_pipeline_engine(host_data)
+        else:
+            results = self._run_thread_engine(host_data)
+        
+        self._expire_analysis_state()
+        
+        cycle_time = time.time() - cycle_start
+        successful = sum(1 for r in results if r.get('status') == 'success')
+        skipped = sum(1 for r in results if r.get('status') == 'skipped')
+        failed = len(results) - successful - skipped
+        
+        logger.info(f"Monitoring cycle completed in {cycle_time:.2f}s: "
+                   f"{successful} successful, {failed} failed"
+                   + (f", {skipped} skipped (circuit open)" if skipped else ""))
+        logger.info("=" * 70)
+    
+    def _expire_analysis_state(self):
+        """Evict expired cached AI analyses and forget log templates past their TTL"""
+        if self.analysis_cache:
+            try:
+                self.analysis_cache.evict()
+            except Exception as e:
+                logger.warning(f"Failed to evict cached AI analyses: {e}")
+        
+        if self.log_classifier:
+            try:
+                self.log_classifier.prune()
+            except Exception as e:
+                logger.warning(f"Failed to prune known log templates: {e}")
+    
+    def _run_async_engine(self, host_data: List[Dict]) -> List[Dict]:
+        """Monitor hosts with the asyncio engine (per-stage concurrency limits)"""
+        engine = AsyncCollectionEngine(
+            self,
+            max_collections=self.config.get('global.async_engine.max_collections', 200),
+            max_analyses=self.config.get('global.async_engine.max_analyses', 10),
+            max_db_writes=self.config.get('global.async_engine.max_db_writes', 5),
+            connect_retries=self.config.get('global.retry_attempts', 3)
+        )
+        logger.info(f"Monitoring {len(host_data)} hosts with asyncio engine "
+                    f"(collect={engine.max_collections}, analyze={engine.max_analyses}, "
+                    f"db={engine.max_db_writes})")
+        return engine.run(host_data)
+    
+    def _run_pipeline_engine(self, host_data: List[Dict]) -> List[Dict]:
+        """Monitor hosts with collectors and analysis workers joined by a bounded queue"""
+        pipeline = AnalysisPipeline(
+            self,
+            max_collections=self.max_concurrent,
+            max_analyses=self.config.get('global.pipeline_engine.max_analyses', 10),
+            queue_size=self.config.get('global.pipeline_engine.queue_size', 20),
+            connect_retries=self.config.get('global.retry_attempts', 3)
+        )
+        logger.info(f"Monitoring {len(host_data)} hosts with pipeline engine "
+                    f"(collect={pipeline.max_collections}, analyze={pipeline.max_analyses}, "
+                    f"queue={pipeline.queue_size})")
+        return pipeline.run(host_data)
+    
+    def _run_thread_engine(self, host_data: List[Dict]) -> List[Dict]:
+        """Monitor hosts on a thread pool, one worker per host for the whole run"""
         logger.info(f"Monitoring {len(host_data)} hosts with max {self.max_concurrent} concurrent connections")
         
         # Process hosts concurrently
@@ -122,18 +276,15 @@ class MonitoringOrchestrator:
                     logger.error(f"✗ Failed monitoring for {host['name']}: {e}")
                     results.append({'host': host, 'status': 'failed', 'error': str(e)})
         
-        cycle_time = time.time() - cycle_start
-        successful = sum(1 for r in results if r.get('status') == 'success')
-        failed = len(results) - successful
-        
-        logger.info(f"Monitoring cycle completed in {cycle_time:.2f}s: "
-                   f"{successful} successful, {failed} failed")
-        logger.info("=" * 70)
+        return results
     
     def _monitor_single_host(self, host: Dict) -> Dict:
         """
         Monitor a single host
         
+        Runs the collection, analysis and persistence stages back to back.
+        The async engine schedules the same stages independently.
+        
         Args:
             host: Host configuration dictionary
         
@@ -141,343 +292,607 @@ class MonitoringOrchestrator:
             Dictionary with monitoring results
         """
         start_time = time.time()
-        host_id = host['id']
-        host_name = host['name']
         
-        logger.info(f"Starting monitoring for {host_name} ({host['hostname']})")
+        allowed, probe = self._check_circuit(host)
+        if not allowed:
+            return self._skip_host(host)
+        
+        logger.info(f"Starting monitoring for {host['name']} ({host['hostname']})")
         
         try:
-            # Connect via SSH and retrieve logs
-            ssh_client = SSHClient(
-                hostname=host['hostname'],
-                port=host['port'],
-                username=host['user'],
-                key_path=self.ssh_key_path,
-                timeout=self.ssh_timeout
-            )
+            logs = self._collect_host_logs(host, retries=1 if probe else self.config.get('global.retry_attempts', 3))
+            analysis = self._analyze_host(host, logs)
+            return self._finalize_host(host, logs, analysis, start_time)
             
-            with ssh_client:
-                # Retrieve logs
-                logs = ssh_client.retrieve_multiple_logs(host['logs'])
-                logger.debug(f"Retrieved {len(logs)} log files from {host_name}")
+        except (SSHConnectionError, LogRetrievalError) as e:
+            return self._handle_host_failure(host, start_time, e)
             
-            # Get baseline for comparison
-            with self.db_manager.get_session() as session:
-                baseline = (
-                    session.query(Baseline)
-                    .filter(Baseline.host_id == host_id, Baseline.is_active == True)
-                    .first()
+        except Exception as e:
+            logger.exception(f"Unexpected error monitoring {host['name']}")
+            return self._handle_host_failure(host, start_time, e, unexpected=True)
+    
+    def _collect_host_logs(self, host: Dict, retries: int = 3) -> List[Dict]:
+        """
+        Collection stage: connect via SSH and retrieve the host's logs
+        
+        Args:
+            host: Host configuration dictionary
+            retries: SSH connection attempts (blocking backoff between attempts)
+        
+        Returns:
+            List of log data dictionaries
+        
+        Raises:
+            SSHConnectionError, LogRetrievalError: On connection/retrieval failure
+        """
+        # Adaptive connect timeout from observed latency (circuit breaker enabled)
+        timeout = self.ssh_timeout
+        if self.health_tracker:
+            timeout = self.health_tracker.connect_timeout(host['name'])
+        
+        ssh_client = SSHClient(
+            hostname=host['hostname'],
+            port=host['port'],
+            username=host['user'],
+            key_path=self.ssh_key_path,
+            timeout=timeout,
+            compression=self.ssh_compression,
+            pool=self.ssh_pool,
+            max_channels=self.ssh_max_channels,
+            spool_threshold=self.ssh_spool_threshold
+        )
+        
+        # In tail mode only bytes appended since the last run are retrieved
+        tail_states = self._load_tail_states(host['id']) if self.tail_mode else None
+        
+        # Hash precheck skips downloads of logs that still match their baseline
+        # (tail mode already transfers only new bytes, so it takes precedence)
+        known_hashes = None
+        if self.hash_precheck and not self.tail_mode:
+            known_hashes = self.baseline_cache.get(host['id'])
+        
+        ssh_client.connect(retries=retries)
+        if self.health_tracker:
+            self.health_tracker.record_success(host['name'], ssh_client.connect_latency)
+        try:
+            # Retrieve logs (batched mode uses a single remote round trip)
+            if known_hashes is not None:
+                logs = ssh_client.retrieve_logs_with_precheck(
+                    host['logs'], known_hashes, batched=self.batched_retrieval
                 )
+            elif self.batched_retrieval:
+                logs = ssh_client.retrieve_logs_batched(host['logs'], tail_states=tail_states)
+            else:
+                logs = ssh_client.retrieve_multiple_logs(host['logs'], tail_states=tail_states)
+            logger.debug(f"Retrieved {len(logs)} log files from {host['name']}")
+        finally:
+            ssh_client.disconnect()
+        
+        return logs
+    
+    def _analyze_host(self, host: Dict, logs: List[Dict]) -> Dict:
+        """
+        Analysis stage: run AI analysis on collected logs
+        
+        Args:
+            host: Host configuration dictionary
+            logs: Log data from the collection stage
+        
+        Returns:
+            Analysis dictionary from AIAnalyzer (or the pre-classifier)
+        """
+        if self.log_classifier:
+            try:
+                verdict = self.log_classifier.classify(host['id'], logs)
+            except Exception as e:
+                logger.warning(f"Pre-classification failed for {host['name']}, using AI analysis: {e}")
+            else:
+                if not verdict['suspicious']:
+                    logger.info(f"Skipping AI analysis for {host['name']}: "
+                                f"no suspicious lines or new log templates")
+                    analysis = self.log_classifier.analysis(host, logs, verdict)
+                    self._remember_templates(host, verdict['templates'])
+                    return analysis
+                self._pending_templates[host['id']] = verdict['templates']
+                logger.debug(f"Pre-classifier flagged {host['name']}: {verdict['flagged']} suspicious "
+                             f"lines, {verdict['new_templates']} new templates")
+        
+        # Get baseline for comparison
+        baselines = self.baseline_cache.get(host['id'])
+        baseline_info = None
+        if baselines:
+            baseline_info = {'content_hash': next(iter(baselines.values()))['hash']}
+        
+        # AI analysis
+        logger.debug(f"Running AI analysis for {host['name']}")
+        return self.ai_analyzer.analyze_logs(
+            host_info=host,
+            logs=logs,
+            baseline=baseline_info
+        )
+    
+    def _remember_templates(self, host: Dict, templates: List[str]):
+        """Store the log templates of an analyzed host as known"""
+        try:
+            self.log_classifier.remember(host['id'], templates)
+        except Exception as e:
+            logger.warning(f"Failed to remember log templates of {host['name']}: {e}")
+    
+    def _finalize_host(self, host: Dict, logs: List[Dict], analysis: Dict,
+                       start_time: float) -> Dict:
+        """
+        Persistence stage: detect changes, save results, alert and report
+        
+        Args:
+            host: Host configuration dictionary
+            logs: Log data from the collection stage
+            analysis: Analysis dictionary from the analysis stage
+            start_time: time.time() when monitoring of this host started
+        
+        Returns:
+            Dictionary with monitoring results
+        """
+        host_id = host['id']
+        host_name = host['name']
+        
+        # Save results, baselines, tail offsets and last_seen in one transaction
+        execution_time = time.time() - start_time
+        try:
+            run_record, changes = self._persist_host_results(host_id, logs, analysis, execution_time)
+        finally:
+            # Spilled log content is only needed until it has been persisted
+            release_log_spools(logs)
+        run_id = run_record['id']
+        
+        # New templates count as known only once an AI analysis has seen them
+        templates = self._pending_templates.pop(host_id, None) if self.log_classifier else None
+        if templates and not analysis.get('fallback'):
+            self._remember_templates(host, templates)
+        
+        # Send alert if warranted
+        if analysis.get('severity') in ['WARN', 'CRITICAL']:
+            logger.info(f"Sending alert for {host_name} (severity: {analysis['severity']})")
+            self._send_alert(host, run_record, analysis, changes)
             
-            # AI analysis
-            logger.debug(f"Running AI analysis for {host_name}")
-            analysis = self.ai_analyzer.analyze_logs(
-                host_info=host,
-                logs=logs,
-                baseline={'content_hash': baseline.content_hash} if baseline else None
-            )
-            
-            # Detect changes
-            changes = self._detect_changes(logs, host_id)
-            
-            # Save results to database
-            execution_time = time.time() - start_time
-            run_id = self._save_monitoring_run(
-                host_id=host_id,
-                status='success',
-                execution_time=execution_time,
-                analysis=analysis,
-                logs=logs,
-                changes=changes
-            )
-            
-            # Update baseline
-            self._update_baselines(host_id, logs)
-            
-            # Update last_seen
-            with self.db_manager.get_session() as session:
-                host_obj = session.query(Host).filter(Host.id == host_id).first()
-                host_obj.last_seen = datetime.utcnow()
-            
-            # Send alert if warranted
-            if analysis.get('severity') in ['WARN', 'CRITICAL']:
-                logger.info(f"Sending alert for {host_name} (severity: {analysis['severity']})")
-                self._send_alert(host, run_id, analysis, changes)
-                
-                # Send Pushover alert for critical issues
-                try:
-                    with self.db_manager.get_session() as session:
-                        run = session.query(MonitoringRun).filter(MonitoringRun.id == run_id).first()
-                        if run:
-                            monitoring_data = {
-                                'alert_level': run.alert_level,
-                                'health_score': run.health_score,
-                                'anomalies_detected': run.anomalies_detected,
-                                'changes_detected': run.changes_detected,
-                                'ai_summary': run.ai_summary
-                            }
-                            self.pushover_alert.send_monitoring_alert(monitoring_data, host)
-                except Exception as e:
-                    logger.error(f"Failed to send Pushover alert: {e}")
-            
-            # Send report if due based on frequency configuration
-            monitoring_data = {
-                'run_date': datetime.utcnow(),
-                'status': 'success',
-                'health_score': analysis['health_score'],
-                'anomalies_detected': analysis.get('anomalies_detected', 0),
-                'changes_detected': len(changes)
-            }
-            ai_analysis = {
-                'summary': analysis.get('summary'),
-                'recommendations': analysis.get('recommendations'),
-                'alert_level': analysis.get('severity', 'INFO')
-            }
-            self.report_scheduler.send_host_report(host_id, monitoring_data, ai_analysis)
-            
-            logger.info(f"Monitoring successful for {host_name}: "
-                       f"Health={analysis['health_score']}/100, "
-                       f"Changes={len(changes)}, "
-                       f"Time={execution_time:.2f}s")
-            
-            return {
-                'host': host,
-                'status': 'success',
-                'run_id': run_id,
-                'health_score': analysis['health_score'],
-                'execution_time': execution_time
-            }
-            
-        except (SSHConnectionError, LogRetrievalError) as e:
-            logger.error(f"Connection/retrieval error for {host_name}: {e}")
-            execution_time = time.time() - start_time
-            run_id = self._save_monitoring_run(
-                host_id=host_id,
-                status='failed',
-                execution_time=execution_time,
-                error_message=str(e)
-            )
-            return {
-                'host': host,
-                'status': 'failed',
-                'error': str(e),
-                'run_id': run_id
-            }
+            # Send Pushover alert for critical issues
+            try:
+                monitoring_data = {
+                    'alert_level': run_record['alert_level'],
+                    'health_score': run_record['health_score'],
+                    'anomalies_detected': run_record['anomalies_detected'],
+                    'changes_detected': run_record['changes_detected'],
+                    'ai_summary': run_record['ai_summary']
+                }
+                self.pushover_alert.send_monitoring_alert(monitoring_data, host)
+            except Exception as e:
+                logger.error(f"Failed to send Pushover alert: {e}")
+        
+        # Send report if due based on frequency configuration
+        monitoring_data = {
+            'run_date': datetime.utcnow(),
+            'status': 'success',
+            'health_score': analysis['health_score'],
+            'anomalies_detected': analysis.get('anomalies_detected', 0),
+            'changes_detected': len(changes)
+        }
+        ai_analysis = {
+            'summary': analysis.get('summary'),
+            'recommendations': analysis.get('recommendations'),
+            'alert_level': analysis.get('severity', 'INFO')
+        }
+        self.report_scheduler.send_host_report(host_id, monitoring_data, ai_analysis)
+        
+        logger.info(f"Monitoring successful for {host_name}: "
+                   f"Health={analysis['health_score']}/100, "
+                   f"Changes={len(changes)}, "
+                   f"Time={execution_time:.2f}s")
+        
+        return {
+            'host': host,
+            'status': 'success',
+            'run_id': run_id,
+            'health_score': analysis['health_score'],
+            'execution_time': execution_time
+        }
+    
+    def _handle_host_failure(self, host: Dict, start_time: float, error: Exception,
+                             unexpected: bool = False) -> Dict:
+        """
+        Record a failed monitoring run for a host
+        
+        Args:
+            host: Host configuration dictionary
+            start_time: time.time() when monitoring of this host started
+            error: Exception that stopped monitoring
+            unexpected: False for SSH connection/retrieval errors
+        
+        Returns:
+            Dictionary with monitoring results (status 'failed')
+        """
+        if self.log_classifier:
+            self._pending_templates.pop(host['id'], None)
+        if not unexpected:
+            logger.error(f"Connection/retrieval error for {host['name']}: {error}")
+            if self.ssh_pool:
+                # Never hand a possibly broken transport to the next cycle
+                self.ssh_pool.discard(host['hostname'], host['port'], host['user'])
+            if self.health_tracker and isinstance(error, SSHConnectionError):
+                self.health_tracker.record_failure(host['name'])
+        
+        execution_time = time.time() - start_time
+        run_id = self._save_monitoring_run(
+            host_id=host['id'],
+            status='failed',
+            execution_time=execution_time,
+            error_message=f"Unexpected error: {error}" if unexpected else str(error)
+        )
+        return {
+            'host': host,
+            'status': 'failed',
+            'error': f"Unexpected: {error}" if unexpected else str(error),
+            'run_id': run_id
+        }
+    
+    def _check_circuit(self, host: Dict) -> Tuple[bool, bool]:
+        """
+        Ask the health tracker whether to connect to a host this cycle
+        
+        Returns:
+            Tuple of (allowed, probe); always (True, False) without a tracker
+        """
+        if not self.health_tracker:
+            return True, False
+        return self.health_tracker.allow(host['name'])
+    
+    def _skip_host(self, host: Dict) -> Dict:
+        """
+        Record a host skipped because its circuit is open
+        
+        Args:
+            host: Host configuration dictionary
+        
+        Returns:
+            Dictionary with monitoring results (status 'skipped')
+        """
+        status = self.health_tracker.status(host['name'])
+        reason = (f"Circuit open after {status['consecutive_failures']} consecutive connection "
+                  f"failures, next probe in {status['retry_in'] or 0:.0f}s")
+        logger.info(f"Skipping {host['name']}: {reason}")
+        
+        run_id = self._save_monitoring_run(
+            host_id=host['id'],
+            status='skipped',
+            execution_time=0.0,
+            error_message=reason
+        )
+        return {'host': host, 'status': 'skipped', 'error': reason, 'run_id': run_id}
+    
+    def _seed_health_tracker(self, host_data: List[Dict]):
+        """
+        Restore circuit state from monitoring history in one query
+        
+        Counts each host's failed runs since its last success, so hosts that
+        were already failing before a restart are not hammered again.
+        """
+        host_names = {h['id']: h['name'] for h in host_data}
+        window = self.health_tracker.failure_threshold + 16
+        
+        with self.db_manager.get_session() as session:
+            ranked = session.query(
+                MonitoringRun.host_id,
+                MonitoringRun.status,
+                MonitoringRun.run_date,
+                func.row_number().over(
+                    partition_by=MonitoringRun.host_id,
+                    order_by=MonitoringRun.run_date.desc()
+                ).label('rank')
+            ).filter(
+                MonitoringRun.host_id.in_(list(host_names)),
+                MonitoringRun.status != 'skipped'
+            ).subquery()
             
-        except Exception as e:
-            logger.exception(f"Unexpected error monitoring {host_name}")
-            execution_time = time.time() - start_time
-            run_id = self._save_monitoring_run(
-                host_id=host_id,
-                status='failed',
-                execution_time=execution_time,
-                error_message=f"Unexpected error: {e}"
-            )
-            return {
-                'host': host,
-                'status': 'failed',
-                'error': f"Unexpected: {e}",
-                'run_id': run_id
-            }
+            rows = session.query(ranked.c.host_id, ranked.c.status, ranked.c.run_date).filter(
+                ranked.c.rank <= window
+            ).order_by(ranked.c.host_id, ranked.c.rank).all()
+        
+        history: Dict[int, Dict] = {}
+        for host_id, status, run_date in rows:
+            entry = history.setdefault(host_id, {'failures': 0, 'last_failure': None, 'done': False})
+            if entry['done']:
+                continue
+            if status != 'failed':
+                entry['done'] = True
+                continue
+            entry['failures'] += 1
+            if entry['last_failure'] is None and run_date is not None:
+                # run_date is stored as naive UTC
+                entry['last_failure'] = run_date.replace(tzinfo=timezone.utc).timestamp()
+        
+        for host_id, entry in history.items():
+            self.health_tracker.seed(host_names[host_id], entry['failures'], entry['last_failure'])
+        
+        self._health_seeded = True
     
-    def _detect_changes(self, logs: List[Dict], host_id: int) -> List[Dict]:
+    def _detect_changes(self, logs: List[Dict], baselines: Dict[str, Dict]) -> List[Dict]:
         """
         Detect changes by comparing with previous baselines
         
         Args:
             logs: Current log entries
-            host_id: Host ID
+            baselines: Active baselines keyed by log path (see BaselineCache.get)
         
         Returns:
             List of detected changes
         """
         changes = []
         
-        with self.db_manager.get_session() as session:
-            for log in logs:
-                if not log.get('content'):
-                    continue
-                
-                # Get previous baseline
-                baseline = (
-                    session.query(Baseline)
-                    .filter(
-                        Baseline.host_id == host_id,
-                        Baseline.log_file_path == log['path'],
-                        Baseline.is_active == True
-                    )
-                    .first()
-                )
+        for log in logs:
+            if not log.get('content'):
+                continue
                 
-                if baseline:
-                    # Compare hashes
-                    if log['hash'] != baseline.content_hash:
-                        changes.append({
-                            'change_type': 'log_modified',
-                            'severity': 'INFO',
-                            'description': f"Log file {log['path']} has changed "
-                                         f"({log['line_count']} lines, {log['file_size']} bytes)",
-                            'log_file_path': log['path']
-                        })
-                else:
-                    # New log file
+            baseline = baselines.get(log['path'])
+            if baseline:
+                # Compare hashes
+                if log['hash'] != baseline['hash']:
                     changes.append({
-                        'change_type': 'new_log',
+                        'change_type': 'log_modified',
                         'severity': 'INFO',
-                        'description': f"New log file detected: {log['path']}",
+                        'description': f"Log file {log['path']} has changed "
+                                     f"({log['line_count']} lines, {log['file_size']} bytes)",
                         'log_file_path': log['path']
                     })
+            else:
+                # New log file
+                changes.append({
+                    'change_type': 'new_log',
+                    'severity': 'INFO',
+                    'description': f"New log file detected: {log['path']}",
+                    'log_file_path': log['path']
+                })
         
         return changes
     
+    def _persist_host_results(self, host_id: int, logs: List[Dict], analysis: Dict,
+                              execution_time: float) -> Tuple[Dict, List[Dict]]:
+        """
+        Write a successful run in a single transaction
+        
+        Compares against the cached baselines, then inserts the run (RETURNING
+        its id), its log entries and changes in bulk, rotates the baselines of
+        logs whose hash changed, stores tail offsets and bumps last_seen before
+        one commit.
+        
+        Args:
+            host_id: Host ID
+            logs: Log data from the collection stage
+            analysis: Analysis dictionary from the analysis stage
+            execution_time: Seconds spent on this host
+        
+        Returns:
+            Tuple of (run record dict, detected changes)
+        """
+        with self.db_manager.get_session() as session:
+            changes = self._detect_changes(logs, self.baseline_cache.get(host_id))
+            changed_logs = self.baseline_cache.changed(host_id, logs)
+            
+            run_record = self._persist_run(
+                session,
+                host_id=host_id,
+                status='success',
+                execution_time=execution_time,
+                analysis=analysis,
+                logs=logs,
+                changes=changes
+            )
+            self._write_baselines(session, host_id, changed_logs)
+            
+            # Tail offsets only advance together with the run that consumed them
+            if self.tail_mode:
+                self._write_tail_states(session, host_id, logs)
+            
+            session.execute(
+                update(Host).where(Host.id == host_id).values(last_seen=run_record['run_date'])
+            )
+        
+        # Only committed baselines reach the cache
+        self.baseline_cache.update(host_id, changed_logs)
+        return run_record, changes
+    
     def _save_monitoring_run(self, host_id: int, status: str, execution_time: float,
                             analysis: Optional[Dict] = None, logs: Optional[List[Dict]] = None,
                             changes: Optional[List[Dict]] = None, 
                             error_message: Optional[str] = None) -> int:
         """Save monitoring run to database"""
         with self.db_manager.get_session() as session:
-            # Create monitoring run
-            run = MonitoringRun(
-                host_id=host_id,
-                run_date=datetime.utcnow(),
-                status=status,
-                execution_time=execution_time,
-                error_message=error_message,
-                health_score=analysis.get('health_score') if analysis else None,
-                anomalies_detected=len(analysis.get('anomalies', [])) if analysis else 0,
-                changes_detected=len(changes) if changes else 0,
-                ai_summary=analysis.get('summary') if analysis else None,
-                ai_recommendations=analysis.get('recommendations') if analysis else None,
-                alert_level=analysis.get('severity', 'INFO') if analysis else 'INFO'
-            )
-            session.add(run)
-            session.flush()  # Get run.id
+            run_record = self._persist_run(session, host_id, status, execution_time, analysis,
+                                           logs, changes, error_message)
+        return run_record['id']
             
-            # Save log entries
-            if logs:
-                for log in logs:
-                    if log.get('content'):
-                        log_entry = LogEntry(
-                            monitoring_run_id=run.id,
-                            log_file_path=log['path'],
-                            content=log['content'],
-                            content_hash=log['hash'],
-                            line_count=log['line_count'],
-                            file_size=log['file_size'],
-                            retrieved_at=log['retrieved_at']
-                        )
-                        session.add(log_entry)
+    def _persist_run(self, session, host_id: int, status: str, execution_time: float,
+                     analysis: Optional[Dict] = None, logs: Optional[List[Dict]] = None,
+                     changes: Optional[List[Dict]] = None,
+                     error_message: Optional[str] = None) -> Dict:
+        """
+        Insert a monitoring run with its log entries and changes (no commit)
+        
+        Returns:
+            Dictionary with the run's columns, including the generated id
+        """
+        run_record = {
+            'host_id': host_id,
+            'run_date': datetime.utcnow(),
+            'status': status,
+            'execution_time': execution_time,
+            'error_message': error_message,
+            'health_score': analysis.get('health_score') if analysis else None,
+            'anomalies_detected': len(analysis.get('anomalies', [])) if analysis else 0,
+            'changes_detected': len(changes) if changes else 0,
+            'ai_summary': analysis.get('summary') if analysis else None,
+            'ai_recommendations': analysis.get('recommendations') if analysis else None,
+            'alert_level': analysis.get('severity', 'INFO') if analysis else 'INFO'
+        }
+        run_record['id'] = session.execute(
+            insert(MonitoringRun).values(**run_record).returning(MonitoringRun.id)
+        ).scalar_one()
+        record_run(session, run_record)
+        
+        # Unchanged logs (hash precheck) are recorded without content
+        stored = [log for log in logs or [] if log.get('content') or log.get('unchanged')]
+        with_content = [log for log in stored if log.get('content')]
+        
+        # Delta mode stores only what was appended since the previous snapshot
+        bases = {}
+        if self.delta_storage and with_content:
+            bases = load_delta_bases(session, host_id, [log['path'] for log in with_content])
+        plans = [
+            plan_snapshot(read_log_content(log), bases.get(log['path']),
+                          self.delta_keyframe_interval if self.delta_storage else 0)
+            for log in with_content
+        ]
+        for plan, blob_hash in zip(plans, store_blobs(session, [p.pop('stored') for p in plans])):
+            plan['blob_hash'] = blob_hash
+        plans = iter(plans)
+        
+        log_rows = [
+            {
+                'monitoring_run_id': run_record['id'],
+                'log_file_path': log['path'],
+                'content_hash': log['hash'],
+                'line_count': log['line_count'],
+                'file_size': log['file_size'],
+                'retrieved_at': log['retrieved_at'],
+                'run_date': run_record['run_date'],
+                **(next(plans) if log.get('content') else {})
+            }
+            for log in stored
+        ]
+        if log_rows:
+            session.execute(insert(LogEntry), log_rows)
             
-            # Save detected changes
-            if changes:
-                for change in changes:
-                    detected_change = DetectedChange(
-                        monitoring_run_id=run.id,
-                        change_type=change['change_type'],
-                        severity=change['severity'],
-                        description=change['description'],
-                        log_file_path=change.get('log_file_path')
-                    )
-                    session.add(detected_change)
+        if changes:
+            session.execute(insert(DetectedChange), [
+                {
+                    'monitoring_run_id': run_record['id'],
+                    'change_type': change['change_type'],
+                    'severity': change['severity'],
+                    'description': change['description'],
+                    'log_file_path': change.get('log_file_path')
+                }
+                for change in changes
+            ])
             
-            session.commit()
-            return run.id
+        return run_record
+    
+    def _write_baselines(self, session, host_id: int, logs: List[Dict]):
+        """Replace the active baselines of logs whose hash changed (no commit)"""
+        rows = [
+            {
+                'host_id': host_id,
+                'log_file_path': log['path'],
+                'content_hash': log['hash'],
+                'line_count': log['line_count'],
+                'is_active': True
+            }
+            for log in logs
+            if log.get('content')
+        ]
+        if not rows:
+            return
+                
+        # Deactivate old baselines
+        session.execute(
+            update(Baseline)
+            .where(
+                Baseline.host_id == host_id,
+                Baseline.log_file_path.in_([row['log_file_path'] for row in rows]),
+                Baseline.is_active.is_(True)
+            )
+            .values(is_active=False)
+        )
+        session.execute(insert(Baseline), rows)
     
-    def _update_baselines(self, host_id: int, logs: List[Dict]):
-        """Update baseline snapshots for logs"""
+    def _load_tail_states(self, host_id: int) -> Dict[str, Dict]:
+        """Load incremental retrieval state for all logs of a host, keyed by path"""
         with self.db_manager.get_session() as session:
-            for log in logs:
-                if not log.get('content'):
-                    continue
+            states = session.query(LogTailState).filter(LogTailState.host_id == host_id).all()
+            return {
+                s.log_file_path: {
+                    'inode': s.inode,
+                    'offset': s.offset or 0,
+                    'file_size': s.file_size or 0,
+                    'hash': s.rolling_hash
+                }
+                for s in states
+            }
+    
+    def _write_tail_states(self, session, host_id: int, logs: List[Dict]):
+        """Persist tail positions returned by SSHClient.retrieve_log_tail (no commit)"""
+        existing = {
+            s.log_file_path: s
+            for s in session.query(LogTailState).filter(LogTailState.host_id == host_id).all()
+        }
+            
+        for log in logs:
+            tail_state = log.get('tail_state')
+            if not tail_state:
+                continue
                 
-                # Deactivate old baselines
-                session.query(Baseline).filter(
-                    Baseline.host_id == host_id,
-                    Baseline.log_file_path == log['path']
-                ).update({'is_active': False})
+            state = existing.get(log['path'])
+            if state is None:
+                state = LogTailState(host_id=host_id, log_file_path=log['path'])
+                session.add(state)
                 
-                # Create new baseline
-                baseline = Baseline(
-                    host_id=host_id,
-                    log_file_path=log['path'],
-                    content_hash=log['hash'],
-                    line_count=log['line_count'],
-                    is_active=True
-                )
-                session.add(baseline)
+            state.inode = tail_state['inode']
+            state.offset = tail_state['offset']
+            state.file_size = tail_state['file_size']
+            state.rolling_hash = tail_state['hash']
+            state.updated_at = datetime.utcnow()
     
-    def _send_alert(self, host: Dict, run_id: int, analysis: Dict, changes: List[Dict]):
+    def _send_alert(self, host: Dict, run_record: Dict, analysis: Dict, changes: List[Dict]):
         """Send email alert"""
         try:
-            with self.db_manager.get_session() as session:
-                run = session.query(MonitoringRun).filter(MonitoringRun.id == run_id).first()
+            monitoring_data = {
+                'id': run_record['id'],
+                'run_date': run_record['run_date'],
+                'health_score': run_record['health_score'],
+                'anomalies_detected': run_record['anomalies_detected'],
+                'changes_detected': run_record['changes_detected'],
+                'ai_summary': run_record['ai_summary'],
+                'ai_recommendations': run_record['ai_recommendations'],
+                'alert_level': run_record['alert_level'],
+                'execution_time': run_record['execution_time'],
+                'log_entries': []
+            }
                 
-                monitoring_data = {
-                    'id': run.id,
-                    'run_date': run.run_date,
-                    'health_score': run.health_score,
-                    'anomalies_detected': run.anomalies_detected,
-                    'changes_detected': run.changes_detected,
-                    'ai_summary': run.ai_summary,
-                    'ai_recommendations': run.ai_recommendations,
-                    'alert_level': run.alert_level,
-                    'execution_time': run.execution_time,
-                    'log_entries': []
+            change_data = [
+                {
+                    'change_type': c['change_type'],
+                    'severity': c['severity'],
+                    'description': c['description'],
+                    'log_file_path': c.get('log_file_path')
                 }
+                for c in changes
+            ]
                 
-                change_data = [
-                    {
-                        'change_type': c['change_type'],
-                        'severity': c['severity'],
-                        'description': c['description'],
-                        'log_file_path': c.get('log_file_path')
-                    }
-                    for c in changes
-                ]
+            self.email_alert.send_monitoring_alert(
+                recipients=self.alert_recipients,
+                monitoring_run=monitoring_data,
+                changes=change_data,
+                host_info=host
+            )
                 
-                self.email_alert.send_monitoring_alert(
-                    recipients=self.alert_recipients,
-                    monitoring_run=monitoring_data,
-                    changes=change_data,
-                    host_info=host
+            # Mark alert as sent
+            with self.db_manager.get_session() as session:
+                session.execute(
+                    update(MonitoringRun)
+                    .where(MonitoringRun.id == run_record['id'])
+                    .values(alert_sent=True)
                 )
                 
-                # Mark alert as sent
-                run.alert_sent = True
-                session.commit()
-                
         except Exception as e:
             logger.error(f"Failed to send alert: {e}")
     
     def _sync_hosts(self):
-        """Sync hosts from configuration to database"""
-        config_hosts = self.config.hosts
-        
+        """Sync hosts from configuration to database (only changed hosts are written)"""
         with self.db_manager.get_session() as session:
-            for config_host in config_hosts:
-                # Check if host exists
-                existing = session.query(Host).filter(Host.name == config_host['name']).first()
-                
-                if existing:
-                    # Update existing host
-                    existing.hostname = config_host['hostname']
-                    existing.port = config_host.get('port', 22)
-                    existing.user = config_host['user']
-                    existing.enabled = config_host.get('enabled', True)
-                    existing.tags = config_host.get('tags', [])
-                    existing.logs_to_monitor = config_host.get('logs', [])
-                    existing.updated_at = datetime.utcnow()
-                else:
-                    # Create new host
-                    new_host = Host(
-                        name=config_host['name'],
-                        hostname=config_host['hostname'],
-                        port=config_host.get('port', 22),
-                        user=config_host['user'],
-                        enabled=config_host.get('enabled', True),
-                        tags=config_host.get('tags', []),
-                        logs_to_monitor=config_host.get('logs', [])
-                    )
-                    session.add(new_host)
-            
-            session.commit()
+            sync_hosts(session, self.config.hosts)
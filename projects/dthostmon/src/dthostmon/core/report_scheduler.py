@@ -1,6 +1,6 @@
 """
 Report Scheduler for dthostmon
-Last Updated: 1/16/2025 12:00:00 PM CST
+Last Updated: 10/16/2026 12:00:00 PM CDT
 
 Handles scheduling and sending of Host and Site reports via email based on
 configured frequencies (Global > Site > Host hierarchy).
@@ -13,6 +13,7 @@ from sqlalchemy.orm import Session
 
 from ..models.database import Host, MonitoringRun
 from ..models import DatabaseManager
+from ..models.health_series import load_series, summarize
 from ..core.host_report import HostReportGenerator
 from ..core.site_report import SiteReportGenerator
 from ..core.email_alert import EmailAlert
@@ -193,6 +194,9 @@ class ReportScheduler:
                 host_data = []
                 cutoff_time = datetime.utcnow() - timedelta(hours=hours)
                 
+                # Health over the report period from the hourly rollups
+                series = load_series(session, [host.id for host in hosts], cutoff_time, 'hour')
+                
                 for host in hosts:
                     # Get most recent monitoring run
                     latest_run = session.query(MonitoringRun).filter(
@@ -205,20 +209,24 @@ class ReportScheduler:
                             'host': host,
                             'monitoring_run': latest_run,
                             'hostname': host.hostname,
-                            'name': host.name
+                            'name': host.name,
+                            'health_summary': summarize(series[host.id])
                         })
                 
                 if not host_data:
                     logger.warning(f"No monitoring data found for site {site_name} in last {hours} hours")
                     return False
                 
+                site_summary = summarize(point for points in series.values() for point in points)
+                site_summary['hours'] = hours
+                
                 # Get resource thresholds for the site
                 thresholds = self.config.get_resource_thresholds(site_name)
                 
                 # Generate site report
                 logger.info(f"Generating site report for {site_name}")
                 generator = SiteReportGenerator(site_name, thresholds)
-                markdown_report = generator.generate_report(host_data)
+                markdown_report = generator.generate_report(host_data, site_summary)
                 
                 # Send report via email
                 subject = f"[dthostmon] Site Report: {site_name}"
@@ -1,6 +1,6 @@
 """
 Site Report Generator for dthostmon
-Last Updated: 11/15/2025 6:15:00 PM CDT
+Last Updated: 10/16/2026 12:00:00 PM CDT
 
 Generates site-wide Markdown reports showing:
 - Critical items across all systems in the site
@@ -65,7 +65,7 @@ class SiteReportGenerator:
             report_sections.append(self._generate_critical_items_section(critical_items))
         
         # Site Overview
-        report_sections.append(self._generate_site_overview_section(host_data))
+        report_sections.append(self._generate_site_overview_section(host_data, site_summary))
         
         # Systems with Changes
         systems_with_changes = self._extract_systems_with_changes(host_data)
@@ -143,12 +143,17 @@ class SiteReportGenerator:
         
         return "\n".join(section)
     
-    def _generate_site_overview_section(self, host_data: List[Dict[str, Any]]) -> str:
+    def _generate_site_overview_section(
+        self,
+        host_data: List[Dict[str, Any]],
+        site_summary: Optional[Dict[str, Any]] = None
+    ) -> str:
         """
         Generate site overview with aggregate statistics.
         
         Args:
             host_data: List of host monitoring data
+            site_summary: Optional health aggregate of the report period
         
         Returns:
             Markdown section
@@ -205,6 +210,17 @@ class SiteReportGenerator:
         section.append(f"- Memory: {avg_memory:.1f}%")
         section.append(f"- Disk: {avg_disk:.1f}%")
         
+        if site_summary and site_summary.get('run_count'):
+            period = f"last {site_summary['hours']} hours" if site_summary.get('hours') else "report period"
+            section.append("")
+            section.append(f"**Monitoring ({period}):**")
+            section.append(f"- Runs: {site_summary['run_count']} ({site_summary['failed_count']} failed)")
+            if site_summary.get('health_avg') is not None:
+                section.append(f"- Health Score: avg {site_summary['health_avg']:.0f} "
+                               f"(min {site_summary['health_min']}, max {site_summary['health_max']})")
+            section.append(f"- Anomalies: {site_summary['anomalies_total']}, "
+                           f"Changes: {site_summary['changes_total']}")
+        
         return "\n".join(section)
     
     def _generate_changes_section(self, systems_with_changes: List[Dict[str, Any]]) -> str:
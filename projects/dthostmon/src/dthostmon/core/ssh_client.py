@@ -1,19 +1,85 @@
 """
 SSH connection and remote log retrieval
-Last Updated: 11/14/2025 12:00:00 PM CDT
+Last Updated: 10/16/2026 12:00:00 PM CDT
 
 Handles SSH connections to remote hosts and log file retrieval.
+Supports full retrieval (cat) and incremental tail retrieval that only
+fetches bytes appended since the previous run, with optional gzip/zstd
+compressed transport. In streaming mode large logs are spilled to temporary
+files instead of being held in memory.
 """
 
 import paramiko
 import hashlib
 import logging
-from typing import Dict, List, Optional, Tuple
+import os
+import re
+import fnmatch
+import shlex
+import tempfile
+import threading
+import time
+import zlib
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency - zstd transport disabled without it
+    zstandard = None
+
+from ..utils.log_policy import resolve_since, split_log_entry
+
+if TYPE_CHECKING:
+    from .ssh_pool import SSHConnectionPool
 
 logger = logging.getLogger(__name__)
 
+# A configured log: plain path/glob or {'path': ..., 'max_bytes'/'tail_lines'/'since': ...}
+LogEntrySpec = Union[str, Dict[str, Any]]
+
+# Upper bound on concurrent exec channels per connection (sshd's default MaxSessions)
+MAX_CHANNELS = 10
+
+# Bytes read from the SSH channel per iteration when streaming
+STREAM_CHUNK_SIZE = 65536
+
+# Decoded head of a spilled log kept in memory (covers the AI prompt budget)
+STREAM_PREVIEW_BYTES = 65536
+
+# Error/warning lines collected while streaming (same terms as host reports)
+HIGHLIGHT_PATTERN = re.compile(rb'\b(?:error|fail|critical|fatal|warn|warning)\b', re.IGNORECASE)
+MAX_STREAM_HIGHLIGHTS = 50
+
+# Remote compressor command and local streaming decompressor per codec
+COMPRESSION_CODECS = {
+    'zstd': ('zstd -q -c', lambda: zstandard.ZstdDecompressor().decompressobj()),
+    'gzip': ('gzip -1 -c', lambda: zlib.decompressobj(16 + zlib.MAX_WBITS)),
+}
+
+# Remote shell function applying a per-log retrieval policy to "$f". Expects
+# $size and $start; $mb, $tl and $since are '-' when unset. Moves $start forward
+# so only the last tail_lines lines / max_bytes bytes (whole lines) are read and
+# returns 1 when the file was not modified since the cutoff.
+POLICY_SHELL = (
+    "pol() {\n"
+    '  if [ "$since" != - ] && [ "$(stat -L -c %Y "$f")" -lt "$since" ]; then return 1; fi\n'
+    '  if [ "$tl" != - ]; then\n'
+    '    n=$(tail -n "$tl" "$f" | wc -c); [ $((size - n)) -gt "$start" ] && start=$((size - n))\n'
+    "  fi\n"
+    '  if [ "$mb" != - ] && [ $((size - start)) -gt "$mb" ]; then\n'
+    '    n=$(tail -c $((mb + 1)) "$f" | tail -n +2 | wc -c); start=$((size - n))\n'
+    "  fi\n"
+    "  return 0\n"
+    "}\n"
+)
+
+# Frame header emitted by the batched retrieval script, one per file:
+#   @@DTHOSTMON <OK|FAIL> <length> <size> <inode> <start> <path>\n<length bytes>
+BATCH_FRAME_MARKER = '@@DTHOSTMON'
+
 
 class SSHConnectionError(Exception):
     """Raised when SSH connection fails"""
@@ -25,11 +91,174 @@ class LogRetrievalError(Exception):
     pass
 
 
+# Parsed private keys keyed by (path, mtime) so key files are read once per process
+_private_key_cache: Dict[Tuple[str, int], paramiko.PKey] = {}
+_private_key_lock = threading.Lock()
+
+
+def load_private_key(key_path: str) -> paramiko.PKey:
+    """
+    Load an Ed25519 private key, caching the parsed key per process
+    
+    The cache is keyed on the file's mtime so a rotated key is picked up.
+    """
+    cache_key = (key_path, os.stat(key_path).st_mtime_ns)
+    with _private_key_lock:
+        key = _private_key_cache.get(cache_key)
+        if key is None:
+            key = paramiko.Ed25519Key.from_private_key_file(key_path)
+            _private_key_cache[cache_key] = key
+        return key
+
+
+def read_log_content(log: Dict[str, any]) -> Optional[str]:
+    """
+    Return the full content of a retrieved log
+    
+    Logs spilled to disk in streaming mode only carry a preview in 'content';
+    the complete text is read back from the spool file.
+    
+    Args:
+        log: Log data dictionary from SSHClient
+    
+    Returns:
+        Decoded log content, or None if the log has no content
+    """
+    spool = log.get('spool')
+    if spool is None:
+        return log.get('content')
+    spool.seek(0)
+    return spool.read().decode('utf-8', errors='replace')
+
+
+def iter_log_lines(log: Dict[str, any]) -> Iterator[str]:
+    """
+    Yield the lines of a retrieved log without their line endings
+    
+    Spilled logs are read back from the spool file one line at a time, so the
+    complete text never has to be held in memory.
+    
+    Args:
+        log: Log data dictionary from SSHClient
+    """
+    spool = log.get('spool')
+    if spool is None:
+        yield from (log.get('content') or '').splitlines()
+        return
+    spool.seek(0)
+    for raw in spool:
+        # UTF-8 never uses the newline byte inside a multi-byte sequence
+        yield from raw.decode('utf-8', errors='replace').splitlines()
+
+
+def release_log_spools(logs: List[Dict[str, any]]):
+    """Close (and delete) the spool files of spilled logs"""
+    for log in logs or []:
+        spool = log.pop('spool', None)
+        if spool is not None:
+            spool.close()
+
+
+class _StreamDigest:
+    """
+    Computes SHA256, size, line count and highlights over streamed log bytes in one pass
+    
+    With a spool threshold the bytes go to a SpooledTemporaryFile that stays
+    in memory up to the threshold and rolls over to disk beyond it.
+    """
+    
+    def __init__(self, spool_threshold: Optional[int] = None):
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+        self.newlines = 0
+        self.chunks: List[bytes] = []
+        self.highlights: List[str] = []
+        self.spool_threshold = spool_threshold
+        self.spool = None
+        if spool_threshold is not None:
+            self.spool = tempfile.SpooledTemporaryFile(max_size=spool_threshold,
+                                                       prefix='dthostmon-')
+        self._last_byte = b''
+        self._carry = b''
+    
+    def update(self, data: bytes):
+        """Feed the next chunk of (decompressed) log bytes"""
+        if not data:
+            return
+        self.sha256.update(data)
+        self.size += len(data)
+        self.newlines += data.count(b'\n')
+        if self.spool is not None:
+            self.spool.write(data)
+        else:
+            self.chunks.append(data)
+        self._last_byte = data[-1:]
+        self._scan_highlights(data)
+    
+    def _scan_highlights(self, data: bytes, final: bool = False):
+        """Collect error/warning lines from complete lines, carrying the partial last line"""
+        if len(self.highlights) >= MAX_STREAM_HIGHLIGHTS:
+            return
+        data = self._carry + data
+        end = len(data) if final else data.rfind(b'\n') + 1
+        # Never buffer more than one chunk of a newline-free line
+        self._carry = data[end:][-STREAM_CHUNK_SIZE:]
+        
+        line_end = 0
+        for match in HIGHLIGHT_PATTERN.finditer(data, 0, end):
+            if match.start() < line_end:
+                continue  # Already collected this line
+            line_start = data.rfind(b'\n', 0, match.start()) + 1
+            line_end = data.find(b'\n', match.end(), end)
+            if line_end == -1:
+                line_end = end
+            self.highlights.append(data[line_start:line_end].decode('utf-8', errors='replace').strip())
+            if len(self.highlights) >= MAX_STREAM_HIGHLIGHTS:
+                break
+    
+    def finish(self):
+        """Flush the trailing partial line into the highlights"""
+        if self._carry:
+            self._scan_highlights(b'', final=True)
+            self._carry = b''
+    
+    @property
+    def spilled(self) -> bool:
+        """True if the content exceeded the spool threshold"""
+        return self.spool is not None and self.size > self.spool_threshold
+    
+    @property
+    def line_count(self) -> int:
+        """Number of lines, counting a final line without trailing newline"""
+        if self.size and self._last_byte != b'\n':
+            return self.newlines + 1
+        return self.newlines
+    
+    @property
+    def content(self) -> str:
+        """Decoded log content"""
+        if self.spool is not None:
+            self.spool.seek(0)
+            return self.spool.read().decode('utf-8', errors='replace')
+        return b''.join(self.chunks).decode('utf-8', errors='replace')
+    
+    def preview(self, limit: int) -> str:
+        """Decoded first `limit` bytes of the log"""
+        if self.spool is not None:
+            self.spool.seek(0)
+            head = self.spool.read(limit)
+        else:
+            head = b''.join(self.chunks)[:limit]
+        return head.decode('utf-8', errors='replace')
+
+
 class SSHClient:
     """SSH client for connecting to remote hosts and retrieving logs"""
     
     def __init__(self, hostname: str, port: int, username: str, 
-                 key_path: str, timeout: int = 10):
+                 key_path: str, timeout: int = 10, compression: Optional[str] = None,
+                 pool: Optional['SSHConnectionPool'] = None, max_channels: int = 1,
+                 spool_threshold: Optional[int] = None):
         """
         Initialize SSH client
         
@@ -39,41 +268,78 @@ class SSHClient:
             username: SSH username
             key_path: Path to SSH private key
             timeout: Connection timeout in seconds
+            compression: Log transport compression: None/'none', 'gzip', 'zstd'
+                or 'auto' (zstd, then gzip, depending on remote availability)
+            pool: Optional SSHConnectionPool to reuse authenticated connections
+            max_channels: Concurrent exec channels used by retrieve_multiple_logs
+                (at most MAX_CHANNELS)
+            spool_threshold: Enables streaming retrieval; logs larger than this
+                many bytes are spilled to a temporary file (None buffers in memory)
         """
         self.hostname = hostname
         self.port = port
         self.username = username
         self.key_path = key_path
         self.timeout = timeout
+        self.compression = compression
+        self.pool = pool
+        self.max_channels = min(MAX_CHANNELS, max(1, int(max_channels or 1)))
+        self.spool_threshold = spool_threshold
+        # Seconds taken by the last successful connect (None if reused from the pool)
+        self.connect_latency: Optional[float] = None
         self.client: Optional[paramiko.SSHClient] = None
         self.connected = False
+        self._codec: Optional[str] = None
+        self._codec_resolved = False
     
     def connect(self, retries: int = 3) -> bool:
         """
         Establish SSH connection with retry logic
         
+        When a connection pool is configured, an existing healthy pooled
+        connection is reused and a new one is only opened if needed.
+        
         Args:
             retries: Number of retry attempts
         
         Returns:
             True if connection successful
         
+        Raises:
+            SSHConnectionError: If connection fails after all retries
+        """
+        if self.pool is not None:
+            self.client = self.pool.acquire(
+                self.hostname, self.port, self.username,
+                lambda: self._open_connection(retries)
+            )
+        else:
+            self.client = self._open_connection(retries)
+        
+        self.connected = True
+        return True
+    
+    def _open_connection(self, retries: int) -> paramiko.SSHClient:
+        """
+        Open and authenticate a new SSH connection with exponential backoff
+        
         Raises:
             SSHConnectionError: If connection fails after all retries
         """
         for attempt in range(retries):
+            attempt_start = time.monotonic()
             try:
-                self.client = paramiko.SSHClient()
-                self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+                client = paramiko.SSHClient()
+                client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
                 
-                # Load private key
+                # Load private key (parsed once per process)
                 if not Path(self.key_path).exists():
                     raise SSHConnectionError(f"SSH key not found: {self.key_path}")
                 
-                private_key = paramiko.Ed25519Key.from_private_key_file(self.key_path)
+                private_key = load_private_key(self.key_path)
                 
                 # Connect
-                self.client.connect(
+                client.connect(
                     hostname=self.hostname,
                     port=self.port,
                     username=self.username,
@@ -83,10 +349,10 @@ class SSHClient:
                     allow_agent=False
                 )
                 
-                self.connected = True
+                self.connect_latency = time.monotonic() - attempt_start
                 logger.info(f"SSH connected to {self.username}@{self.hostname}:{self.port}")
-                return True
-                
+                return client
+            
             except (paramiko.AuthenticationException, 
                     paramiko.SSHException, 
                     OSError) as e:
@@ -97,14 +363,17 @@ class SSHClient:
                     )
                 
                 # Exponential backoff: 1s, 2s, 4s
-                import time
                 time.sleep(2 ** attempt)
         
-        return False
+        raise SSHConnectionError(f"Failed to connect to {self.hostname}: no attempts made")
     
     def disconnect(self):
-        """Close SSH connection"""
-        if self.client:
+        """Close SSH connection (pooled connections stay open for reuse)"""
+        if self.client and self.pool is not None:
+            self.client = None
+            self.connected = False
+            logger.debug(f"Released pooled SSH connection to {self.hostname}")
+        elif self.client:
             self.client.close()
             self.connected = False
             logger.debug(f"SSH disconnected from {self.hostname}")
@@ -134,17 +403,243 @@ class SSHClient:
             stderr_str = stderr.read().decode('utf-8', errors='replace')
             
             return stdout_str, stderr_str, exit_code
+        
+        except Exception as e:
+            logger.error(f"Command execution failed: {e}")
+            raise LogRetrievalError(f"Failed to execute command: {e}")
+    
+    def execute_command_raw(self, command: str, timeout: int = 30) -> Tuple[bytes, str, int]:
+        """
+        Execute remote command and return stdout as undecoded bytes
+        
+        Used where stdout carries byte-length framing that must not be
+        altered by UTF-8 decoding.
+        
+        Args:
+            command: Shell command to execute
+            timeout: Command execution timeout
+        
+        Returns:
+            Tuple of (stdout bytes, stderr, exit_code)
+        
+        Raises:
+            SSHConnectionError: If not connected
+        """
+        if not self.connected or not self.client:
+            raise SSHConnectionError("Not connected to remote host")
+        
+        try:
+            stdin, stdout, stderr = self.client.exec_command(command, timeout=timeout)
+            stdout_bytes = stdout.read()
+            stderr_str = stderr.read().decode('utf-8', errors='replace')
+            exit_code = stdout.channel.recv_exit_status()
             
+            return stdout_bytes, stderr_str, exit_code
+        
         except Exception as e:
             logger.error(f"Command execution failed: {e}")
             raise LogRetrievalError(f"Failed to execute command: {e}")
     
-    def retrieve_log_file(self, log_path: str) -> Dict[str, any]:
+    def _resolve_codec(self) -> Optional[str]:
+        """
+        Pick the transport codec for this connection
+        
+        Probes the remote host once for zstd/gzip and caches the result.
+        Returns None (plain text) when compression is disabled or unavailable.
+        """
+        if self._codec_resolved:
+            return self._codec
+        self._codec_resolved = True
+        
+        if not self.compression or self.compression == 'none':
+            return None
+        
+        if self.compression == 'auto':
+            candidates = ['zstd', 'gzip']
+        elif self.compression in COMPRESSION_CODECS:
+            candidates = [self.compression]
+        else:
+            logger.warning(f"Unknown compression '{self.compression}', using plain transport")
+            return None
+        
+        if zstandard is None and 'zstd' in candidates:
+            logger.debug("zstandard package not installed, zstd transport unavailable")
+            candidates.remove('zstd')
+        
+        try:
+            stdout, _, _ = self.execute_command(
+                "for c in zstd gzip; do command -v $c; done; true"
+            )
+        except LogRetrievalError:
+            return None
+        remote_tools = {Path(line.strip()).name for line in stdout.splitlines() if line.strip()}
+        
+        for codec in candidates:
+            if codec in remote_tools:
+                self._codec = codec
+                logger.debug(f"Using {codec} transport compression for {self.hostname}")
+                return codec
+        
+        logger.debug(f"No remote compressor available on {self.hostname}, using plain transport")
+        return None
+    
+    def stream_command(self, command: str, sink: Callable[[bytes], None],
+                       codec: Optional[str] = None, timeout: int = 30) -> Tuple[str, int]:
+        """
+        Execute remote command and stream stdout into a sink in chunks
+        
+        Args:
+            command: Shell command to execute (its stdout is compressed with
+                codec on the remote side when codec is given)
+            sink: Callable receiving each decompressed chunk of stdout
+            codec: Compression codec name from COMPRESSION_CODECS, or None
+            timeout: Command execution timeout
+        
+        Returns:
+            Tuple of (stderr, exit_code)
+        
+        Raises:
+            SSHConnectionError: If not connected
+        """
+        if not self.connected or not self.client:
+            raise SSHConnectionError("Not connected to remote host")
+        
+        decompressor = None
+        if codec:
+            compress_cmd, decompressor_factory = COMPRESSION_CODECS[codec]
+            command = f"{{ {command}\n}} | {compress_cmd}"
+            decompressor = decompressor_factory()
+        
+        try:
+            stdin, stdout, stderr = self.client.exec_command(command, timeout=timeout)
+            
+            while True:
+                chunk = stdout.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                sink(decompressor.decompress(chunk) if decompressor else chunk)
+            if decompressor:
+                sink(decompressor.flush())
+            
+            stderr_str = stderr.read().decode('utf-8', errors='replace')
+            exit_code = stdout.channel.recv_exit_status()
+            return stderr_str, exit_code
+        
+        except Exception as e:
+            logger.error(f"Command execution failed: {e}")
+            raise LogRetrievalError(f"Failed to execute command: {e}")
+    
+    def _execute_compressed(self, command: str, codec: str,
+                            timeout: int = 30) -> Tuple[bytes, str, int]:
+        """Execute command over compressed transport, returning decompressed stdout"""
+        chunks: List[bytes] = []
+        stderr, exit_code = self.stream_command(command, chunks.append, codec=codec,
+                                                timeout=timeout)
+        return b''.join(chunks), stderr, exit_code
+    
+    def _retrieve_log_file_streamed(self, log_path: str, codec: Optional[str],
+                                    policy: Optional[Dict[str, any]] = None) -> Dict[str, any]:
+        """
+        Retrieve a full log as a stream of chunks
+        
+        Readability check, policy and transfer share one command. The stream
+        is (decompressed and) digested chunk by chunk while hash, line count,
+        size and highlights are computed; with a spool threshold the content
+        never has to fit in memory.
+        """
+        digest = _StreamDigest(self.spool_threshold)
+        command = self._streamed_log_command(log_path, codec, policy)
+        if codec:
+            decompressor = COMPRESSION_CODECS[codec][1]()
+            
+            def sink(chunk: bytes):
+                digest.update(decompressor.decompress(chunk))
+        else:
+            sink = digest.update
+        
+        try:
+            stderr, exit_code = self.stream_command(command, sink)
+            if codec:
+                digest.update(decompressor.flush())
+        except Exception:
+            if digest.spool is not None:
+                digest.spool.close()
+            raise
+        
+        if exit_code != 0:
+            if digest.spool is not None:
+                digest.spool.close()
+            return self._stream_failure(log_path, exit_code, stderr, policy)
+        
+        logger.debug(f"Retrieved {log_path} via {codec or 'stream'}: {digest.size} bytes, "
+                     f"{digest.line_count} lines{' (spilled to disk)' if digest.spilled else ''}")
+        
+        return self._digest_result(log_path, digest)
+    
+    def _streamed_log_command(self, log_path: str, codec: Optional[str],
+                              policy: Optional[Dict[str, any]]) -> str:
+        """Remote command for _retrieve_log_file_streamed (exit 3 = not readable, 4 = skipped)"""
+        quoted = shlex.quote(log_path)
+        compress_cmd = f" | {COMPRESSION_CODECS[codec][0]}" if codec else ""
+        if policy:
+            return (
+                f"{POLICY_SHELL}f={quoted}; {self._policy_vars(policy)}"
+                "test -r \"$f\" || exit 3; size=$(stat -L -c %s \"$f\"); start=0; "
+                "pol || exit 4; "
+                f"tail -c +$((start + 1)) \"$f\" | head -c $((size - start)){compress_cmd}"
+            )
+        # Compress the file directly (not via a pipeline) so exit 3 = "not readable" survives
+        if codec:
+            return f"test -r {quoted} || exit 3; {COMPRESSION_CODECS[codec][0]} < {quoted}"
+        return f"test -r {quoted} || exit 3; cat < {quoted}"
+    
+    def _stream_failure(self, log_path: str, exit_code: int, stderr: str,
+                        policy: Optional[Dict[str, any]]) -> Dict[str, any]:
+        """Result for a failed streamed retrieval, raising unless the log is unavailable or skipped"""
+        if exit_code == 3:
+            logger.warning(f"Log file not accessible: {log_path}")
+            return self._unavailable_result(log_path, 'File not accessible')
+        if exit_code == 4 and policy:
+            return self._skipped_result(log_path, policy)
+        raise LogRetrievalError(f"Failed to read {log_path}: {stderr}")
+    
+    def _digest_result(self, log_path: str, digest: _StreamDigest) -> Dict[str, any]:
+        """
+        Build the result dictionary for a streamed log
+        
+        Spilled logs keep only a preview in 'content' and hand the spool file
+        over in 'spool' (see read_log_content / release_log_spools).
+        """
+        digest.finish()
+        result = {
+            'path': log_path,
+            'hash': digest.sha256.hexdigest(),
+            'line_count': digest.line_count,
+            'file_size': digest.size,
+            'retrieved_at': datetime.utcnow(),
+            'error': None,
+            'highlights': digest.highlights
+        }
+        
+        if digest.spilled:
+            result['content'] = digest.preview(STREAM_PREVIEW_BYTES)
+            result['content_truncated'] = True
+            result['spool'] = digest.spool
+        else:
+            result['content'] = digest.content
+            if digest.spool is not None:
+                digest.spool.close()
+        return result
+    
+    def retrieve_log_file(self, log_path: str,
+                          policy: Optional[Dict[str, any]] = None) -> Dict[str, any]:
         """
         Retrieve log file contents from remote host
         
         Args:
             log_path: Absolute path to log file on remote host
+            policy: Optional retrieval policy (max_bytes, tail_lines, since)
+                enforced on the remote side before transfer
         
         Returns:
             Dictionary with:
@@ -154,6 +649,10 @@ class SSHClient:
                 - line_count: Number of lines
                 - file_size: Size in bytes
                 - retrieved_at: Timestamp
+            Streamed retrieval (compression or spool_threshold) adds 'highlights';
+            logs spilled to disk also carry 'spool' and 'content_truncated' and
+            hold only a preview in 'content'. Logs skipped by a 'since' policy
+            have content None and 'skipped' set.
         
         Raises:
             LogRetrievalError: If file cannot be retrieved
@@ -162,6 +661,10 @@ class SSHClient:
             raise SSHConnectionError("Not connected to remote host")
         
         try:
+            codec = self._resolve_codec()
+            if codec or self.spool_threshold is not None or policy:
+                return self._retrieve_log_file_streamed(log_path, codec, policy)
+            
             # Check if file exists and is readable
             check_cmd = f"test -r '{log_path}' && echo 'OK' || echo 'FAIL'"
             stdout, stderr, exit_code = self.execute_command(check_cmd)
@@ -178,79 +681,597 @@ class SSHClient:
                     'error': 'File not accessible'
                 }
             
-            # Retrieve file contents
+            # Retrieve file contents as bytes, so the hash matches a remote sha256sum
             cat_cmd = f"cat '{log_path}'"
-            stdout, stderr, exit_code = self.execute_command(cat_cmd)
+            raw, stderr, exit_code = self.execute_command_raw(cat_cmd)
             
             if exit_code != 0:
                 raise LogRetrievalError(f"Failed to read {log_path}: {stderr}")
             
-            content = stdout
-            content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
-            line_count = len(content.splitlines())
-            file_size = len(content.encode('utf-8'))
+            result = self._content_result(log_path, raw)
+            logger.debug(f"Retrieved {log_path}: {result['file_size']} bytes, {result['line_count']} lines")
+            return result
+        
+        except Exception as e:
+            logger.error(f"Failed to retrieve {log_path}: {e}")
+            raise LogRetrievalError(f"Log retrieval failed for {log_path}: {e}")
+    
+    def retrieve_log_tail(self, log_path: str, 
+                          state: Optional[Dict[str, any]] = None,
+                          policy: Optional[Dict[str, any]] = None) -> Dict[str, any]:
+        """
+        Retrieve only the bytes appended to a log file since the last run
+        
+        The remote side stats the file and streams everything after the stored
+        offset in a single command. If the inode changed (rotation) or the file
+        shrank below the stored offset (truncation), the whole file is read again.
+        
+        The returned hash is a rolling hash: sha256(previous_hash + ':' + new_bytes).
+        It only changes when new bytes arrive, so Baseline comparison keeps working.
+        
+        Args:
+            log_path: Absolute path to log file on remote host
+            state: Previous tail state (inode, offset, hash) or None for first run
+            policy: Optional retrieval policy; caps the bytes read from the
+                offset (tail_lines/max_bytes) or skips unmodified files (since)
+        
+        Returns:
+            Same dictionary as retrieve_log_file (content holds only the new
+            bytes, file_size is the remote file size) plus:
+                - rotated: True if the file was rotated or truncated
+                - tail_state: New state to persist (inode, offset, file_size, hash)
+        
+        Raises:
+            LogRetrievalError: If file cannot be retrieved
+        """
+        if not self.connected:
+            raise SSHConnectionError("Not connected to remote host")
+        
+        state = state or {}
+        prev_inode = state.get('inode')
+        prev_offset = state.get('offset') or 0
+        
+        try:
+            quoted = shlex.quote(log_path)
+            tail_cmd = (
+                f"f={quoted}; "
+                "test -r \"$f\" || { echo 'FAIL'; exit 0; }; "
+                "set -- $(stat -L -c '%i %s' \"$f\"); "
+                f"inode=$1; size=$2; start={int(prev_offset)}; "
+                f"if [ \"$inode\" != '{prev_inode or ''}' ] || [ \"$size\" -lt \"$start\" ]; "
+                "then start=0; fi; "
+            )
+            if policy:
+                tail_cmd = (f"{POLICY_SHELL}{self._policy_vars(policy)}{tail_cmd}"
+                            "pol || { echo 'SKIP'; exit 0; }; ")
+            tail_cmd += (
+                "echo \"OK $inode $size $start\"; "
+                "tail -c +$((start + 1)) \"$f\" | head -c $((size - start))"
+            )
+            codec = self._resolve_codec()
+            if codec:
+                raw, stderr, exit_code = self._execute_compressed(tail_cmd, codec)
+                stdout = raw.decode('utf-8', errors='replace')
+            else:
+                stdout, stderr, exit_code = self.execute_command(tail_cmd)
             
-            logger.debug(f"Retrieved {log_path}: {file_size} bytes, {line_count} lines")
+            header, _, content = stdout.partition('\n')
+            parts = header.split()
             
-            return {
-                'path': log_path,
-                'content': content,
-                'hash': content_hash,
-                'line_count': line_count,
-                'file_size': file_size,
-                'retrieved_at': datetime.utcnow(),
-                'error': None
-            }
+            if exit_code == 0 and parts == ['SKIP']:
+                return self._skipped_result(log_path, policy)
+            if exit_code != 0 or not parts or parts[0] != 'OK' or len(parts) != 4:
+                logger.warning(f"Log file not accessible: {log_path}")
+                return self._unavailable_result(log_path, 'File not accessible')
             
+            return self._tail_result(log_path, content, inode=parts[1],
+                                     file_size=int(parts[2]), start=int(parts[3]),
+                                     state=state)
+        
         except Exception as e:
-            logger.error(f"Failed to retrieve {log_path}: {e}")
+            logger.error(f"Failed to tail {log_path}: {e}")
             raise LogRetrievalError(f"Log retrieval failed for {log_path}: {e}")
     
-    def retrieve_multiple_logs(self, log_paths: List[str]) -> List[Dict[str, any]]:
+    def _unavailable_result(self, log_path: str, error: str) -> Dict[str, any]:
+        """Build the result dictionary for a log that could not be read"""
+        return {
+            'path': log_path,
+            'content': None,
+            'hash': None,
+            'line_count': 0,
+            'file_size': 0,
+            'retrieved_at': datetime.utcnow(),
+            'error': error
+        }
+    
+    def _skipped_result(self, log_path: str, policy: Dict[str, any]) -> Dict[str, any]:
+        """Build the result dictionary for a log skipped by its 'since' policy"""
+        reason = f"not modified since {policy.get('since', 'cutoff')}"
+        logger.debug(f"Skipping {log_path}: {reason}")
+        result = self._unavailable_result(log_path, None)
+        result['skipped'] = reason
+        return result
+    
+    @staticmethod
+    def _policy_values(policy: Optional[Dict[str, any]]) -> Tuple[str, str, str]:
+        """Shell values of (max_bytes, tail_lines, since epoch), '-' when unset"""
+        policy = policy or {}
+        values = (policy.get('max_bytes'), policy.get('tail_lines'),
+                  resolve_since(policy.get('since')))
+        return tuple('-' if value is None else str(int(value)) for value in values)
+    
+    def _policy_vars(self, policy: Optional[Dict[str, any]]) -> str:
+        """Shell assignments of the policy variables used by POLICY_SHELL"""
+        mb, tl, since = self._policy_values(policy)
+        return f"mb={mb}; tl={tl}; since={since}; "
+    
+    def _policy_args(self, policy: Optional[Dict[str, any]]) -> str:
+        """Policy variables as positional arguments for the emit/check shell functions"""
+        return " ".join(self._policy_values(policy))
+    
+    @staticmethod
+    def _policy_map(log_paths: List[LogEntrySpec]) -> Dict[str, Dict[str, any]]:
+        """Policies keyed by configured path or glob pattern"""
+        return dict(split_log_entry(entry) for entry in log_paths)
+    
+    @staticmethod
+    def _policy_for(path: str, policies: Dict[str, Dict[str, any]]) -> Dict[str, any]:
+        """Policy of a concrete (possibly glob-expanded) path"""
+        if path in policies:
+            return policies[path]
+        for pattern, policy in policies.items():
+            if '*' in pattern and fnmatch.fnmatch(path, pattern):
+                return policy
+        return {}
+    
+    def _content_result(self, log_path: str, raw: bytes) -> Dict[str, any]:
+        """
+        Build the result dictionary for a fully retrieved log
+        
+        The hash covers the raw bytes (like the streamed path and the remote
+        sha256sum of the hash precheck), not the decoded text, so logs with
+        invalid UTF-8 still match their baseline.
+        """
+        content = raw.decode('utf-8', errors='replace')
+        return {
+            'path': log_path,
+            'content': content,
+            'hash': hashlib.sha256(raw).hexdigest(),
+            'line_count': len(content.splitlines()),
+            'file_size': len(raw),
+            'retrieved_at': datetime.utcnow(),
+            'error': None
+        }
+    
+    def _tail_result(self, log_path: str, content: str, inode: str, file_size: int,
+                     start: int, state: Dict[str, any]) -> Dict[str, any]:
+        """
+        Build the result dictionary for bytes read from offset `start`
+        
+        Continues the rolling hash when reading resumed from a stored offset,
+        otherwise hashes the content from scratch.
+        """
+        prev_inode = state.get('inode')
+        prev_offset = state.get('offset') or 0
+        prev_hash = state.get('hash')
+        
+        # Same checks as the remote side; a policy may move start past the offset
+        same_file = prev_inode is not None and inode == str(prev_inode) and file_size >= prev_offset
+        rotated = prev_inode is not None and not same_file
+        
+        content_bytes = content.encode('utf-8')
+        if same_file and prev_offset > 0 and prev_hash:
+            # Continue the rolling hash from the previous state
+            if content_bytes:
+                content_hash = hashlib.sha256(
+                    f"{prev_hash}:".encode('utf-8') + content_bytes
+                ).hexdigest()
+            else:
+                content_hash = prev_hash
+        else:
+            content_hash = hashlib.sha256(content_bytes).hexdigest()
+        
+        if rotated:
+            logger.info(f"Log rotation/truncation detected for {log_path} on {self.hostname}")
+        
+        line_count = len(content.splitlines())
+        logger.debug(f"Tailed {log_path}: {len(content_bytes)} new bytes "
+                     f"from offset {start}, {line_count} lines")
+        
+        return {
+            'path': log_path,
+            'content': content,
+            'hash': content_hash,
+            'line_count': line_count,
+            'file_size': file_size,
+            'retrieved_at': datetime.utcnow(),
+            'error': None,
+            'rotated': rotated,
+            'tail_state': {
+                'inode': inode,
+                'offset': file_size,
+                'file_size': file_size,
+                'hash': content_hash
+            }
+        }
+    
+    def _retrieve_one(self, log_path: str, tail_states: Optional[Dict[str, Dict]],
+                      policy: Optional[Dict[str, any]] = None) -> Dict[str, any]:
+        """Retrieve a single log in full or tail mode"""
+        if tail_states is None:
+            return self.retrieve_log_file(log_path, policy or None)
+        return self.retrieve_log_tail(log_path, tail_states.get(log_path), policy or None)
+    
+    def _expand_log_path(self, log_path: str) -> List[Tuple[str, Optional[Dict[str, any]]]]:
+        """
+        Expand one configured log entry into concrete file paths
+        
+        Returns:
+            List of (path, error_result) tuples; error_result is set when the
+            glob expansion itself failed
+        """
+        # Support glob patterns for user home directories
+        if '*' not in log_path:
+            return [(log_path, None)]
+        
+        try:
+            # Expand glob pattern
+            expand_cmd = f"ls {log_path} 2>/dev/null"
+            stdout, stderr, exit_code = self.execute_command(expand_cmd)
+        except LogRetrievalError as e:
+            logger.warning(f"Skipping {log_path}: {e}")
+            return [(log_path, self._unavailable_result(log_path, str(e)))]
+        
+        if exit_code == 0 and stdout.strip():
+            return [(p.strip(), None) for p in stdout.strip().split('\n')]
+        
+        logger.debug(f"No files matched pattern: {log_path}")
+        return []
+    
+    def _retrieve_safe(self, log_path: str, tail_states: Optional[Dict[str, Dict]],
+                       policy: Optional[Dict[str, any]] = None) -> Dict[str, any]:
+        """Retrieve one log, turning retrieval errors into an error result"""
+        try:
+            return self._retrieve_one(log_path, tail_states, policy)
+        except LogRetrievalError as e:
+            logger.warning(f"Skipping {log_path}: {e}")
+            return self._unavailable_result(log_path, str(e))
+    
+    def _map_channels(self, func: Callable, items: List, channels: int) -> List:
+        """
+        Apply func to items using up to `channels` concurrent SSH channels
+        
+        paramiko multiplexes channels over the single transport, so this only
+        adds parallel exec channels, not connections. Results keep input order.
+        """
+        if channels <= 1 or len(items) <= 1:
+            return [func(item) for item in items]
+        
+        with ThreadPoolExecutor(max_workers=min(channels, len(items)),
+                                thread_name_prefix=f"ssh-{self.hostname}") as executor:
+            return list(executor.map(func, items))
+    
+    def retrieve_multiple_logs(self, log_paths: List[LogEntrySpec],
+                               tail_states: Optional[Dict[str, Dict]] = None,
+                               max_channels: Optional[int] = None) -> List[Dict[str, any]]:
         """
         Retrieve multiple log files
         
+        Glob patterns are expanded first, then files are fetched. Both phases
+        run over up to max_channels concurrent channels on the same connection.
+        
         Args:
-            log_paths: List of log file paths
+            log_paths: List of log file paths/globs, or dicts with 'path' and a
+                retrieval policy (max_bytes, tail_lines, since)
+            tail_states: Previous tail states keyed by log path. When provided
+                (even empty), logs are retrieved incrementally via retrieve_log_tail.
+            max_channels: Concurrent exec channels (default: self.max_channels,
+                at most MAX_CHANNELS)
         
         Returns:
-            List of log data dictionaries
+            List of log data dictionaries, in configured order
         """
+        channels = min(MAX_CHANNELS, max_channels or self.max_channels)
+        
+        # Probe the remote compressor once, before channels run concurrently
+        self._resolve_codec()
+        
+        specs = [split_log_entry(entry) for entry in log_paths]
+        expanded = self._map_channels(self._expand_log_path, [path for path, _ in specs], channels)
+        
+        results: List[Optional[Dict[str, any]]] = []
+        to_fetch: List[Tuple[int, str, Dict[str, any]]] = []
+        for (_, policy), entries in zip(specs, expanded):
+            for path, error_result in entries:
+                if error_result is not None:
+                    results.append(error_result)
+                else:
+                    to_fetch.append((len(results), path, policy))
+                    results.append(None)
+        
+        fetched = self._map_channels(
+            lambda item: self._retrieve_safe(item[0], tail_states, item[1]),
+            [(path, policy) for _, path, policy in to_fetch],
+            channels
+        )
+        for (index, _, _), log_data in zip(to_fetch, fetched):
+            results[index] = log_data
+        
+        return results
+    
+    def _build_batch_script(self, log_paths: List[LogEntrySpec],
+                            tail_states: Optional[Dict[str, Dict]]) -> str:
+        """
+        Build the remote shell script used by retrieve_logs_batched
+        
+        The script expands globs, checks readability, stats every file, applies
+        per-log policies and writes one length-prefixed frame per file to
+        stdout. Short reads (file truncated mid-transfer) are padded with NUL
+        bytes so framing never breaks.
+        """
+        lines = [
+            POLICY_SHELL.rstrip('\n'),
+            "st() {",
+            '  case "$1" in'
+        ]
+        for path, state in (tail_states or {}).items():
+            inode = str(state.get('inode') or '-')
+            offset = int(state.get('offset') or 0)
+            lines.append(f"    {shlex.quote(path)}) echo {shlex.quote(inode)} {offset} ;;")
+        lines += [
+            "    *) echo - 0 ;;",
+            "  esac",
+            "}",
+            "emit() {",
+            '  f=$1; mb=$2; tl=$3; since=$4',
+            '  if [ ! -f "$f" ] || [ ! -r "$f" ]; then',
+            f"    printf '{BATCH_FRAME_MARKER} FAIL 0 0 - 0 %s\\n' \"$f\"; return",
+            "  fi",
+            "  set -- $(stat -L -c '%i %s' \"$f\"); inode=$1; size=$2",
+            '  set -- $(st "$f"); start=$2',
+            '  if [ "$1" != "$inode" ] || [ "$size" -lt "$start" ]; then start=0; fi',
+            "  if ! pol; then",
+            f"    printf '{BATCH_FRAME_MARKER} SKIP 0 0 - 0 %s\\n' \"$f\"; return",
+            "  fi",
+            "  len=$((size - start))",
+            f"  printf '{BATCH_FRAME_MARKER} OK %s %s %s %s %s\\n' "
+            '"$len" "$size" "$inode" "$start" "$f"',
+            '  { tail -c +$((start + 1)) "$f" | head -c "$len"; cat /dev/zero; } | head -c "$len"',
+            "}",
+        ]
+        
+        for entry in log_paths:
+            log_path, policy = split_log_entry(entry)
+            args = self._policy_args(policy)
+            if '*' in log_path:
+                # Leave the pattern unquoted so the remote shell expands it
+                lines.append(f'for f in {log_path}; do [ ! -e "$f" ] || emit "$f" {args}; done')
+            else:
+                lines.append(f"emit {shlex.quote(log_path)} {args}")
+        
+        return "\n".join(lines) + "\n"
+    
+    def _parse_batch_output(self, data: bytes, tail_states: Optional[Dict[str, Dict]],
+                            policies: Optional[Dict[str, Dict]] = None) -> List[Dict[str, any]]:
+        """Split length-prefixed batch output into per-file result dictionaries"""
         results = []
+        pos = 0
         
-        for log_path in log_paths:
+        while pos < len(data):
+            newline = data.find(b'\n', pos)
+            if newline == -1:
+                raise LogRetrievalError("Truncated batch frame header")
+            
+            header = data[pos:newline].decode('utf-8', errors='replace')
+            parts = header.split(' ', 6)
+            if len(parts) != 7 or parts[0] != BATCH_FRAME_MARKER:
+                raise LogRetrievalError(f"Malformed batch frame header: {header[:200]}")
+            
+            _, status, length, size, inode, start, path = parts
             try:
-                # Support glob patterns for user home directories
-                if '*' in log_path:
-                    # Expand glob pattern
-                    expand_cmd = f"ls {log_path} 2>/dev/null"
-                    stdout, stderr, exit_code = self.execute_command(expand_cmd)
-                    
-                    if exit_code == 0 and stdout.strip():
-                        expanded_paths = stdout.strip().split('\n')
-                        for expanded_path in expanded_paths:
-                            log_data = self.retrieve_log_file(expanded_path.strip())
-                            results.append(log_data)
-                    else:
-                        logger.debug(f"No files matched pattern: {log_path}")
-                else:
-                    log_data = self.retrieve_log_file(log_path)
-                    results.append(log_data)
-                    
-            except LogRetrievalError as e:
-                logger.warning(f"Skipping {log_path}: {e}")
-                results.append({
-                    'path': log_path,
-                    'content': None,
-                    'hash': None,
-                    'line_count': 0,
-                    'file_size': 0,
-                    'retrieved_at': datetime.utcnow(),
-                    'error': str(e)
-                })
+                length, size, start = int(length), int(size), int(start)
+            except ValueError:
+                raise LogRetrievalError(f"Malformed batch frame header: {header[:200]}")
+            pos = newline + 1
+            body = data[pos:pos + length]
+            if len(body) < length:
+                raise LogRetrievalError(f"Truncated batch frame for {path}: "
+                                        f"{len(body)} of {length} bytes")
+            pos += length
+            
+            if status == 'SKIP':
+                results.append(self._skipped_result(path, self._policy_for(path, policies or {})))
+                continue
+            if status != 'OK':
+                logger.warning(f"Log file not accessible: {path}")
+                results.append(self._unavailable_result(path, 'File not accessible'))
+                continue
+            
+            # Strip NUL padding added for files truncated during transfer
+            body = body.rstrip(b'\x00')
+            
+            if tail_states is None:
+                results.append(self._content_result(path, body))
+            else:
+                content = body.decode('utf-8', errors='replace')
+                results.append(self._tail_result(path, content, inode=inode,
+                                                 file_size=size, start=start,
+                                                 state=tail_states.get(path) or {}))
         
         return results
     
+    def retrieve_logs_batched(self, log_paths: List[LogEntrySpec],
+                              tail_states: Optional[Dict[str, Dict]] = None,
+                              timeout: int = 120) -> List[Dict[str, any]]:
+        """
+        Retrieve all logs in a single round trip
+        
+        One remote script expands globs, checks readability and stats every
+        file, then streams all contents back on one exec channel as
+        length-prefixed frames. Falls back to per-file retrieval if the batch
+        fails (e.g., remote shell without stat -c), exits non-zero or returns
+        malformed or truncated frames.
+        
+        Args:
+            log_paths: List of log file paths or glob patterns (or policy dicts)
+            tail_states: Previous tail states keyed by path (enables tail mode)
+            timeout: Channel timeout for the batch command
+        
+        Returns:
+            List of log data dictionaries, in configured order
+        """
+        if not self.connected:
+            raise SSHConnectionError("Not connected to remote host")
+        
+        script = self._build_batch_script(log_paths, tail_states)
+        
+        try:
+            command = f"sh -c {shlex.quote(script)}"
+            codec = self._resolve_codec()
+            if codec:
+                stdout, stderr, exit_code = self._execute_compressed(command, codec,
+                                                                     timeout=timeout)
+            else:
+                stdout, stderr, exit_code = self.execute_command_raw(command, timeout=timeout)
+            if exit_code != 0:
+                raise LogRetrievalError(f"Batch script exited with status {exit_code}: {stderr[:200]}")
+            results = self._parse_batch_output(stdout, tail_states, self._policy_map(log_paths))
+            logger.debug(f"Batched retrieval from {self.hostname}: {len(results)} files, "
+                         f"{len(stdout)} bytes in one round trip")
+            return results
+        
+        except LogRetrievalError as e:
+            logger.warning(f"Batched retrieval failed on {self.hostname}, "
+                           f"falling back to per-file retrieval: {e}")
+            return self.retrieve_multiple_logs(log_paths, tail_states=tail_states)
+    
+    def precheck_logs(self, log_paths: List[LogEntrySpec]) -> List[Dict[str, any]]:
+        """
+        Hash and stat all configured logs remotely in one command
+        
+        Logs with a retrieval policy are hashed over the bytes the policy
+        would transfer, so the hash matches the stored baseline.
+        
+        Args:
+            log_paths: List of log file paths or glob patterns (or policy dicts)
+        
+        Returns:
+            List of {'path', 'hash', 'file_size', 'error', 'skipped', 'policy'}
+            dictionaries in configured order (globs expanded; unmatched globs omitted)
+        
+        Raises:
+            LogRetrievalError: If the precheck command fails
+        """
+        lines = [
+            POLICY_SHELL.rstrip('\n'),
+            "check() {",
+            '  f=$1; mb=$2; tl=$3; since=$4',
+            '  if [ ! -f "$f" ] || [ ! -r "$f" ]; then printf \'FAIL - 0 %s\\n\' "$f"; return; fi',
+            '  size=$(stat -L -c %s "$f"); start=0',
+            '  if ! pol; then printf \'SKIP - 0 %s\\n\' "$f"; return; fi',
+            '  if [ "$start" -eq 0 ]; then set -- $(sha256sum < "$f")',
+            '  else set -- $(tail -c +$((start + 1)) "$f" | head -c $((size - start)) | sha256sum); fi',
+            '  printf \'OK %s %s %s\\n\' "$1" "$((size - start))" "$f"',
+            "}",
+        ]
+        policies = self._policy_map(log_paths)
+        for log_path, policy in policies.items():
+            args = self._policy_args(policy)
+            if '*' in log_path:
+                lines.append(f'for f in {log_path}; do [ -e "$f" ] && check "$f" {args}; done')
+            else:
+                lines.append(f"check {shlex.quote(log_path)} {args}")
+        script = "\n".join(lines) + "\n"
+        
+        stdout, stderr, exit_code = self.execute_command(f"sh -c {shlex.quote(script)}")
+        
+        results = []
+        for line in stdout.splitlines():
+            parts = line.split(' ', 3)
+            if len(parts) != 4 or parts[0] not in ('OK', 'FAIL', 'SKIP'):
+                raise LogRetrievalError(f"Malformed precheck output: {line[:200]}")
+            status, content_hash, size, path = parts
+            results.append({
+                'path': path,
+                'hash': content_hash if status == 'OK' else None,
+                'file_size': int(size),
+                'error': 'File not accessible' if status == 'FAIL' else None,
+                'skipped': status == 'SKIP',
+                'policy': self._policy_for(path, policies)
+            })
+        return results
+    
+    def retrieve_logs_with_precheck(self, log_paths: List[LogEntrySpec],
+                                    known_hashes: Dict[str, Dict[str, any]],
+                                    batched: bool = False) -> List[Dict[str, any]]:
+        """
+        Retrieve only logs whose remote SHA256 differs from the known baseline
+        
+        A single precheck command hashes every file on the remote side. Files
+        matching their baseline get a cheap 'unchanged' record (no content);
+        the rest are downloaded in full.
+        
+        Args:
+            log_paths: List of log file paths or glob patterns (or policy dicts)
+            known_hashes: Active baselines keyed by path: {'hash', 'line_count'}
+            batched: Download changed files with retrieve_logs_batched
+        
+        Returns:
+            List of log data dictionaries in configured order. Unchanged logs
+            have content None and 'unchanged': True.
+        """
+        if not self.connected:
+            raise SSHConnectionError("Not connected to remote host")
+        
+        try:
+            checks = self.precheck_logs(log_paths)
+        except LogRetrievalError as e:
+            logger.warning(f"Hash precheck failed on {self.hostname}, retrieving all logs: {e}")
+            if batched:
+                return self.retrieve_logs_batched(log_paths)
+            return self.retrieve_multiple_logs(log_paths)
+        
+        results: List[Optional[Dict[str, any]]] = []
+        changed: List[Tuple[int, LogEntrySpec]] = []
+        for check in checks:
+            result = self._precheck_result(check, known_hashes.get(check['path']))
+            if result is None:
+                entry = dict(check['policy'], path=check['path']) if check['policy'] else check['path']
+                changed.append((len(results), entry))
+            results.append(result)
+        
+        logger.debug(f"Hash precheck on {self.hostname}: {len(checks) - len(changed)} unchanged, "
+                     f"{len(changed)} to download")
+        
+        if changed:
+            paths = [entry for _, entry in changed]
+            fetched = (self.retrieve_logs_batched(paths) if batched
+                       else self.retrieve_multiple_logs(paths))
+            for (index, _), log_data in zip(changed, fetched):
+                results[index] = log_data
+        
+        return results
+    
+    def _precheck_result(self, check: Dict[str, any],
+                         known: Optional[Dict[str, any]]) -> Optional[Dict[str, any]]:
+        """Result for a prechecked log, or None if it has to be downloaded"""
+        if check['error']:
+            return self._unavailable_result(check['path'], check['error'])
+        if check['skipped']:
+            return self._skipped_result(check['path'], check['policy'])
+        if not known or known.get('hash') != check['hash']:
+            return None
+        return {
+            'path': check['path'],
+            'content': None,
+            'hash': check['hash'],
+            'line_count': known.get('line_count') or 0,
+            'file_size': check['file_size'],
+            'retrieved_at': datetime.utcnow(),
+            'error': None,
+            'unchanged': True
+        }
+    
     def __enter__(self):
         """Context manager entry"""
         self.connect()
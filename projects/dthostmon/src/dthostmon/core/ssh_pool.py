@@ -0,0 +1,160 @@
+"""
+Persistent SSH connection pool for dthostmon
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Keeps authenticated SSH transports alive between monitoring cycles so that a
+long-running dthostmon process (monitor --daemon) only pays the TCP, key
+exchange and authentication cost once per host.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Tuple
+
+import paramiko
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, int, str]
+
+
+class SSHConnectionPool:
+    """Process-wide pool of SSH connections keyed by (hostname, port, username)"""
+    
+    def __init__(self, keepalive_interval: int = 30, max_idle: int = 900):
+        """
+        Initialize connection pool
+        
+        Args:
+            keepalive_interval: Seconds between transport keepalive packets (0 disables)
+            max_idle: Close connections unused for this many seconds
+        """
+        self.keepalive_interval = keepalive_interval
+        self.max_idle = max_idle
+        self._connections: Dict[PoolKey, paramiko.SSHClient] = {}
+        self._last_used: Dict[PoolKey, float] = {}
+        self._key_locks: Dict[PoolKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+    
+    def acquire(self, hostname: str, port: int, username: str,
+                connect: Callable[[], paramiko.SSHClient]) -> paramiko.SSHClient:
+        """
+        Get a healthy connection for a host, opening one lazily if needed
+        
+        Args:
+            hostname: Target host IP or hostname
+            port: SSH port
+            username: SSH username
+            connect: Callable that opens and authenticates a new connection
+        
+        Returns:
+            Connected paramiko SSHClient (owned by the pool - do not close)
+        """
+        key = (hostname, port, username)
+        
+        # Per-host lock so two workers never open duplicate connections
+        with self._key_lock(key):
+            client = self._connections.get(key)
+            
+            if client is not None and not self._is_healthy(client):
+                logger.info(f"Pooled SSH connection to {username}@{hostname}:{port} is dead, reconnecting")
+                self._close_client(client)
+                client = None
+            
+            if client is None:
+                client = connect()
+                transport = client.get_transport()
+                if transport is not None and self.keepalive_interval:
+                    transport.set_keepalive(self.keepalive_interval)
+                self._connections[key] = client
+                logger.debug(f"Pooled new SSH connection to {username}@{hostname}:{port}")
+            else:
+                logger.debug(f"Reusing pooled SSH connection to {username}@{hostname}:{port}")
+            
+            self._last_used[key] = time.monotonic()
+            return client
+    
+    def discard(self, hostname: str, port: int, username: str):
+        """Close and forget the pooled connection for a host (waits for a concurrent acquire)"""
+        key = (hostname, port, username)
+        with self._key_lock(key):
+            with self._lock:
+                client = self._connections.pop(key, None)
+                self._last_used.pop(key, None)
+            if client is not None:
+                self._close_client(client)
+    
+    def prune_idle(self) -> int:
+        """
+        Close connections that have not been used for max_idle seconds
+        
+        Hosts being acquired right now are skipped; they are not idle.
+        
+        Returns:
+            Number of connections closed
+        """
+        cutoff = time.monotonic() - self.max_idle
+        with self._lock:
+            stale = [key for key, used in self._last_used.items() if used < cutoff]
+        
+        clients = []
+        for key in stale:
+            key_lock = self._key_lock(key)
+            if not key_lock.acquire(blocking=False):
+                continue
+            try:
+                with self._lock:
+                    if self._last_used.get(key, cutoff) >= cutoff:
+                        continue
+                    self._last_used.pop(key, None)
+                    client = self._connections.pop(key, None)
+                if client is not None:
+                    self._close_client(client)
+                    clients.append(client)
+            finally:
+                key_lock.release()
+        
+        if clients:
+            logger.info(f"Closed {len(clients)} idle pooled SSH connections")
+        return len(clients)
+    
+    def close_all(self):
+        """Close every pooled connection"""
+        with self._lock:
+            clients = list(self._connections.values())
+            self._connections.clear()
+            self._last_used.clear()
+        
+        for client in clients:
+            self._close_client(client)
+        logger.debug(f"Closed {len(clients)} pooled SSH connections")
+    
+    def _key_lock(self, key: PoolKey) -> threading.Lock:
+        """Lock serializing acquire, discard and pruning of one host's connection"""
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+    
+    def __len__(self) -> int:
+        return len(self._connections)
+    
+    @staticmethod
+    def _is_healthy(client: paramiko.SSHClient) -> bool:
+        """Check that the transport is alive and authenticated"""
+        transport = client.get_transport()
+        if transport is None or not transport.is_active() or not transport.is_authenticated():
+            return False
+        try:
+            # Cheap round-trip-free probe: fails fast if the socket is gone
+            transport.send_ignore()
+            return True
+        except (paramiko.SSHException, OSError, EOFError):
+            return False
+    
+    @staticmethod
+    def _close_client(client: paramiko.SSHClient):
+        """Close a client, ignoring errors from already-dead transports"""
+        try:
+            client.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled SSH connection: {e}")
@@ -0,0 +1,153 @@
+"""
+Content-addressed log blob storage for dthostmon
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+LogEntry rows reference their content through log_blobs, keyed by the SHA256
+of the text. Identical content retrieved on many runs is stored once; each
+blob counts the entries that reference it. Runs must be pruned through
+delete_runs() so the counts (and delta chains) stay correct, after which
+collect_garbage() removes blobs nobody references any more.
+"""
+
+import hashlib
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from .database import LogBlob, LogEntry, DetectedChange, MonitoringRun
+from .upsert import upsert
+
+logger = logging.getLogger(__name__)
+
+
+def content_digest(content: str) -> str:
+    """SHA256 hex digest used as the blob address of a log's text"""
+    return hashlib.sha256(content.encode('utf-8', errors='replace')).hexdigest()
+
+
+def store_blobs(session: Session, contents: Iterable[str]) -> List[str]:
+    """
+    Reference log contents, inserting only blobs that do not exist yet
+    
+    Existing blobs only have their ref_count incremented, so their text is
+    not sent to the database again. Runs in the caller's transaction.
+    
+    Args:
+        session: Database session
+        contents: Log texts, one per LogEntry that will reference it
+    
+    Returns:
+        Blob hashes in the same order as contents
+    """
+    contents = list(contents)
+    hashes = [content_digest(content) for content in contents]
+    if not hashes:
+        return hashes
+    
+    counts = Counter(hashes)
+    texts = dict(zip(hashes, contents))
+    
+    # Bump existing blobs, grouped by increment (almost always one UPDATE).
+    # Hashes are sorted so concurrent writers lock rows in the same order.
+    by_increment: Dict[int, List[str]] = {}
+    for blob_hash in sorted(counts):
+        by_increment.setdefault(counts[blob_hash], []).append(blob_hash)
+    
+    referenced = set()
+    for increment, blob_hashes in by_increment.items():
+        result = session.execute(
+            update(LogBlob)
+            .where(LogBlob.hash.in_(blob_hashes))
+            .values(ref_count=LogBlob.ref_count + increment)
+            .returning(LogBlob.hash)
+        )
+        referenced.update(row[0] for row in result)
+    
+    missing = [blob_hash for blob_hash in sorted(counts) if blob_hash not in referenced]
+    if missing:
+        _insert_blobs(session, [
+            {
+                'hash': blob_hash,
+                'content': texts[blob_hash],
+                'size': len(texts[blob_hash].encode('utf-8', errors='replace')),
+                'ref_count': counts[blob_hash],
+                'created_at': datetime.utcnow()
+            }
+            for blob_hash in missing
+        ])
+    
+    logger.debug(f"Stored {len(hashes)} log blob references, {len(missing)} new blobs")
+    return hashes
+
+
+def _insert_blobs(session: Session, rows: List[Dict]):
+    """Insert new blobs, adding to ref_count if another writer inserted one first"""
+    upsert(session, LogBlob, rows, index_elements=[LogBlob.hash],
+           update_cols={'ref_count': lambda new: LogBlob.ref_count + new.ref_count})
+
+
+def release_blobs(session: Session, blob_hashes: Iterable[Optional[str]]):
+    """
+    Drop references to blobs (entries are being deleted)
+    
+    Args:
+        session: Database session
+        blob_hashes: blob_hash of every deleted LogEntry (None values are ignored)
+    """
+    counts = Counter(h for h in blob_hashes if h is not None)
+    by_decrement: Dict[int, List[str]] = {}
+    for blob_hash in sorted(counts):
+        by_decrement.setdefault(counts[blob_hash], []).append(blob_hash)
+    
+    for decrement, hashes in by_decrement.items():
+        session.execute(
+            update(LogBlob)
+            .where(LogBlob.hash.in_(hashes))
+            .values(ref_count=LogBlob.ref_count - decrement)
+        )
+
+
+def delete_runs(session: Session, run_ids: List[int]) -> int:
+    """
+    Delete monitoring runs with their entries and changes, releasing blobs
+    
+    Args:
+        session: Database session
+        run_ids: IDs of the runs to delete
+    
+    Returns:
+        Number of runs deleted
+    """
+    if not run_ids:
+        return 0
+    
+    from .log_history import materialize_dependents
+    
+    entries = session.execute(
+        select(LogEntry.id, LogEntry.blob_hash).where(LogEntry.monitoring_run_id.in_(run_ids))
+    ).all()
+    # Later runs may store deltas against these entries
+    materialize_dependents(session, [entry.id for entry in entries])
+    release_blobs(session, [entry.blob_hash for entry in entries])
+    
+    session.execute(delete(LogEntry).where(LogEntry.monitoring_run_id.in_(run_ids)))
+    session.execute(delete(DetectedChange).where(DetectedChange.monitoring_run_id.in_(run_ids)))
+    result = session.execute(delete(MonitoringRun).where(MonitoringRun.id.in_(run_ids)))
+    return result.rowcount
+
+
+def collect_garbage(session: Session) -> int:
+    """
+    Delete blobs that no LogEntry references any more
+    
+    Returns:
+        Number of blobs deleted
+    """
+    result = session.execute(delete(LogBlob).where(LogBlob.ref_count <= 0))
+    if result.rowcount:
+        logger.info(f"Garbage collected {result.rowcount} unreferenced log blobs")
+    return result.rowcount
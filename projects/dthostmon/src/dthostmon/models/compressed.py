@@ -0,0 +1,101 @@
+"""
+Compressed text column type for dthostmon
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+CompressedText stores text as binary with a one-byte codec marker, so values
+written with different codecs (or left uncompressed) can be mixed in one
+column and read back without knowing how they were written:
+
+    0x00  raw UTF-8 (values below the size threshold)
+    0x01  zlib
+    0x02  zstd (preferred when the zstandard package is installed)
+"""
+
+import zlib
+from typing import Optional
+
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency - zlib is used without it
+    zstandard = None
+
+RAW = b'\x00'
+ZLIB = b'\x01'
+ZSTD = b'\x02'
+
+# Compressing short values costs more than it saves
+DEFAULT_MIN_SIZE = 256
+
+
+class CompressionError(Exception):
+    """Raised when a stored value cannot be decoded"""
+    pass
+
+
+def compress_text(value: str, min_size: int = DEFAULT_MIN_SIZE, level: int = 3) -> bytes:
+    """
+    Encode text with a codec marker, compressing values of at least min_size bytes
+    
+    Args:
+        value: Text to store
+        min_size: Smaller values are stored raw
+        level: Compression level (zstd and zlib)
+    
+    Returns:
+        Marker byte followed by the (compressed) UTF-8 bytes
+    """
+    data = value.encode('utf-8', errors='replace')
+    if len(data) < min_size:
+        return RAW + data
+    if zstandard is not None:
+        compressed = ZSTD + zstandard.ZstdCompressor(level=level).compress(data)
+    else:
+        compressed = ZLIB + zlib.compress(data, level)
+    # Incompressible data is kept raw
+    return compressed if len(compressed) < len(data) + 1 else RAW + data
+
+
+def decompress_text(value: bytes) -> str:
+    """
+    Decode a value written by compress_text
+    
+    Raises:
+        CompressionError: If the marker is unknown or zstd is not installed
+    """
+    value = bytes(value)
+    marker, payload = value[:1], value[1:]
+    if marker == RAW:
+        data = payload
+    elif marker == ZLIB:
+        data = zlib.decompress(payload)
+    elif marker == ZSTD:
+        if zstandard is None:
+            raise CompressionError("Value is zstd compressed but the zstandard package is not installed")
+        data = zstandard.ZstdDecompressor().decompress(payload)
+    else:
+        raise CompressionError(f"Unknown compression marker: {marker!r}")
+    return data.decode('utf-8', errors='replace')
+
+
+class CompressedText(TypeDecorator):
+    """Text column stored compressed as binary; transparent to ORM code"""
+    
+    impl = LargeBinary
+    cache_ok = True
+    
+    def __init__(self, min_size: int = DEFAULT_MIN_SIZE, level: int = 3, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.min_size = min_size
+        self.level = level
+    
+    def process_bind_param(self, value: Optional[str], dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return compress_text(value, self.min_size, self.level)
+    
+    def process_result_value(self, value: Optional[bytes], dialect) -> Optional[str]:
+        if value is None:
+            return None
+        return decompress_text(value)
@@ -1,13 +1,16 @@
 """
 Database models for dthostmon
-Last Updated: 11/14/2025 12:00:00 PM CDT
+Last Updated: 10/16/2026 12:00:00 PM CDT
 
 SQLAlchemy models for storing host information, monitoring results, and analysis history.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, ForeignKey, Float
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy import (Column, Integer, BigInteger, String, Text, DateTime, Boolean, JSON,
+                        ForeignKey, Float, Index, UniqueConstraint, text)
+from sqlalchemy.orm import declarative_base, deferred, relationship
+
+from .compressed import CompressedText
 
 Base = declarative_base()
 
@@ -24,24 +27,33 @@ class Host(Base):
     enabled = Column(Boolean, default=True)
     site = Column(String(100), nullable=True, index=True)  # Site identifier (e.g., s01-chicago)
     tags = Column(JSON)  # List of tags
-    logs_to_monitor = Column(JSON)  # List of log file paths
+    logs_to_monitor = Column(JSON)  # List of log file paths or {path, max_bytes, tail_lines, since}
     report_frequency = Column(String(50), nullable=True)  # Overrides global/site frequency
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     last_seen = Column(DateTime, nullable=True)
     last_report_sent = Column(DateTime, nullable=True)  # Timestamp of last report sent
+    config_fingerprint = Column(String(64), nullable=True)  # SHA256 of the config block (NULL: not config-managed)
     
     # Relationships
     monitoring_runs = relationship("MonitoringRun", back_populates="host", cascade="all, delete-orphan")
     baselines = relationship("Baseline", back_populates="host", cascade="all, delete-orphan")
+    tail_states = relationship("LogTailState", back_populates="host", cascade="all, delete-orphan")
+    health_rollups = relationship("HealthRollup", back_populates="host", cascade="all, delete-orphan")
+    analysis_cache = relationship("AnalysisCacheEntry", back_populates="host", cascade="all, delete-orphan")
+    known_templates = relationship("KnownLogTemplate", back_populates="host", cascade="all, delete-orphan")
 
 
 class MonitoringRun(Base):
     """Individual monitoring execution results"""
     __tablename__ = 'monitoring_runs'
+    __table_args__ = (
+        # Latest/history per host (API, reports, circuit breaker seeding)
+        Index('ix_monitoring_runs_host_run_date', 'host_id', 'run_date'),
+    )
     
     id = Column(Integer, primary_key=True)
-    host_id = Column(Integer, ForeignKey('hosts.id'), nullable=False, index=True)
+    host_id = Column(Integer, ForeignKey('hosts.id'), nullable=False)
     run_date = Column(DateTime, default=datetime.utcnow, index=True)
     status = Column(String(50))  # success, failed, partial
     execution_time = Column(Float)  # seconds
@@ -51,8 +63,8 @@ class MonitoringRun(Base):
     health_score = Column(Integer, nullable=True)  # 0-100
     anomalies_detected = Column(Integer, default=0)
     changes_detected = Column(Integer, default=0)
-    ai_summary = Column(Text, nullable=True)
-    ai_recommendations = Column(Text, nullable=True)
+    ai_summary = Column(CompressedText(), nullable=True)
+    ai_recommendations = Column(CompressedText(), nullable=True)
     
     # Alert tracking
     alert_sent = Column(Boolean, default=False)
@@ -66,6 +78,22 @@ class MonitoringRun(Base):
     detected_changes = relationship("DetectedChange", back_populates="monitoring_run", cascade="all, delete-orphan")
 
 
+class LogBlob(Base):
+    """Deduplicated log content, addressed by the SHA256 of the stored text"""
+    __tablename__ = 'log_blobs'
+    __table_args__ = (
+        # Garbage collection only looks at unreferenced blobs
+        Index('ix_log_blobs_unreferenced', 'hash',
+              postgresql_where=text('ref_count <= 0'), sqlite_where=text('ref_count <= 0')),
+    )
+    
+    hash = Column(String(64), primary_key=True)  # sha256 of content (UTF-8)
+    content = deferred(Column(CompressedText(), nullable=False))  # Loaded on first access
+    size = Column(BigInteger)  # bytes (UTF-8)
+    ref_count = Column(Integer, nullable=False, default=0)  # LogEntry rows referencing this blob
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 class LogEntry(Base):
     """Captured log file contents from monitored hosts"""
     __tablename__ = 'log_entries'
@@ -73,19 +101,45 @@ class LogEntry(Base):
     id = Column(Integer, primary_key=True)
     monitoring_run_id = Column(Integer, ForeignKey('monitoring_runs.id'), nullable=False, index=True)
     log_file_path = Column(String(500), nullable=False)
-    content = Column(Text)
+    content = deferred(Column(CompressedText()))  # Legacy inline content (rows written before log_blobs)
+    blob_hash = Column(String(64), ForeignKey('log_blobs.hash'), nullable=True, index=True)
     content_hash = Column(String(64))  # SHA256 hash for change detection
     line_count = Column(Integer)
     file_size = Column(Integer)  # bytes
     retrieved_at = Column(DateTime, default=datetime.utcnow)
+    run_date = Column(DateTime, nullable=True)  # run_date of the monitoring run (partition key)
+    
+    # Delta storage (see models/log_history.py)
+    text_hash = Column(String(64), nullable=True)  # sha256 of the full reconstructed text
+    text_length = Column(BigInteger, nullable=True)  # characters in the full text
+    delta_base_id = Column(Integer, ForeignKey('log_entries.id'), nullable=True, index=True)
+    delta_prefix_length = Column(BigInteger, nullable=True)  # characters kept from the base
+    delta_depth = Column(Integer, default=0)  # deltas since the last keyframe
     
     # Relationships
     monitoring_run = relationship("MonitoringRun", back_populates="log_entries")
+    blob = relationship("LogBlob")
+    
+    @property
+    def text(self):
+        """Full log content, rebuilt from the delta chain or read from the blob/inline column"""
+        if self.delta_base_id is not None:
+            from sqlalchemy.orm import object_session
+            from .log_history import reconstruct_entry
+            return reconstruct_entry(object_session(self), self.id)
+        if self.blob_hash is not None:
+            return self.blob.content
+        return self.content
 
 
 class Baseline(Base):
     """Baseline snapshots for comparison"""
     __tablename__ = 'baselines'
+    __table_args__ = (
+        # Active baseline lookups by host and path
+        Index('ix_baselines_active_host_path', 'host_id', 'log_file_path',
+              postgresql_where=text('is_active'), sqlite_where=text('is_active = 1')),
+    )
     
     id = Column(Integer, primary_key=True)
     host_id = Column(Integer, ForeignKey('hosts.id'), nullable=False, index=True)
@@ -99,12 +153,36 @@ class Baseline(Base):
     host = relationship("Host", back_populates="baselines")
 
 
+class LogTailState(Base):
+    """Incremental retrieval position for a log file (tail mode)"""
+    __tablename__ = 'log_tail_states'
+    __table_args__ = (
+        UniqueConstraint('host_id', 'log_file_path', name='uq_log_tail_states_host_path'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    host_id = Column(Integer, ForeignKey('hosts.id'), nullable=False, index=True)
+    log_file_path = Column(String(500), nullable=False)
+    inode = Column(String(32))  # Remote inode, used to detect rotation
+    offset = Column(BigInteger, default=0)  # Bytes already retrieved
+    file_size = Column(BigInteger, default=0)  # Remote size at last retrieval
+    rolling_hash = Column(String(64))  # sha256(previous_hash + ':' + new_bytes)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    host = relationship("Host", back_populates="tail_states")
+
+
 class DetectedChange(Base):
     """Changes detected between monitoring runs"""
     __tablename__ = 'detected_changes'
+    __table_args__ = (
+        # Changes of a run, newest first (API)
+        Index('ix_detected_changes_run_detected_at', 'monitoring_run_id', 'detected_at'),
+    )
     
     id = Column(Integer, primary_key=True)
-    monitoring_run_id = Column(Integer, ForeignKey('monitoring_runs.id'), nullable=False, index=True)
+    monitoring_run_id = Column(Integer, ForeignKey('monitoring_runs.id'), nullable=False)
     change_type = Column(String(50))  # new_user, failed_login, config_change, service_change
     severity = Column(String(20))  # INFO, WARN, CRITICAL
     description = Column(Text)
@@ -116,6 +194,74 @@ class DetectedChange(Base):
     monitoring_run = relationship("MonitoringRun", back_populates="detected_changes")
 
 
+class HealthRollup(Base):
+    """Hourly/daily health summary per host, kept after raw runs expire"""
+    __tablename__ = 'health_rollups'
+    __table_args__ = (
+        UniqueConstraint('host_id', 'period', 'period_start', name='uq_health_rollups_host_period'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    host_id = Column(Integer, ForeignKey('hosts.id'), nullable=False)
+    period = Column(String(10), nullable=False)  # hour, day
+    period_start = Column(DateTime, nullable=False, index=True)  # UTC, truncated to the period
+    run_count = Column(Integer, default=0)
+    failed_count = Column(Integer, default=0)
+    health_count = Column(Integer, default=0)  # Runs with a health score
+    health_sum = Column(Integer, default=0)
+    health_min = Column(Integer, nullable=True)
+    health_max = Column(Integer, nullable=True)
+    anomalies_total = Column(Integer, default=0)
+    changes_total = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    @property
+    def health_avg(self):
+        """Average health score of the period (None without scored runs)"""
+        return self.health_sum / self.health_count if self.health_count else None
+    
+    # Relationships
+    host = relationship("Host", back_populates="health_rollups")
+
+
+class AnalysisCacheEntry(Base):
+    """AI analysis of a set of log contents, reused while the logs are unchanged"""
+    __tablename__ = 'analysis_cache'
+    __table_args__ = (
+        UniqueConstraint('cache_key', 'model', name='uq_analysis_cache_key_model'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    host_id = Column(Integer, ForeignKey('hosts.id'), nullable=False, index=True)
+    cache_key = Column(String(64), nullable=False)  # sha256 of host, prompt version and sorted log hashes
+    model = Column(String(255), nullable=False)  # provider/model that produced the analysis
+    analysis = Column(CompressedText(), nullable=False)  # JSON
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
+    hit_count = Column(Integer, default=0)
+    
+    # Relationships
+    host = relationship("Host", back_populates="analysis_cache")
+
+
+class KnownLogTemplate(Base):
+    """Log line template already seen on a host (local pre-classifier)"""
+    __tablename__ = 'known_log_templates'
+    __table_args__ = (
+        UniqueConstraint('host_id', 'template_hash', name='uq_known_log_templates_host_hash'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    host_id = Column(Integer, ForeignKey('hosts.id'), nullable=False)
+    template_hash = Column(String(64), nullable=False)  # sha256 of the template text
+    template = Column(Text, nullable=False)  # Mined template (variable tokens as <*>)
+    first_seen = Column(DateTime, default=datetime.utcnow)
+    last_seen = Column(DateTime, default=datetime.utcnow, index=True)
+    
+    # Relationships
+    host = relationship("Host", back_populates="known_templates")
+
+
 class SystemMetric(Base):
     """System metrics captured during monitoring"""
     __tablename__ = 'system_metrics'
@@ -0,0 +1,316 @@
+"""
+Health time series for dthostmon
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Every saved monitoring run is added to its host's hourly and daily
+HealthRollup rows in the same transaction (one upsert per period), so history
+and report queries read at most one row per host and period instead of every
+raw run. Periods outside the span of a host's rollups - after the latest one
+(normally just the current period) and before the first one (history recorded
+before rollups existed) - are aggregated from raw runs while those are kept.
+Periods inside the span are read from rollups only.
+
+The maintain command recomputes recent rollups from raw runs and backfills
+runs older than the first rollup (see core/maintenance.py), which repairs
+lost increments and closes gaps inside the span.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, select
+from sqlalchemy.orm import Session
+
+from .database import HealthRollup, MonitoringRun
+from .upsert import upsert
+
+logger = logging.getLogger(__name__)
+
+PERIODS = ('hour', 'day')
+
+
+def truncate_period(moment: datetime, period: str) -> datetime:
+    """Start of the hour or day containing moment"""
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0) if period == 'day' else moment
+
+
+def next_period(period_start: datetime, period: str) -> datetime:
+    """Start of the period following period_start"""
+    return period_start + (timedelta(days=1) if period == 'day' else timedelta(hours=1))
+
+
+def empty_rollup() -> Dict:
+    """Aggregate of a period without runs"""
+    return {
+        'run_count': 0, 'failed_count': 0, 'health_count': 0, 'health_sum': 0,
+        'health_min': None, 'health_max': None, 'anomalies_total': 0, 'changes_total': 0
+    }
+
+
+def add_health(agg: Dict, count: int, total: int, minimum: int, maximum: int):
+    """Merge health score statistics into an aggregate"""
+    agg['health_count'] += count
+    agg['health_sum'] += total
+    agg['health_min'] = minimum if agg['health_min'] is None else min(agg['health_min'], minimum)
+    agg['health_max'] = maximum if agg['health_max'] is None else max(agg['health_max'], maximum)
+
+
+def merge_rollup(agg: Dict, other: Dict):
+    """Add the aggregate other into agg"""
+    for key in ('run_count', 'failed_count', 'anomalies_total', 'changes_total'):
+        agg[key] += other.get(key) or 0
+    if other.get('health_count'):
+        add_health(agg, other['health_count'], other['health_sum'],
+                   other['health_min'], other['health_max'])
+
+
+def run_rollup(status: str, health_score: Optional[int], anomalies: int, changes: int) -> Dict:
+    """Aggregate of a single run"""
+    agg = empty_rollup()
+    agg.update({
+        'run_count': 1,
+        'failed_count': 1 if status == 'failed' else 0,
+        'anomalies_total': anomalies or 0,
+        'changes_total': changes or 0
+    })
+    if health_score is not None:
+        add_health(agg, 1, health_score, health_score, health_score)
+    return agg
+
+
+def record_run(session: Session, run: Dict):
+    """
+    Add a saved run to the hourly and daily rollups of its host (no commit)
+    
+    Args:
+        session: Database session
+        run: MonitoringRun columns (host_id, run_date, status, health_score,
+             anomalies_detected, changes_detected)
+    """
+    if run['status'] == 'skipped':
+        return
+    
+    values = run_rollup(run['status'], run.get('health_score'),
+                        run.get('anomalies_detected'), run.get('changes_detected'))
+    rows = [
+        {'host_id': run['host_id'], 'period': period,
+         'period_start': truncate_period(run['run_date'], period),
+         'updated_at': datetime.utcnow(), **values}
+        for period in PERIODS
+    ]
+    
+    upsert(
+        session, HealthRollup, rows,
+        index_elements=[HealthRollup.host_id, HealthRollup.period, HealthRollup.period_start],
+        update_cols={
+            **{key: (lambda new, key=key: getattr(HealthRollup, key) + getattr(new, key))
+               for key in ('run_count', 'failed_count', 'health_count', 'health_sum',
+                           'anomalies_total', 'changes_total')},
+            'health_min': lambda new: case(
+                (HealthRollup.health_min.is_(None), new.health_min),
+                (new.health_min < HealthRollup.health_min, new.health_min),
+                else_=HealthRollup.health_min
+            ),
+            'health_max': lambda new: case(
+                (HealthRollup.health_max.is_(None), new.health_max),
+                (new.health_max > HealthRollup.health_max, new.health_max),
+                else_=HealthRollup.health_max
+            ),
+            'updated_at': lambda new: new.updated_at
+        }
+    )
+
+
+def aggregate_runs(session: Session, start: datetime, end: datetime, period: str = 'hour',
+                   host_ids: Optional[Iterable[int]] = None) -> Dict[Tuple[int, datetime], Dict]:
+    """
+    Aggregate raw runs in [start, end) per host and period
+    
+    Args:
+        session: Database session
+        start: First run date included
+        end: First run date excluded
+        period: 'hour' or 'day'
+        host_ids: Restrict to these hosts (default: all)
+    
+    Returns:
+        Dictionary keyed by (host_id, period_start)
+    """
+    query = (
+        select(MonitoringRun.host_id, MonitoringRun.run_date, MonitoringRun.status,
+               MonitoringRun.health_score, MonitoringRun.anomalies_detected,
+               MonitoringRun.changes_detected)
+        .where(
+            MonitoringRun.run_date >= start,
+            MonitoringRun.run_date < end,
+            MonitoringRun.status != 'skipped'
+        )
+    )
+    if host_ids is not None:
+        query = query.where(MonitoringRun.host_id.in_(list(host_ids)))
+    
+    aggregates: Dict[Tuple[int, datetime], Dict] = {}
+    for host_id, run_date, status, health_score, anomalies, changes in session.execute(
+            query.execution_options(yield_per=5000)):
+        agg = aggregates.setdefault((host_id, truncate_period(run_date, period)), empty_rollup())
+        merge_rollup(agg, run_rollup(status, health_score, anomalies, changes))
+    return aggregates
+
+
+def load_series(session: Session, host_ids: Iterable[int], start: datetime,
+                period: str = 'hour', now: Optional[datetime] = None) -> Dict[int, List[Dict]]:
+    """
+    Health per host and period from start until now
+    
+    Rollups serve every period from the first to the latest one rolled up
+    for the host; earlier periods and later ones (at least the current,
+    incomplete one) come from raw runs.
+    
+    Args:
+        session: Database session
+        host_ids: Host IDs
+        start: Beginning of the series (truncated to the period)
+        period: 'hour' or 'day'
+        now: End of the series (default: now)
+    
+    Returns:
+        Dictionary of host ID to points ordered by period_start; each point has
+        period_start, the rollup counters and health_avg
+    """
+    host_ids = list(host_ids)
+    now = now or datetime.utcnow()
+    start = truncate_period(start, period)
+    series: Dict[int, Dict[datetime, Dict]] = {host_id: {} for host_id in host_ids}
+    if not host_ids:
+        return {}
+    
+    rollups = session.execute(
+        select(HealthRollup.host_id, HealthRollup.period_start,
+               *(getattr(HealthRollup, key) for key in empty_rollup()))
+        .where(
+            HealthRollup.host_id.in_(host_ids),
+            HealthRollup.period == period,
+            HealthRollup.period_start >= start,
+            HealthRollup.period_start < truncate_period(now, period)
+        )
+    ).all()
+    
+    # Span of periods covered by rollups per host
+    covered: Dict[int, Tuple[datetime, datetime]] = {}
+    for row in rollups:
+        series[row.host_id][row.period_start] = {key: getattr(row, key) for key in empty_rollup()}
+        first, last = covered.get(row.host_id, (row.period_start, row.period_start))
+        covered[row.host_id] = (min(first, row.period_start), max(last, row.period_start))
+    
+    # Raw runs before the first and after the latest rollup of each host
+    before_end = now if len(covered) < len(host_ids) else max(first for first, _ in covered.values())
+    after_start = min((next_period(last, period) for _, last in covered.values()), default=now)
+    if after_start <= before_end:
+        ranges = [(start, now)]
+    else:
+        ranges = [(start, before_end), (after_start, now)]
+    for range_start, range_end in ranges:
+        if range_start >= range_end:
+            continue
+        for (host_id, period_start), values in aggregate_runs(session, range_start, range_end,
+                                                              period, host_ids).items():
+            span = covered.get(host_id)
+            if span is None or period_start < span[0] or period_start > span[1]:
+                series[host_id][period_start] = values
+    
+    return {
+        host_id: [
+            {'period_start': period_start, **values, 'health_avg': health_avg(values)}
+            for period_start, values in sorted(points.items())
+        ]
+        for host_id, points in series.items()
+    }
+
+
+def history_resolution(days: int, resolution: str = 'auto') -> str:
+    """
+    Resolution of a history request over the last days
+    
+    'auto' returns 'raw' (every run) up to 7 days, 'hour' up to 31 days and
+    'day' beyond.
+    
+    Returns:
+        'raw', 'hour' or 'day'
+    """
+    if resolution != 'auto':
+        return resolution
+    return 'raw' if days <= 7 else 'hour' if days <= 31 else 'day'
+
+
+def history_series(session: Session, host_id: int, start: datetime, resolution: str) -> Dict:
+    """
+    History of a host as served by the API
+    
+    Args:
+        session: Database session
+        host_id: Host ID
+        start: Beginning of the history
+        resolution: 'raw' (every run), 'hour' or 'day' (rollups)
+    
+    Returns:
+        Dictionary with 'total_runs' and 'runs' (raw) or 'points'
+    """
+    if resolution == 'raw':
+        runs = session.execute(
+            select(MonitoringRun.run_date, MonitoringRun.health_score, MonitoringRun.status,
+                   MonitoringRun.anomalies_detected, MonitoringRun.changes_detected)
+            .where(MonitoringRun.host_id == host_id, MonitoringRun.run_date >= start)
+            .order_by(MonitoringRun.run_date.asc())
+        ).all()
+        return {
+            'total_runs': len(runs),
+            'runs': [
+                {
+                    'run_date': run.run_date.isoformat(),
+                    'health_score': run.health_score,
+                    'status': run.status,
+                    'anomalies': run.anomalies_detected,
+                    'changes': run.changes_detected
+                }
+                for run in runs
+            ]
+        }
+    
+    points = load_series(session, [host_id], start, resolution)[host_id]
+    return {
+        'total_runs': sum(point['run_count'] for point in points),
+        'points': [
+            {
+                'period_start': point['period_start'].isoformat(),
+                'runs': point['run_count'],
+                'failed': point['failed_count'],
+                'health_avg': point['health_avg'],
+                'health_min': point['health_min'],
+                'health_max': point['health_max'],
+                'anomalies': point['anomalies_total'],
+                'changes': point['changes_total']
+            }
+            for point in points
+        ]
+    }
+
+
+def summarize(points: Iterable[Dict]) -> Dict:
+    """
+    Combine points of a series into one aggregate
+    
+    Returns:
+        Aggregate counters with health_avg
+    """
+    agg = empty_rollup()
+    for point in points:
+        merge_rollup(agg, point)
+    agg['health_avg'] = health_avg(agg)
+    return agg
+
+
+def health_avg(agg: Dict) -> Optional[float]:
+    """Average health score of an aggregate (None without scored runs)"""
+    return agg['health_sum'] / agg['health_count'] if agg['health_count'] else None
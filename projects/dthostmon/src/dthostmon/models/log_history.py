@@ -0,0 +1,210 @@
+"""
+Delta-encoded log history for dthostmon
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Successive snapshots of a log usually only differ by appended lines. In delta
+mode a LogEntry stores only the text appended since the previous snapshot of
+the same (host, path) - its delta_base - and keeps the first
+delta_prefix_length characters of the base. A full keyframe is written when
+the log did not simply grow (rotation, truncation, edits) and every
+keyframe_interval snapshots, which bounds the cost of reconstruction.
+
+Appends are detected without reading the previous snapshot back: each entry
+records the SHA256 and length of its full text, so the current text is an
+append if its first text_length characters hash to the base's text_hash.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Union
+
+from sqlalchemy import Select, func, select, update
+from sqlalchemy.orm import Session, aliased
+
+from .blob_store import content_digest, release_blobs, store_blobs
+from .database import LogBlob, LogEntry, MonitoringRun
+
+logger = logging.getLogger(__name__)
+
+
+def load_delta_bases(session: Session, host_id: int, paths: Iterable[str]) -> Dict[str, Dict]:
+    """
+    Latest stored snapshot of each log of a host, in one query
+    
+    Args:
+        session: Database session
+        host_id: Host ID
+        paths: Log paths of the current run
+    
+    Returns:
+        Dictionary keyed by path with id, text_hash, text_length and delta_depth
+    """
+    paths = list(paths)
+    if not paths:
+        return {}
+    
+    latest = (
+        select(func.max(LogEntry.id))
+        .join(MonitoringRun, MonitoringRun.id == LogEntry.monitoring_run_id)
+        .where(
+            MonitoringRun.host_id == host_id,
+            LogEntry.log_file_path.in_(paths),
+            LogEntry.text_hash.isnot(None)
+        )
+        .group_by(LogEntry.log_file_path)
+    )
+    rows = session.execute(
+        select(LogEntry.id, LogEntry.log_file_path, LogEntry.text_hash,
+               LogEntry.text_length, LogEntry.delta_depth)
+        .where(LogEntry.id.in_(latest))
+    ).all()
+    return {
+        row.log_file_path: {
+            'id': row.id,
+            'text_hash': row.text_hash,
+            'text_length': row.text_length,
+            'delta_depth': row.delta_depth or 0
+        }
+        for row in rows
+    }
+
+
+def plan_snapshot(content: str, base: Optional[Dict], keyframe_interval: int) -> Dict:
+    """
+    Decide how to store a log snapshot
+    
+    Args:
+        content: Full text of the snapshot
+        base: Previous snapshot from load_delta_bases(), or None
+        keyframe_interval: Maximum chain length before a new keyframe (0 = always keyframe)
+    
+    Returns:
+        Dictionary with 'stored' (text to put in the blob) and the LogEntry
+        columns text_hash, text_length, delta_base_id, delta_prefix_length, delta_depth
+    """
+    plan = {
+        'stored': content,
+        'text_hash': content_digest(content),
+        'text_length': len(content),
+        'delta_base_id': None,
+        'delta_prefix_length': None,
+        'delta_depth': 0
+    }
+    if not base or base['text_length'] is None:
+        return plan
+    if base['delta_depth'] + 1 >= keyframe_interval:
+        return plan
+    
+    prefix_length = base['text_length']
+    if len(content) < prefix_length or content_digest(content[:prefix_length]) != base['text_hash']:
+        return plan
+    
+    plan.update({
+        'stored': content[prefix_length:],
+        'delta_base_id': base['id'],
+        'delta_prefix_length': prefix_length,
+        'delta_depth': base['delta_depth'] + 1
+    })
+    return plan
+
+
+def reconstruct_entries(session: Session, entry_ids: Iterable[int]) -> Dict[int, Optional[str]]:
+    """
+    Rebuild the full text of log entries, following delta chains
+    
+    The chains of all requested entries are loaded with one recursive query.
+    
+    Args:
+        session: Database session
+        entry_ids: LogEntry IDs
+    
+    Returns:
+        Dictionary of entry ID to text (None for entries stored without content)
+    """
+    entry_ids = list(entry_ids)
+    if not entry_ids:
+        return {}
+    
+    chain = (
+        select(LogEntry.id, LogEntry.delta_base_id)
+        .where(LogEntry.id.in_(entry_ids))
+        .cte('chain', recursive=True)
+    )
+    parent = aliased(LogEntry)
+    chain = chain.union(
+        select(parent.id, parent.delta_base_id).join(chain, parent.id == chain.c.delta_base_id)
+    )
+    rows = session.execute(
+        select(LogEntry.id, LogEntry.delta_base_id, LogEntry.delta_prefix_length,
+               LogEntry.content, LogBlob.content.label('blob_content'))
+        .outerjoin(LogBlob, LogBlob.hash == LogEntry.blob_hash)
+        .where(LogEntry.id.in_(select(chain.c.id)))
+    ).all()
+    nodes = {row.id: row for row in rows}
+    
+    texts: Dict[int, Optional[str]] = {}
+    
+    def resolve(entry_id: int) -> Optional[str]:
+        # Walk back to the keyframe, then apply the deltas forwards
+        pending = []
+        current = entry_id
+        while current not in texts:
+            node = nodes[current]
+            if node.delta_base_id is None:
+                texts[current] = node.blob_content if node.blob_content is not None else node.content
+                break
+            pending.append(current)
+            current = node.delta_base_id
+        for delta_id in reversed(pending):
+            node = nodes[delta_id]
+            base_text = texts[node.delta_base_id] or ''
+            texts[delta_id] = base_text[:node.delta_prefix_length] + (node.blob_content or '')
+        return texts[entry_id]
+    
+    return {entry_id: resolve(entry_id) for entry_id in entry_ids if entry_id in nodes}
+
+
+def reconstruct_entry(session: Session, entry_id: int) -> Optional[str]:
+    """Rebuild the full text of a single log entry"""
+    return reconstruct_entries(session, [entry_id]).get(entry_id)
+
+
+def materialize_dependents(session: Session, entry_ids: Union[List[int], Select]) -> int:
+    """
+    Turn deltas based on entries about to be deleted into keyframes
+    
+    Only the first surviving entry of each chain depends directly on a deleted
+    entry; later ones keep pointing at it.
+    
+    Args:
+        session: Database session
+        entry_ids: IDs (or a SELECT of the IDs) of the entries that will be deleted
+    
+    Returns:
+        Number of entries rewritten as keyframes
+    """
+    if isinstance(entry_ids, list) and not entry_ids:
+        return 0
+    
+    dependents = session.execute(
+        select(LogEntry.id, LogEntry.blob_hash).where(
+            LogEntry.delta_base_id.in_(entry_ids),
+            LogEntry.id.notin_(entry_ids)
+        )
+    ).all()
+    if not dependents:
+        return 0
+    
+    texts = reconstruct_entries(session, [row.id for row in dependents])
+    old_hashes = [row.blob_hash for row in dependents]
+    new_hashes = store_blobs(session, [texts[row.id] or '' for row in dependents])
+    for row, blob_hash in zip(dependents, new_hashes):
+        session.execute(
+            update(LogEntry)
+            .where(LogEntry.id == row.id)
+            .values(blob_hash=blob_hash, delta_base_id=None, delta_prefix_length=None,
+                    delta_depth=0)
+        )
+    release_blobs(session, old_hashes)
+    
+    logger.debug(f"Materialized {len(dependents)} delta log entries as keyframes")
+    return len(dependents)
@@ -0,0 +1,332 @@
+"""
+Monthly partitioning of the history tables for dthostmon (PostgreSQL)
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+With database.partitioning enabled, monitoring_runs and log_entries are
+declaratively range-partitioned by month of the run date (log_entries.run_date
+is copied from the run, so a run and its entries share a month even when the
+logs were retrieved after midnight):
+
+    monitoring_runs_y2026m10  FOR VALUES FROM ('2026-10-01') TO ('2026-11-01')
+
+Partitions are created database.partition_months_ahead months in advance (a
+DEFAULT partition catches anything outside them; its rows move to a new
+partition when that month is created) and retention drops whole partitions
+instead of deleting rows. Queries filtering on run_date only scan
+the matching months.
+
+Partitioned tables cannot be referenced by foreign keys on a single column,
+so the constraints pointing at them (log_entries.monitoring_run_id,
+detected_changes.monitoring_run_id, log_entries.delta_base_id) are dropped on
+conversion; dthostmon maintains those references itself (see delete_runs and
+drop_expired).
+"""
+
+import logging
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, select, text
+
+from . import DatabaseManager
+from .database import DetectedChange, LogEntry, MonitoringRun
+from .log_history import materialize_dependents
+
+logger = logging.getLogger(__name__)
+
+# Table -> partition key and the indexes/foreign keys recreated on the partitioned table
+PARTITIONED_TABLES: Dict[str, Dict] = {
+    'monitoring_runs': {
+        'key': 'run_date',
+        'indexes': {
+            'ix_monitoring_runs_host_run_date': ['host_id', 'run_date'],
+            'ix_monitoring_runs_run_date': ['run_date'],
+        },
+        'foreign_keys': {'host_id': 'hosts(id)'},
+    },
+    'log_entries': {
+        'key': 'run_date',
+        # Entries written before log_entries.run_date existed
+        'backfill': ("UPDATE {table} e SET run_date = r.run_date FROM monitoring_runs r "
+                     "WHERE r.id = e.monitoring_run_id AND e.run_date IS NULL"),
+        'indexes': {
+            'ix_log_entries_monitoring_run_id': ['monitoring_run_id'],
+            'ix_log_entries_blob_hash': ['blob_hash'],
+            'ix_log_entries_delta_base_id': ['delta_base_id'],
+        },
+        'foreign_keys': {'blob_hash': 'log_blobs(hash)'},
+    },
+}
+
+_PARTITION_NAME = re.compile(r'_y(\d{4})m(\d{2})$')
+
+
+class PartitioningError(Exception):
+    """Raised when partitions cannot be managed"""
+    pass
+
+
+def month_start(moment: datetime, offset: int = 0) -> datetime:
+    """First day of the month containing moment, shifted by offset months"""
+    index = moment.year * 12 + (moment.month - 1) + offset
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, start: datetime) -> str:
+    """Name of the monthly partition of a table starting at start"""
+    return f"{table}_y{start.year:04d}m{start.month:02d}"
+
+
+def partition_bounds(name: str) -> Optional[Tuple[datetime, datetime]]:
+    """(lower, upper) bounds encoded in a monthly partition name, None for others"""
+    match = _PARTITION_NAME.search(name)
+    if not match:
+        return None
+    start = datetime(int(match.group(1)), int(match.group(2)), 1)
+    return start, month_start(start, 1)
+
+
+class PartitionManager:
+    """Creates, converts and drops monthly partitions of the history tables"""
+    
+    def __init__(self, db_manager: DatabaseManager, months_ahead: int = 3, batch_size: int = 1000):
+        """
+        Initialize partition manager
+        
+        Args:
+            db_manager: Database manager (PostgreSQL)
+            months_ahead: Future monthly partitions kept ready
+            batch_size: Rows per batch when cleaning up references before a drop
+        """
+        self.db_manager = db_manager
+        self.months_ahead = max(1, int(months_ahead))
+        self.batch_size = max(1, int(batch_size))
+    
+    @property
+    def supported(self) -> bool:
+        """Declarative partitioning needs PostgreSQL"""
+        return self.db_manager.engine.dialect.name == 'postgresql'
+    
+    def is_partitioned(self, table: str) -> bool:
+        """Whether a table is already a partitioned table"""
+        with self.db_manager.get_session() as session:
+            return session.execute(text(
+                "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+                "WHERE c.relname = :table AND pg_table_is_visible(c.oid)"
+            ), {'table': table}).first() is not None
+    
+    def partitions(self, table: str) -> List[str]:
+        """Names of the partitions attached to a table"""
+        with self.db_manager.get_session() as session:
+            return list(session.execute(text(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = CAST(:table AS regclass) ORDER BY c.relname"
+            ), {'table': table}).scalars())
+    
+    def ensure_partitions(self, now: Optional[datetime] = None) -> List[str]:
+        """
+        Create missing monthly partitions from the current month up to months_ahead
+        
+        Returns:
+            Names of the partitions created
+        """
+        now = now or datetime.utcnow()
+        created = []
+        for table in PARTITIONED_TABLES:
+            if not self.is_partitioned(table):
+                continue
+            existing = set(self.partitions(table))
+            has_default = f"{table}_default" in existing
+            for offset in range(self.months_ahead + 1):
+                start = month_start(now, offset)
+                name = partition_name(table, start)
+                if name not in existing:
+                    self._create_partition(table, name, start, has_default)
+                    created.append(name)
+        if created:
+            logger.info(f"Created partitions: {', '.join(created)}")
+        return created
+    
+    def _create_partition(self, table: str, name: str, start: datetime, has_default: bool):
+        """
+        Create the monthly partition of a table starting at start
+        
+        PostgreSQL refuses a new partition while the DEFAULT partition holds
+        rows of its range, so with a DEFAULT partition the month is built as a
+        plain table, those rows are moved into it and it is then attached.
+        """
+        bounds = f"FROM ('{start:%Y-%m-%d}') TO ('{month_start(start, 1):%Y-%m-%d}')"
+        key = PARTITIONED_TABLES[table]['key']
+        with self.db_manager.get_session() as session:
+            if not has_default:
+                session.execute(text(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} FOR VALUES {bounds}"))
+                return
+            
+            session.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)"))
+            moved = session.execute(text(
+                f"WITH moved AS (DELETE FROM {table}_default WHERE {key} >= :lower AND {key} < :upper "
+                f"RETURNING *) INSERT INTO {name} SELECT * FROM moved"
+            ), {'lower': start, 'upper': month_start(start, 1)}).rowcount
+            session.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES {bounds}"))
+        if moved:
+            logger.info(f"Moved {moved} rows from {table}_default to {name}")
+    
+    def convert(self, table: str, now: Optional[datetime] = None):
+        """
+        Convert an existing table into a partitioned table (one-time, copies all rows)
+        
+        Run during a maintenance window: the copy happens in one transaction
+        and blocks writers to the table until it commits.
+        
+        Args:
+            table: 'monitoring_runs' or 'log_entries'
+            now: Reference time for the partitions created ahead
+        
+        Raises:
+            PartitioningError: If the database or table is not supported
+        """
+        if not self.supported:
+            raise PartitioningError("Partitioning requires PostgreSQL")
+        if table not in PARTITIONED_TABLES:
+            raise PartitioningError(f"Table cannot be partitioned: {table}")
+        if self.is_partitioned(table):
+            logger.info(f"{table} is already partitioned")
+            return
+        
+        spec = PARTITIONED_TABLES[table]
+        key = spec['key']
+        legacy = f"{table}_unpartitioned"
+        now = now or datetime.utcnow()
+        
+        with self.db_manager.get_session() as session:
+            # Foreign keys pointing at the table cannot survive partitioning
+            incoming = session.execute(text(
+                "SELECT conname, CAST(conrelid AS regclass) FROM pg_constraint "
+                "WHERE contype = 'f' AND confrelid = CAST(:table AS regclass)"
+            ), {'table': table}).all()
+            for constraint, referencing in incoming:
+                session.execute(text(f'ALTER TABLE {referencing} DROP CONSTRAINT "{constraint}"'))
+            
+            if spec.get('backfill'):
+                session.execute(text(spec['backfill'].format(table=table)))
+            oldest = session.execute(text(f"SELECT min({key}) FROM {table}")).scalar()
+            
+            session.execute(text(f"ALTER TABLE {table} RENAME TO {legacy}"))
+            session.execute(text(f'ALTER TABLE {legacy} DROP CONSTRAINT "{table}_pkey"'))
+            for index in spec['indexes']:
+                session.execute(text(f"DROP INDEX IF EXISTS {index}"))
+            
+            session.execute(text(
+                f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) PARTITION BY RANGE ({key})"
+            ))
+            session.execute(text(f"UPDATE {legacy} SET {key} = now() AT TIME ZONE 'utc' WHERE {key} IS NULL"))
+            session.execute(text(f"ALTER TABLE {table} ALTER COLUMN {key} SET NOT NULL"))
+            session.execute(text(f"ALTER TABLE {table} ADD PRIMARY KEY (id, {key})"))
+            for index, columns in spec['indexes'].items():
+                session.execute(text(f"CREATE INDEX {index} ON {table} ({', '.join(columns)})"))
+            for column, target in spec['foreign_keys'].items():
+                session.execute(text(f"ALTER TABLE {table} ADD FOREIGN KEY ({column}) REFERENCES {target}"))
+            
+            # Monthly partitions covering the existing rows and the months ahead
+            start = month_start(oldest or now)
+            while start <= month_start(now, self.months_ahead):
+                session.execute(text(
+                    f"CREATE TABLE {partition_name(table, start)} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{month_start(start, 1):%Y-%m-%d}')"
+                ))
+                start = month_start(start, 1)
+            session.execute(text(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT"))
+            
+            session.execute(text(f"INSERT INTO {table} SELECT * FROM {legacy}"))
+            # The id sequence belongs to the old table and would be dropped with it
+            session.execute(text(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id"))
+            session.execute(text(f"DROP TABLE {legacy}"))
+        
+        logger.info(f"Converted {table} to monthly partitions by {key}")
+    
+    def drop_expired(self, cutoff: datetime) -> List[str]:
+        """
+        Drop monthly partitions that end before cutoff
+        
+        Both tables are partitioned by the run date, so a month's runs and
+        their log entries are dropped together. References into a partition
+        are cleaned up first, in batches: changes of the dropped runs are
+        deleted, later deltas based on the dropped entries materialized as
+        keyframes and the entries' blobs released.
+        
+        Args:
+            cutoff: Keep every month that has rows at or after this time
+        
+        Returns:
+            Names of the partitions dropped
+        """
+        dropped = []
+        for table in PARTITIONED_TABLES:
+            if not self.is_partitioned(table):
+                continue
+            for name in self.partitions(table):
+                bounds = partition_bounds(name)
+                if not bounds or bounds[1] > cutoff:
+                    continue
+                if table == 'monitoring_runs':
+                    self._release_runs(*bounds)
+                else:
+                    self._release_entries(name, *bounds)
+                with self.db_manager.get_session() as session:
+                    session.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+                logger.info(f"Dropped expired partition {name}")
+        return dropped
+    
+    def _release_runs(self, lower: datetime, upper: datetime):
+        """Delete the changes of runs in [lower, upper) in batches"""
+        runs = select(MonitoringRun.id).where(
+            MonitoringRun.run_date >= lower, MonitoringRun.run_date < upper
+        )
+        while True:
+            with self.db_manager.get_session() as session:
+                ids = session.execute(
+                    select(DetectedChange.id)
+                    .where(DetectedChange.monitoring_run_id.in_(runs))
+                    .limit(self.batch_size)
+                ).scalars().all()
+                if ids:
+                    session.execute(delete(DetectedChange).where(DetectedChange.id.in_(ids)))
+            if len(ids) < self.batch_size:
+                break
+    
+    def _release_entries(self, name: str, lower: datetime, upper: datetime):
+        """
+        Release blob references and rebase deltas of entries in a partition
+        
+        Deltas in later months based on the partition are materialized first,
+        in one transaction (only the first entry of each chain is rewritten).
+        Blob references are then released in id ranges of batch_size, each
+        committed on its own; released entries lose their blob_hash, so a
+        drop interrupted halfway never releases a reference twice.
+        """
+        entries = select(LogEntry.id).where(
+            LogEntry.run_date >= lower, LogEntry.run_date < upper
+        )
+        with self.db_manager.get_session() as session:
+            materialize_dependents(session, entries)
+            first, last = session.execute(text(f"SELECT min(id), max(id) FROM {name}")).one()
+        if first is None:
+            return
+        
+        for start in range(first, last + 1, self.batch_size):
+            bounds = {'start': start, 'end': start + self.batch_size}
+            with self.db_manager.get_session() as session:
+                # One set-based decrement per distinct blob of the batch
+                session.execute(text(
+                    f"UPDATE log_blobs b SET ref_count = b.ref_count - c.refs "
+                    f"FROM (SELECT blob_hash, count(*) AS refs FROM {name} "
+                    f"WHERE blob_hash IS NOT NULL AND id >= :start AND id < :end "
+                    f"GROUP BY blob_hash) c "
+                    f"WHERE b.hash = c.blob_hash"
+                ), bounds)
+                session.execute(text(
+                    f"UPDATE {name} SET blob_hash = NULL "
+                    f"WHERE blob_hash IS NOT NULL AND id >= :start AND id < :end"
+                ), bounds)
@@ -0,0 +1,68 @@
+"""
+Dialect-aware upsert for dthostmon
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Inserts rows or updates the ones that already exist under a unique
+constraint. PostgreSQL and SQLite do this in one INSERT ... ON CONFLICT DO
+UPDATE statement; other databases fall back to an UPDATE per row followed by
+an INSERT when no row matched.
+"""
+
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Union
+
+from sqlalchemy import insert, literal, update
+from sqlalchemy.orm import Session
+
+# Column name -> function of the new row (the dialect's `excluded`) returning the value to set
+UpdateColumns = Union[Sequence[str], Mapping[str, Callable[[Any], Any]]]
+
+
+def upsert(session: Session, model, rows: List[Dict[str, Any]], index_elements: Sequence,
+           update_cols: UpdateColumns):
+    """
+    Insert rows, updating the existing ones in place
+
+    Args:
+        session: Database session (no commit)
+        model: Mapped class of the table
+        rows: Row dictionaries, all with the same keys
+        index_elements: Columns of the unique constraint identifying a row
+        update_cols: Column names taken from the new row on conflict, or a
+            mapping of column name to a function of the new row returning an
+            SQL expression (e.g. lambda new: Model.count + new.count)
+    """
+    if not rows:
+        return
+    if not isinstance(update_cols, Mapping):
+        update_cols = {name: (lambda new, name=name: getattr(new, name)) for name in update_cols}
+
+    dialect = session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        _update_or_insert(session, model, rows, index_elements, update_cols)
+        return
+
+    statement = dialect_insert(model).values(rows)
+    session.execute(statement.on_conflict_do_update(
+        index_elements=list(index_elements),
+        set_={name: value(statement.excluded) for name, value in update_cols.items()}
+    ))
+
+
+def _update_or_insert(session: Session, model, rows: List[Dict[str, Any]], index_elements: Sequence,
+                      update_cols: Mapping[str, Callable[[Any], Any]]):
+    """Fallback for databases without ON CONFLICT: update each row, insert it if none matched"""
+    columns = model.__table__.c
+    for row in rows:
+        new = SimpleNamespace(**{key: literal(value, columns[key].type) for key, value in row.items()})
+        matched = session.execute(
+            update(model)
+            .where(*[column == row[column.key] for column in index_elements])
+            .values({name: value(new) for name, value in update_cols.items()})
+        ).rowcount
+        if not matched:
+            session.execute(insert(model), [row])
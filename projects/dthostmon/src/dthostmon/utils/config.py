@@ -1,6 +1,6 @@
 """
 Configuration management for dthostmon
-Last Updated: 11/14/2025 12:00:00 PM CDT
+Last Updated: 10/16/2026 12:00:00 PM CDT
 
 Handles YAML configuration loading with environment variable substitution.
 """
@@ -110,6 +110,16 @@ class Config:
         if not isinstance(self.data['hosts'], list) or len(self.data['hosts']) == 0:
             raise ConfigurationError("Configuration must include at least one host in 'hosts' section")
         
+        # Normalize per-log retrieval policies (plain paths stay strings)
+        from .log_policy import normalize_log_entry
+        for host in self.data['hosts']:
+            if not isinstance(host, dict) or not host.get('logs'):
+                continue
+            try:
+                host['logs'] = [normalize_log_entry(entry) for entry in host['logs']]
+            except ConfigurationError as e:
+                raise ConfigurationError(f"Invalid logs for host {host.get('name')}: {e}")
+        
         logger.debug("Configuration validation passed")
     
     def get(self, key_path: str, default: Any = None) -> Any:
@@ -0,0 +1,166 @@
+"""
+Per-log retrieval policies for dthostmon
+Last Updated: 10/16/2026 12:00:00 PM CDT
+
+Host `logs` entries are either a plain path or a mapping with a path and a
+retrieval policy:
+
+    logs:
+      - /var/log/auth.log
+      - path: /var/log/syslog
+        tail_lines: 5000     # only the last 5000 lines
+        max_bytes: 2MB       # never more than 2 MB (whole lines)
+        since: 24h           # skip the file if not modified in the last 24 hours
+
+`since` accepts a duration (30m, 24h, 7d), an ISO timestamp or epoch seconds.
+Policies are enforced on the remote host before transfer.
+"""
+
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple, Union
+
+from .config import ConfigurationError
+
+POLICY_KEYS = ('max_bytes', 'tail_lines', 'since')
+
+_SIZE_PATTERN = re.compile(r'^\s*(\d+)\s*([KMG]i?B?|B)?\s*$', re.IGNORECASE)
+_SIZE_UNITS = {'': 1, 'B': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+_DURATION_PATTERN = re.compile(r'^\s*(\d+)\s*([smhdw])\s*$', re.IGNORECASE)
+_DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+
+def parse_size(value: Any) -> int:
+    """
+    Parse a byte size such as 2097152, "512K", "2MB" or "1GiB"
+    
+    Args:
+        value: Integer byte count or size string (binary units)
+    
+    Returns:
+        Size in bytes
+    
+    Raises:
+        ConfigurationError: If the value is not a valid size
+    """
+    if isinstance(value, bool):
+        raise ConfigurationError(f"Invalid size: {value!r}")
+    if isinstance(value, int):
+        size = value
+    else:
+        match = _SIZE_PATTERN.match(str(value))
+        if not match:
+            raise ConfigurationError(f"Invalid size: {value!r}")
+        unit = (match.group(2) or '')[:1].upper()
+        size = int(match.group(1)) * _SIZE_UNITS[unit]
+    
+    if size <= 0:
+        raise ConfigurationError(f"Size must be positive: {value!r}")
+    return size
+
+
+def resolve_since(value: Any, now: Optional[float] = None) -> Optional[int]:
+    """
+    Resolve a `since` policy value to epoch seconds
+    
+    Args:
+        value: Duration (e.g. "24h"), ISO timestamp, datetime or epoch seconds
+        now: Reference time for durations (default: time.time())
+    
+    Returns:
+        Epoch seconds, or None if value is None
+    
+    Raises:
+        ConfigurationError: If the value cannot be parsed
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    
+    text = str(value).strip()
+    match = _DURATION_PATTERN.match(text)
+    if match:
+        now = time.time() if now is None else now
+        return int(now - int(match.group(1)) * _DURATION_UNITS[match.group(2).lower()])
+    
+    try:
+        # Naive timestamps are interpreted in the local time zone
+        return int(datetime.fromisoformat(text).timestamp())
+    except ValueError:
+        raise ConfigurationError(f"Invalid 'since' value: {value!r}")
+
+
+def parse_tail_lines(value: Any) -> int:
+    """
+    Parse a `tail_lines` policy value
+    
+    Raises:
+        ConfigurationError: If the value is not a positive integer
+    """
+    try:
+        tail_lines = int(value)
+    except (TypeError, ValueError):
+        tail_lines = 0
+    if tail_lines <= 0:
+        raise ConfigurationError(f"tail_lines must be a positive integer: {value!r}")
+    return tail_lines
+
+
+def normalize_log_entry(entry: Any) -> Union[str, Dict[str, Any]]:
+    """
+    Validate a host `logs` entry and return its canonical form
+    
+    Plain paths (and mappings without a policy) stay strings so existing
+    configurations and stored hosts are unchanged.
+    
+    Args:
+        entry: Path string or mapping with 'path' and policy keys
+    
+    Returns:
+        Path string, or dict with 'path' plus the configured policy keys
+    
+    Raises:
+        ConfigurationError: If the entry is invalid
+    """
+    if isinstance(entry, str):
+        return entry
+    if not isinstance(entry, dict) or not entry.get('path'):
+        raise ConfigurationError(f"Log entry must be a path or a mapping with 'path': {entry!r}")
+    
+    unknown = set(entry) - {'path'} - set(POLICY_KEYS)
+    if unknown:
+        raise ConfigurationError(f"Unknown log policy keys for {entry['path']}: "
+                                 f"{', '.join(sorted(unknown))}")
+    
+    normalized: Dict[str, Any] = {'path': str(entry['path'])}
+    if entry.get('max_bytes') is not None:
+        normalized['max_bytes'] = parse_size(entry['max_bytes'])
+    if entry.get('tail_lines') is not None:
+        normalized['tail_lines'] = parse_tail_lines(entry['tail_lines'])
+    if entry.get('since') is not None:
+        since = entry['since']
+        resolve_since(since)  # Validate now, resolve at retrieval time
+        normalized['since'] = since.isoformat() if isinstance(since, datetime) else since
+    
+    if len(normalized) == 1:
+        return normalized['path']
+    return normalized
+
+
+def split_log_entry(entry: Union[str, Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Split a (normalized) log entry into its path and policy
+    
+    Args:
+        entry: Path string or policy mapping
+    
+    Returns:
+        Tuple of (path, policy dict - empty for plain paths)
+    """
+    if isinstance(entry, dict):
+        return entry['path'], {k: entry[k] for k in POLICY_KEYS if entry.get(k) is not None}
+    return entry, {}
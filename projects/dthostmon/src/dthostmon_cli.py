@@ -1,12 +1,13 @@
 #!/usr/bin/env python3
 """
 dthostmon - Main CLI Entry Point
-Last Updated: 11/14/2025 12:00:00 PM CDT
+Last Updated: 10/16/2026 12:00:00 PM CDT
 
 Command-line interface for running monitoring cycles and managing the system.
 """
 
 import sys
+import time
 import argparse
 from pathlib import Path
 
@@ -43,8 +44,65 @@ def run_monitor(args):
     # Initialize orchestrator
     orchestrator = MonitoringOrchestrator(config, db_manager)
     
-    # Run monitoring cycle
-    orchestrator.run_monitoring_cycle()
+    if not args.daemon:
+        # Run monitoring cycle
+        try:
+            orchestrator.run_monitoring_cycle()
+        finally:
+            orchestrator.close()
+        return
+    
+    # Daemon mode: keep the process (and pooled SSH connections) alive between cycles
+    interval = int(config.get('global.monitor_interval') or 3600)
+    print(f"Running in daemon mode, cycle interval {interval}s")
+    try:
+        while True:
+            cycle_start = time.time()
+            try:
+                orchestrator.run_monitoring_cycle()
+            except Exception as e:
+                print(f"Monitoring cycle failed: {e}", file=sys.stderr)
+            time.sleep(max(0, interval - (time.time() - cycle_start)))
+    finally:
+        orchestrator.close()
+
+
+def run_maintenance(args):
+    """Apply retention, rollups and blob garbage collection"""
+    config = Config(config_path=args.config, env_file=args.env)
+    setup_logging(level=config.log_level, log_file=args.log_file)
+    
+    from dthostmon.core.maintenance import MaintenanceJob
+    
+    db_manager = DatabaseManager(config.database_url, echo=args.debug)
+    job = MaintenanceJob(config, db_manager)
+    if args.batch_size:
+        job.batch_size = args.batch_size
+    
+    if args.convert_partitions:
+        from dthostmon.models.partitioning import PARTITIONED_TABLES, PartitionManager, PartitioningError
+        
+        manager = job.partitions or PartitionManager(db_manager)
+        try:
+            for table in PARTITIONED_TABLES:
+                manager.convert(table)
+        except PartitioningError as e:
+            print(f"Partitioning failed: {e}", file=sys.stderr)
+            sys.exit(1)
+        print("History tables are partitioned by month")
+    
+    stats = job.run()
+    
+    print("\n" + "=" * 70)
+    print("MAINTENANCE SUMMARY")
+    print("=" * 70 + "\n")
+    print(f"Rollups updated:     {stats['rollups']}")
+    print(f"Runs deleted:        {stats['runs_deleted']} (older than {job.raw_days} days)")
+    print(f"Baselines deleted:   {stats['baselines_deleted']}")
+    print(f"Rollups deleted:     {stats['rollups_deleted']}")
+    if 'partitions_dropped' in stats:
+        print(f"Partitions dropped:  {stats['partitions_dropped']}")
+    print(f"Log blobs deleted:   {stats['blobs_deleted']}\n")
 
 
 def review_config(args):
@@ -144,8 +202,22 @@ def main():
     monitor_parser.add_argument('--log-file', help='Log file path')
     monitor_parser.add_argument('--json-log', action='store_true',
                                help='Use JSON log format')
+    monitor_parser.add_argument('--daemon', action='store_true',
+                               help='Run cycles every global.monitor_interval seconds '
+                                    '(reuses SSH connections when ssh.connection_pool is on)')
     monitor_parser.set_defaults(func=run_monitor)
     
+    # Maintain command
+    maintain_parser = subparsers.add_parser('maintain',
+                                            help='Apply history retention, rollups and compaction')
+    maintain_parser.add_argument('--batch-size', type=int,
+                                help='Rows deleted per transaction (overrides maintenance.batch_size)')
+    maintain_parser.add_argument('--convert-partitions', action='store_true',
+                                help='Convert monitoring_runs and log_entries to monthly partitions first '
+                                     '(PostgreSQL, one-time, run during a maintenance window)')
+    maintain_parser.add_argument('--log-file', help='Log file path')
+    maintain_parser.set_defaults(func=run_maintenance)
+    
     # Config command
     config_parser = subparsers.add_parser('config', help='Review configuration')
     config_parser.add_argument('--show-secrets', action='store_true',
@@ -0,0 +1,107 @@
+"""
+Unit tests for the persistent AI analysis cache
+Last Updated: 10/16/2026 12:00:00 PM CDT
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+from dthostmon.core.ai_analyzer import AIAnalyzer
+from dthostmon.core.analysis_cache import AnalysisCache
+from dthostmon.models.database import Host, AnalysisCacheEntry
+
+MODELS = ['grok/grok-beta', 'ollama/llama3.1']
+ANALYSIS = {'health_score': 95, 'severity': 'INFO', 'anomalies': [], 'summary': 'ok'}
+
+
+@pytest.fixture
+def host_id(db_manager):
+    with db_manager.get_session() as session:
+        host = Host(name='web01', hostname='10.0.0.1', user='monitor')
+        session.add(host)
+        session.flush()
+        return host.id
+
+
+@pytest.fixture
+def cache(db_manager):
+    return AnalysisCache(db_manager, prompt_version='1', ttl_hours=24, max_entries=2)
+
+
+def _logs(*hashes):
+    return [{'path': f'/var/log/{h}.log', 'hash': h, 'content': h} for h in hashes]
+
+
+def test_key_ignores_log_order_and_tracks_prompt(db_manager, cache):
+    """Test keys depend on the logs' paths and hashes, the host and the prompt version"""
+    assert cache.key(1, _logs('a', 'b')) == cache.key(1, _logs('b', 'a'))
+    assert cache.key(1, _logs('a', 'b')) != cache.key(2, _logs('a', 'b'))
+    assert cache.key(1, _logs('a')) != AnalysisCache(db_manager, prompt_version='2').key(1, _logs('a'))
+    assert cache.key(1, []) is None
+    
+    # Logs without a hash count by path and status
+    unreadable = _logs('a') + [{'path': '/var/log/x', 'hash': None, 'error': 'File not accessible'}]
+    assert cache.key(1, unreadable) is not None
+    assert cache.key(1, unreadable) != cache.key(1, _logs('a'))
+    assert cache.key(1, unreadable) != cache.key(1, _logs('a') + [{'path': '/var/log/x', 'skipped': 'old'}])
+
+
+def test_get_prefers_models_in_order(cache, host_id):
+    """Test a hit returns the analysis of the most preferred cached model"""
+    assert cache.get(host_id, _logs('a'), MODELS) is None
+    
+    cache.put(host_id, _logs('a'), 'ollama/llama3.1', {**ANALYSIS, 'summary': 'local'})
+    assert cache.get(host_id, _logs('a'), MODELS) == ('ollama/llama3.1', {**ANALYSIS, 'summary': 'local'})
+    
+    cache.put(host_id, _logs('a'), 'grok/grok-beta', ANALYSIS)
+    assert cache.get(host_id, _logs('a'), MODELS) == ('grok/grok-beta', ANALYSIS)
+    assert cache.get(host_id, _logs('a'), ['openai/gpt-4']) is None
+    assert cache.get(host_id, _logs('a', 'b'), MODELS) is None
+
+
+def test_expired_entries_are_ignored_and_evicted(db_manager, cache, host_id):
+    """Test TTL expiry and least-recently-used trimming"""
+    for name in ('a', 'b', 'c'):
+        cache.put(host_id, _logs(name), MODELS[0], ANALYSIS)
+    with db_manager.get_session() as session:
+        session.query(AnalysisCacheEntry).filter(
+            AnalysisCacheEntry.cache_key == cache.key(host_id, _logs('a'))
+        ).update({'created_at': datetime.utcnow() - timedelta(hours=25)})
+    
+    assert cache.get(host_id, _logs('a'), MODELS) is None
+    assert cache.get(host_id, _logs('b'), MODELS) is not None
+    
+    assert cache.evict() == 1
+    cache.put(host_id, _logs('d'), MODELS[0], ANALYSIS)
+    with db_manager.get_session() as session:
+        session.query(AnalysisCacheEntry).filter(
+            AnalysisCacheEntry.cache_key == cache.key(host_id, _logs('c'))
+        ).update({'last_used_at': datetime.utcnow() - timedelta(hours=1)})
+    
+    assert cache.evict() == 1
+    assert cache.get(host_id, _logs('c'), MODELS) is None
+    assert cache.get(host_id, _logs('b'), MODELS) is not None
+
+
+def test_analyzer_uses_cache_before_server(cache, host_id):
+    """Test a hit skips the OpenCode server and a miss stores the parsed analysis"""
+    analyzer = AIAnalyzer({'opencode': {'preferred_models': MODELS}}, cache=cache)
+    analyzer.server = Mock()
+    analyzer.server.is_running.return_value = True
+    analyzer.server.get_available_models.return_value = {'grok': ['grok-beta']}
+    analyzer.server.analyze_with_model.return_value = (
+        '{"health_score": 90, "severity": "INFO", "summary": "fine", "anomalies": []}'
+    )
+    host = {'id': host_id, 'name': 'web01', 'hostname': '10.0.0.1', 'tags': []}
+    
+    first = analyzer.analyze_logs(host, _logs('a'))
+    second = analyzer.analyze_logs(host, _logs('a'))
+    
+    assert first == second
+    assert analyzer.server.analyze_with_model.call_count == 1
+    
+    # Unparseable responses are not cached
+    analyzer.server.analyze_with_model.return_value = 'not json'
+    analyzer.analyze_logs(host, _logs('b'))
+    analyzer.analyze_logs(host, _logs('b'))
+    assert analyzer.server.analyze_with_model.call_count == 3
@@ -0,0 +1,143 @@
+"""
+Unit tests for chunked (map-reduce) AI analysis
+Last Updated: 10/16/2026 12:00:00 PM CDT
+"""
+
+import io
+import json
+from unittest.mock import Mock
+from dthostmon.core.ai_analyzer import AIAnalyzer
+from dthostmon.core.analysis_chunks import (
+    estimate_tokens, split_section, chunk_sections, merge_analyses
+)
+
+
+def test_estimate_tokens():
+    """Test token estimation by characters"""
+    assert estimate_tokens('') == 0
+    assert estimate_tokens('abcd') == 1
+    assert estimate_tokens('abcde') == 2
+
+
+def test_split_section_at_line_boundaries():
+    """Test oversized logs are split between lines and labelled by part"""
+    text = '\n'.join(f'line {i:03d} ' + 'x' * 20 for i in range(20))
+    assert split_section('/var/log/a', 'short', 100) == [('/var/log/a', 'short')]
+    
+    pieces = split_section('/var/log/a', text, 25)
+    assert len(pieces) > 1
+    assert pieces[0][0] == f'/var/log/a (part 1 of {len(pieces)})'
+    assert all(len(piece) <= 100 for _, piece in pieces)
+    assert '\n'.join(piece for _, piece in pieces) == text
+    
+    # A single line longer than a piece is cut
+    assert [piece for _, piece in split_section('x', 'y' * 10, 1)] == ['yyyy', 'yyyy', 'yy']
+    
+    # Lines are consumed as they come; one piece keeps the plain label
+    assert split_section('/var/log/a', iter(text.splitlines()), 25) == pieces
+    assert split_section('/var/log/a', iter(['short']), 100) == [('/var/log/a', 'short')]
+
+
+def test_chunk_sections_packs_in_order():
+    """Test sections are packed into chunks within the budget"""
+    sections = [('a', 'a' * 40), ('b', 'b' * 40), ('c', 'c' * 40)]
+    chunks = chunk_sections(sections, 20)
+    assert [[label for label, _ in chunk] for chunk in chunks] == [['a', 'b'], ['c']]
+    
+    # The chunk limit widens chunks instead of dropping logs
+    chunks = chunk_sections(sections, 5, max_chunks=2)
+    assert len(chunks) == 2
+    assert ''.join(text for chunk in chunks for _, text in chunk) == 'a' * 40 + 'b' * 40 + 'c' * 40
+
+
+def test_merge_analyses():
+    """Test partial analyses merge to the worst score and severity"""
+    partials = [
+        (1, {'health_score': 90, 'severity': 'INFO', 'summary': 'quiet',
+             'anomalies': [{'type': 'failed_login', 'description': 'root'}],
+             'recommendations': 'Check sshd'}),
+        (3, {'health_score': 40, 'severity': 'critical', 'summary': 'oom',
+             'anomalies': [{'type': 'failed_login', 'description': 'root'},
+                           {'type': 'oom', 'description': 'java killed'}],
+             'recommendations': ['Add memory', 'Check sshd']})
+    ]
+    merged = merge_analyses(partials, 3)
+    
+    assert merged['health_score'] == 40
+    assert merged['severity'] == 'CRITICAL'
+    assert len(merged['anomalies']) == 2
+    assert merged['summary'].splitlines() == [
+        'Part 1/3: quiet', 'Part 3/3: oom', '1 of 3 parts could not be analyzed.'
+    ]
+    assert merged['recommendations'] == 'Check sshd\nAdd memory\nCheck sshd'
+
+
+def _analyzer(**map_reduce):
+    analyzer = AIAnalyzer({
+        'opencode': {'preferred_models': ['grok/grok-beta']},
+        'map_reduce': {'enabled': True, **map_reduce}
+    })
+    analyzer.server = Mock()
+    analyzer.server.is_running.return_value = True
+    analyzer.server.get_available_models.return_value = {'grok': ['grok-beta']}
+    return analyzer
+
+
+def test_analyzer_splits_large_logs():
+    """Test logs over the token budget are analyzed per chunk and merged"""
+    analyzer = _analyzer(max_prompt_tokens=100, workers=2)
+    scores = iter([80, 30, 70])
+    analyzer.server.analyze_with_model.side_effect = lambda model, prompt, timeout: json.dumps(
+        {'health_score': next(scores), 'severity': 'WARN', 'summary': 'part', 'anomalies': []}
+    )
+    logs = [{'path': f'/var/log/{name}', 'content': name * 300} for name in 'abc']
+    
+    analysis = analyzer.analyze_logs({'name': 'web01', 'tags': []}, logs)
+    
+    assert analyzer.server.analyze_with_model.call_count == 3
+    prompts = [call.args[1] for call in analyzer.server.analyze_with_model.call_args_list]
+    assert all('of 3 of the host' in prompt for prompt in prompts)
+    assert analysis['health_score'] == 30
+    assert analysis['severity'] == 'WARN'
+    assert analyzer.prompt_version.endswith('-chunks100')
+
+
+class _LineOnlySpool(io.BytesIO):
+    """Spool file that fails when read in full"""
+    
+    def read(self, *args):
+        raise AssertionError('spool read in full')
+
+
+def test_analyzer_sections_read_spools_by_line():
+    """Test spilled logs are split into sections line by line from their spool file"""
+    analyzer = _analyzer(max_prompt_tokens=25)
+    text = '\n'.join(f'line {i:03d} ' + 'x' * 20 for i in range(20))
+    logs = [{'path': '/var/log/a', 'content': 'line 000', 'spool': _LineOnlySpool(text.encode() + b'\n')},
+            {'path': '/var/log/b', 'content': 'small'}]
+    
+    sections = analyzer._log_sections(logs)
+    
+    assert sections[0][0] == f'/var/log/a (part 1 of {len(sections) - 1})'
+    assert '\n'.join(piece for _, piece in sections[:-1]) == text
+    assert sections[-1] == ('/var/log/b', 'small')
+
+
+def test_analyzer_keeps_small_logs_in_one_prompt():
+    """Test logs within the budget use the single prompt and failed chunks fall back"""
+    analyzer = _analyzer(max_prompt_tokens=1000)
+    analyzer.server.analyze_with_model.return_value = '{"health_score": 90, "summary": "ok"}'
+    analysis = analyzer.analyze_logs({'name': 'web01', 'tags': []},
+                                     [{'path': '/var/log/a', 'content': 'a' * 100}])
+    assert analysis['health_score'] == 90
+    assert analyzer.server.analyze_with_model.call_count == 1
+    
+    analyzer.max_prompt_tokens = 10
+    analyzer.server.analyze_with_model.side_effect = RuntimeError('down')
+    logs = [{'path': '/var/log/a', 'content': 'a' * 100}]
+    analysis = analyzer.analyze_logs({'name': 'web01', 'tags': []}, logs)
+    assert analysis == analyzer._fallback_analysis({'name': 'web01'}, logs)
+    
+    # String values from environment substitution are parsed
+    assert not _analyzer(enabled='false').map_reduce
+    assert _analyzer(enabled='yes').map_reduce
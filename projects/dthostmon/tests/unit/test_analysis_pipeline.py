@@ -0,0 +1,132 @@
+"""
+Unit tests for the pipelined monitoring engine and per-model concurrency limits
+Last Updated: 10/16/2026 12:00:00 PM CDT
+"""
+
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+from dthostmon.core.ai_analyzer import AIAnalyzer
+from dthostmon.core.analysis_pipeline import AnalysisPipeline
+from dthostmon.core.ssh_client import SSHConnectionError
+
+
+def _hosts(count):
+    """Build host dictionaries as produced by run_monitoring_cycle"""
+    return [
+        {'id': i, 'name': f'host-{i}', 'hostname': f'10.0.0.{i}', 'port': 22, 'user': 'monitor'}
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def orchestrator():
+    """Orchestrator stand-in exposing the stage functions"""
+    orch = Mock()
+    orch._check_circuit.return_value = (True, False)
+    orch._collect_host_logs.side_effect = lambda host, retries: [{'path': '/var/log/syslog'}]
+    orch._analyze_host.return_value = {'health_score': 95, 'severity': 'INFO'}
+    orch._finalize_host.side_effect = lambda host, logs, analysis, start: {
+        'host': host, 'status': 'success', 'health_score': analysis['health_score']
+    }
+    orch._handle_host_failure.side_effect = lambda host, start, error, unexpected=False: {
+        'host': host, 'status': 'failed', 'error': str(error)
+    }
+    return orch
+
+
+def test_results_match_host_order(orchestrator):
+    """Test one result per host in input order, failures included"""
+    def collect(host, retries):
+        if host['id'] == 2:
+            raise SSHConnectionError('refused')
+        return [{'path': '/var/log/syslog'}]
+    orchestrator._collect_host_logs.side_effect = collect
+    
+    results = AnalysisPipeline(orchestrator, max_collections=3, max_analyses=2).run(_hosts(6))
+    
+    assert [r['host']['name'] for r in results] == [f'host-{i}' for i in range(6)]
+    assert [r['status'] for r in results] == ['success'] * 2 + ['failed'] + ['success'] * 3
+    assert orchestrator._analyze_host.call_count == 5
+
+
+def test_collectors_do_not_wait_for_analysis(orchestrator):
+    """Test collection finishes while slow analyses are still queued"""
+    collected = []
+    orchestrator._collect_host_logs.side_effect = lambda host, retries: collected.append(time.time()) or []
+    orchestrator._analyze_host.side_effect = lambda host, logs: time.sleep(0.05) or {'health_score': 90}
+    
+    start = time.time()
+    results = AnalysisPipeline(orchestrator, max_collections=2, max_analyses=1, queue_size=10).run(_hosts(6))
+    
+    assert all(r['status'] == 'success' for r in results)
+    assert max(collected) - start < 0.15
+    assert time.time() - start >= 0.3
+
+
+def test_full_queue_blocks_collectors(orchestrator):
+    """Test collected hosts beyond the queue size wait for an analysis worker"""
+    release = threading.Event()
+    state = {'collected': 0}
+    
+    def collect(host, retries):
+        state['collected'] += 1
+        return []
+    orchestrator._collect_host_logs.side_effect = collect
+    orchestrator._analyze_host.side_effect = lambda host, logs: release.wait() and {'health_score': 90}
+    
+    pipeline = AnalysisPipeline(orchestrator, max_collections=1, max_analyses=1, queue_size=2)
+    runner = threading.Thread(target=pipeline.run, args=(_hosts(10),))
+    runner.start()
+    time.sleep(0.1)
+    
+    # One host in analysis, two queued, one collector blocked on put
+    assert state['collected'] == 4
+    release.set()
+    runner.join(timeout=5)
+    assert state['collected'] == 10
+
+
+def test_analysis_errors_are_recorded(orchestrator):
+    """Test an analysis exception fails only its host"""
+    orchestrator._analyze_host.side_effect = lambda host, logs: (
+        1 / 0 if host['id'] == 1 else {'health_score': 95}
+    )
+    
+    results = AnalysisPipeline(orchestrator, max_analyses=2).run(_hosts(3))
+    
+    assert [r['status'] for r in results] == ['success', 'failed', 'success']
+    orchestrator._handle_host_failure.assert_called_once()
+    assert orchestrator._handle_host_failure.call_args.args[3] is True
+
+
+def test_model_concurrency_limits():
+    """Test model calls are limited per model, then per provider"""
+    analyzer = AIAnalyzer({
+        'opencode': {'preferred_models': ['ollama/llama3.1']},
+        'model_concurrency': {'ollama': 1, 'grok/grok-beta': 2}
+    })
+    analyzer.available_models = {'ollama': ['llama3.1']}
+    state = {'now': 0, 'peak': 0}
+    lock = threading.Lock()
+    
+    def analyze(model_id, prompt, timeout):
+        with lock:
+            state['now'] += 1
+            state['peak'] = max(state['peak'], state['now'])
+        time.sleep(0.02)
+        with lock:
+            state['now'] -= 1
+        return '{}'
+    analyzer.server = Mock()
+    analyzer.server.analyze_with_model.side_effect = analyze
+    
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(analyzer._run_models, ['prompt'] * 4))
+    
+    assert state['peak'] == 1
+    assert analyzer._model_slot('grok/grok-beta') is analyzer.model_limits['grok/grok-beta']
+    assert analyzer._model_slot('ollama/mistral') is analyzer.model_limits['ollama']
+    assert 'openai' not in analyzer.model_limits
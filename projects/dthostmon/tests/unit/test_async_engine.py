@@ -0,0 +1,119 @@
+"""
+Unit tests for the asyncio collection engine
+Last Updated: 10/16/2026 12:00:00 PM CDT
+"""
+
+import threading
+import time
+import pytest
+from unittest.mock import Mock, patch, AsyncMock
+from dthostmon.core.async_engine import AsyncCollectionEngine
+from dthostmon.core.ssh_client import SSHConnectionError
+
+
+def _hosts(count):
+    """Build host dictionaries as produced by run_monitoring_cycle"""
+    return [
+        {'id': i, 'name': f'host-{i}', 'hostname': f'10.0.0.{i}', 'port': 22, 'user': 'monitor'}
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def orchestrator():
+    """Orchestrator stand-in exposing the stage functions"""
+    orch = Mock()
+    orch._check_circuit.return_value = (True, False)
+    orch._collect_host_logs.side_effect = lambda host, retries: [{'path': '/var/log/syslog'}]
+    orch._analyze_host.return_value = {'health_score': 95, 'severity': 'INFO'}
+    orch._finalize_host.side_effect = lambda host, logs, analysis, start: {
+        'host': host, 'status': 'success', 'health_score': analysis['health_score']
+    }
+    orch._handle_host_failure.side_effect = lambda host, start, error, unexpected=False: {
+        'host': host, 'status': 'failed', 'error': str(error)
+    }
+    return orch
+
+
+def test_results_match_host_order(orchestrator):
+    """Test engine returns one result per host in input order"""
+    engine = AsyncCollectionEngine(orchestrator, max_collections=4, max_analyses=2)
+    
+    results = engine.run(_hosts(6))
+    
+    assert [r['host']['name'] for r in results] == [f'host-{i}' for i in range(6)]
+    assert all(r['status'] == 'success' for r in results)
+    assert orchestrator._collect_host_logs.call_count == 6
+
+
+def test_collections_run_concurrently_and_respect_limit(orchestrator):
+    """Test collection stage keeps many hosts in flight, bounded by the semaphore"""
+    state = {'now': 0, 'peak': 0}
+    lock = threading.Lock()
+    
+    def slow_collect(host, retries):
+        with lock:
+            state['now'] += 1
+            state['peak'] = max(state['peak'], state['now'])
+        time.sleep(0.05)
+        with lock:
+            state['now'] -= 1
+        return []
+    
+    orchestrator._collect_host_logs.side_effect = slow_collect
+    engine = AsyncCollectionEngine(orchestrator, max_collections=8)
+    
+    engine.run(_hosts(20))
+    
+    assert 1 < state['peak'] <= 8
+
+
+@patch('dthostmon.core.async_engine.asyncio.sleep', new_callable=AsyncMock)
+def test_connect_retry_uses_async_backoff(mock_sleep, orchestrator):
+    """Test failed connects back off with asyncio.sleep and then record a failure"""
+    orchestrator._collect_host_logs.side_effect = SSHConnectionError("unreachable")
+    engine = AsyncCollectionEngine(orchestrator, connect_retries=3)
+    
+    results = engine.run(_hosts(1))
+    
+    assert results[0]['status'] == 'failed'
+    assert orchestrator._collect_host_logs.call_count == 3
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [1, 2]
+    orchestrator._analyze_host.assert_not_called()
+
+
+def test_unexpected_error_is_recorded(orchestrator):
+    """Test analysis errors are persisted as unexpected failures"""
+    orchestrator._analyze_host.side_effect = ValueError("bad response")
+    engine = AsyncCollectionEngine(orchestrator)
+    
+    results = engine.run(_hosts(1))
+    
+    assert results[0]['status'] == 'failed'
+    assert orchestrator._handle_host_failure.call_args.args[3] is True
+
+
+def test_open_circuit_skips_collection(orchestrator):
+    """Test hosts with an open circuit are recorded as skipped without connecting"""
+    orchestrator._check_circuit.side_effect = lambda host: (host['id'] != 1, False)
+    orchestrator._skip_host.side_effect = lambda host: {'host': host, 'status': 'skipped'}
+    engine = AsyncCollectionEngine(orchestrator)
+    
+    results = engine.run(_hosts(3))
+    
+    assert [r['status'] for r in results] == ['success', 'skipped', 'success']
+    assert orchestrator._collect_host_logs.call_count == 2
+
+
+@patch('dthostmon.core.async_engine.asyncio.sleep', new_callable=AsyncMock)
+def test_half_open_probe_gets_single_attempt(mock_sleep, orchestrator):
+    """Test a probing host is tried once instead of with full backoff"""
+    orchestrator._check_circuit.return_value = (True, True)
+    orchestrator._collect_host_logs.side_effect = SSHConnectionError("unreachable")
+    engine = AsyncCollectionEngine(orchestrator, connect_retries=3)
+    
+    results = engine.run(_hosts(1))
+    
+    assert results[0]['status'] == 'failed'
+    assert orchestrator._collect_host_logs.call_count == 1
+    mock_sleep.assert_not_called()
@@ -0,0 +1,71 @@
+"""
+Unit tests for the per-cycle baseline cache
+Last Updated: 10/16/2026 12:00:00 PM CDT
+"""
+
+import pytest
+from sqlalchemy import event
+from dthostmon.core.baseline_cache import BaselineCache
+from dthostmon.models.database import Host, Baseline
+
+
+@pytest.fixture
+def host_ids(db_manager):
+    with db_manager.get_session() as session:
+        hosts = [Host(name=f'web0{i}', hostname=f'10.0.0.{i}', user='monitor') for i in (1, 2)]
+        session.add_all(hosts)
+        session.flush()
+        session.add_all([
+            Baseline(host_id=hosts[0].id, log_file_path='/var/log/syslog', content_hash='a', is_active=False),
+            Baseline(host_id=hosts[0].id, log_file_path='/var/log/syslog', content_hash='b', is_active=True),
+            Baseline(host_id=hosts[1].id, log_file_path='/var/log/auth.log', content_hash='c', is_active=True)
+        ])
+        return [h.id for h in hosts]
+
+
+def _count_queries(db_manager):
+    queries = []
+    event.listen(db_manager.engine, 'before_cursor_execute',
+                 lambda conn, cursor, statement, *args: queries.append(statement))
+    return queries
+
+
+def test_load_serves_lookups_from_memory(db_manager, host_ids):
+    """Test one query loads every host and lookups do not touch the database"""
+    cache = BaselineCache(db_manager)
+    queries = _count_queries(db_manager)
+    
+    cache.load(host_ids)
+    assert len(queries) == 1
+    
+    assert cache.get(host_ids[0]) == {'/var/log/syslog': {'hash': 'b', 'line_count': None}}
+    assert cache.get(host_ids[1])['/var/log/auth.log']['hash'] == 'c'
+    assert len(queries) == 1
+
+
+def test_get_loads_unknown_host_on_demand(db_manager, host_ids):
+    """Test hosts outside the loaded cycle are read once and then cached"""
+    cache = BaselineCache(db_manager)
+    cache.load(host_ids[:1])
+    queries = _count_queries(db_manager)
+    
+    assert cache.get(host_ids[1])['/var/log/auth.log']['hash'] == 'c'
+    cache.get(host_ids[1])
+    assert len(queries) == 1
+
+
+def test_changed_and_update(db_manager, host_ids):
+    """Test only logs with a new hash need a baseline and updates are visible"""
+    cache = BaselineCache(db_manager)
+    cache.load(host_ids)
+    logs = [
+        {'path': '/var/log/syslog', 'content': 'x', 'hash': 'b', 'line_count': 1},
+        {'path': '/var/log/kern.log', 'content': 'y', 'hash': 'k', 'line_count': 1},
+        {'path': '/var/log/empty.log', 'content': '', 'hash': 'e', 'line_count': 0}
+    ]
+    
+    changed = cache.changed(host_ids[0], logs)
+    assert [log['path'] for log in changed] == ['/var/log/kern.log']
+    
+    cache.update(host_ids[0], changed)
+    assert cache.changed(host_ids[0], logs) == []
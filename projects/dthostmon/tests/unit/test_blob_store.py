@@ -0,0 +1,70 @@
+"""
+Unit tests for content-addressed log blob storage
+Last Updated: 10/16/2026 12:00:00 PM CDT
+"""
+
+import pytest
+from dthostmon.models.blob_store import (content_digest, store_blobs, delete_runs,
+                                         collect_garbage)
+from dthostmon.models.database import Host, MonitoringRun, LogEntry, LogBlob, DetectedChange
+
+
+def _add_run(session, host_id, contents):
+    run = MonitoringRun(host_id=host_id, status='success')
+    session.add(run)
+    session.flush()
+    for path, blob_hash in zip(contents, store_blobs(session, contents.values())):
+        session.add(LogEntry(monitoring_run_id=run.id, log_file_path=path, blob_hash=blob_hash))
+    session.flush()
+    return run.id
+
+
+@pytest.fixture
+def host_id(db_manager):
+    with db_manager.get_session() as session:
+        host = Host(name='web01', hostname='10.0.0.1', user='monitor')
+        session.add(host)
+        session.flush()
+        return host.id
+
+
+def test_store_blobs_deduplicates(db_manager):
+    """Test identical content is stored once and reference counted"""
+    with db_manager.get_session() as session:
+        hashes = store_blobs(session, ['a\n', 'b\n', 'a\n'])
+        assert hashes == [content_digest('a\n'), content_digest('b\n'), content_digest('a\n')]
+        store_blobs(session, ['a\n'])
+    
+    with db_manager.get_session() as session:
+        counts = {b.content: b.ref_count for b in session.query(LogBlob).all()}
+        assert counts == {'a\n': 3, 'b\n': 1}
+
+
+def test_log_entry_text(db_manager, host_id):
+    """Test entry text comes from the blob, or the legacy inline column"""
+    with db_manager.get_session() as session:
+        run_id = _add_run(session, host_id, {'/var/log/syslog': 'blob text\n'})
+        session.add(LogEntry(monitoring_run_id=run_id, log_file_path='/var/log/old.log',
+                             content='inline text\n'))
+    
+    with db_manager.get_session() as session:
+        texts = {e.log_file_path: e.text for e in session.query(LogEntry).all()}
+        assert texts == {'/var/log/syslog': 'blob text\n', '/var/log/old.log': 'inline text\n'}
+
+
+def test_delete_runs_and_collect_garbage(db_manager, host_id):
+    """Test pruning runs releases blobs and GC removes only unreferenced ones"""
+    with db_manager.get_session() as session:
+        old_run = _add_run(session, host_id, {'/var/log/syslog': 'shared\n', '/var/log/auth.log': 'old\n'})
+        _add_run(session, host_id, {'/var/log/syslog': 'shared\n'})
+        session.add(DetectedChange(monitoring_run_id=old_run, change_type='new_log'))
+    
+    with db_manager.get_session() as session:
+        assert delete_runs(session, [old_run]) == 1
+        assert collect_garbage(session) == 1
+    
+    with db_manager.get_session() as session:
+        assert session.query(MonitoringRun).count() == 1
+        assert session.query(DetectedChange).count() == 0
+        blobs = {b.content: b.ref_count for b in session.query(LogBlob).all()}
+        assert blobs == {'shared\n': 1}
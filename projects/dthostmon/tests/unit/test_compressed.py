@@ -0,0 +1,59 @@
+"""
+Unit tests for the compressed text column type
+Last Updated: 10/16/2026 12:00:00 PM CDT
+"""
+
+import zlib
+import pytest
+from sqlalchemy import text
+from dthostmon.models import compressed
+from dthostmon.models.compressed import (CompressionError, compress_text, decompress_text,
+                                         RAW, ZLIB, ZSTD)
+from dthostmon.models.database import Host, MonitoringRun, LogBlob
+
+
+def test_small_values_stored_raw():
+    """Test values below the threshold are only prefixed with the raw marker"""
+    assert compress_text('short') == RAW + b'short'
+    assert decompress_text(RAW + b'short') == 'short'
+
+
+def test_round_trip_large_value():
+    """Test large values are compressed and decoded back"""
+    value = 'Oct 16 12:00:00 web01 sshd[1]: Accepted publickey for root\n' * 200
+    stored = compress_text(value)
+    assert stored[:1] in (ZLIB, ZSTD)
+    assert len(stored) < len(value) // 10
+    assert decompress_text(stored) == value
+
+
+def test_zlib_fallback(monkeypatch):
+    """Test zlib is used without zstandard and older values stay readable"""
+    monkeypatch.setattr(compressed, 'zstandard', None)
+    value = 'line\n' * 1000
+    stored = compress_text(value)
+    assert stored[:1] == ZLIB
+    assert decompress_text(stored) == value
+    assert decompress_text(ZLIB + zlib.compress(b'legacy')) == 'legacy'
+    
+    with pytest.raises(CompressionError):
+        decompress_text(ZSTD + b'\x28\xb5\x2f\xfd')
+    with pytest.raises(CompressionError):
+        decompress_text(b'\x09data')
+
+
+def test_columns_compressed_in_database(db_manager):
+    """Test ORM reads and writes are transparent while the stored bytes are compressed"""
+    summary = 'All services healthy. ' * 100
+    with db_manager.get_session() as session:
+        host = Host(name='web01', hostname='10.0.0.1', user='monitor')
+        session.add(host)
+        session.flush()
+        session.add(MonitoringRun(host_id=host.id, status='success', ai_summary=summary))
+        session.add(LogBlob(hash='h', content='x' * 5000, ref_count=1))
+    
+    with db_manager.get_session() as session:
+        assert session.query(MonitoringRun).one().ai_summary == summary
+        assert session.query(LogBlob).one().content == 'x' * 5000
+        raw = session.execute(text("SELECT ai_summary FROM monitoring_runs")).scalar_one()
+        assert raw[:1] in (ZLIB, ZSTD) and len(raw) < len(summary)
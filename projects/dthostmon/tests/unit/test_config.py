@@ -206,3 +206,52 @@ def test_sites_property_returns_unique_list(test_config_file, test_env_file):
     assert len(sites) == 2
     assert 's01-chicago' in sites
     assert 's02-austin' in sites
+
+
+def _write_config_with_logs(tmp_path, logs_yaml):
+    """Write a minimal configuration whose only host uses the given logs block"""
+    config_file = tmp_path / 'dthostmon.yaml'
+    config_file.write_text(f"""
+global:
+  log_level: INFO
+database:
+  host: localhost
+email:
+  smtp_host: localhost
+ssh:
+  key_path: /tmp/key
+hosts:
+  - name: host1
+    hostname: 10.0.0.1
+    user: monitoring
+    logs:
+{logs_yaml}
+""")
+    return config_file
+
+
+def test_config_normalizes_log_policies(tmp_path, test_env_file):
+    """Test per-log policies are validated and plain paths stay strings"""
+    config_file = _write_config_with_logs(tmp_path, """      - /var/log/auth.log
+      - path: /var/log/syslog
+        tail_lines: 5000
+        max_bytes: 2MB
+        since: 24h
+      - path: /var/log/kern.log""")
+    
+    config = Config(config_path=config_file, env_file=test_env_file)
+    
+    assert config.hosts[0]['logs'] == [
+        '/var/log/auth.log',
+        {'path': '/var/log/syslog', 'tail_lines': 5000, 'max_bytes': 2 * 1024 * 1024, 'since': '24h'},
+        '/var/log/kern.log'
+    ]
+
+
+def test_config_rejects_invalid_log_policy(tmp_path, test_env_file):
+    """Test invalid log policies fail configuration validation"""
+    config_file = _write_config_with_logs(tmp_path, """      - path: /var/log/syslog
+        max_bytes: lots""")
+    
+    with pytest.raises(ConfigurationError, match="host1"):
+        Config(config_path=config_file, env_file=test_env_file)
@@ -1,10 +1,12 @@
 """
 Unit tests for database models
-Last Updated: 11/14/2025 12:00:00 PM CDT
+Last Updated: 10/16/2026 12:00:00 PM CDT
 """
 
 import pytest
 from datetime import datetime
+from sqlalchemy import select, text
+from sqlalchemy.dialects import sqlite
 from dthostmon.models.database import Host, MonitoringRun, LogEntry, Baseline, DetectedChange
 
 
@@ -130,3 +132,17 @@ def test_create_detected_change(db_manager):
 def test_database_health_check(db_manager):
     """Test database health check"""
     assert db_manager.health_check() is True
+
+
+@pytest.mark.parametrize('statement,index_name', [
+    (select(MonitoringRun.id).where(MonitoringRun.host_id == 1)
+     .order_by(MonitoringRun.run_date.desc()).limit(1), 'ix_monitoring_runs_host_run_date'),
+    (select(DetectedChange.id).where(DetectedChange.monitoring_run_id == 1)
+     .order_by(DetectedChange.detected_at.desc()), 'ix_detected_changes_run_detected_at'),
+])
+def test_composite_indexes_used(db_manager, statement, index_name):
+    """Test hot queries can be answered from the composite indexes (full plans: tests/integration)"""
+    sql = str(statement.compile(dialect=sqlite.dialect(), compile_kwargs={'literal_binds': True}))
+    with db_manager.get_session() as session:
+        plan = ' '.join(row[-1] for row in session.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+    assert index_name in plan
@@ -0,0 +1,97 @@
+"""
+Unit tests for the health time series
+Last Updated: 10/16/2026 12:00:00 PM CDT
+"""
+
+import pytest
+from datetime import datetime
+from dthostmon.models.database import Host, HealthRollup, MonitoringRun
+from dthostmon.models.health_series import load_series, record_run, summarize
+
+NOW = datetime(2026, 10, 16, 12, 30)
+
+
+@pytest.fixture
+def host_id(db_manager):
+    with db_manager.get_session() as session:
+        host = Host(name='web01', hostname='10.0.0.1', user='monitor')
+        session.add(host)
+        session.flush()
+        return host.id
+
+
+def _run(host_id, run_date, health_score, status='success'):
+    return {'host_id': host_id, 'run_date': run_date, 'status': status, 'health_score': health_score,
+            'anomalies_detected': 1, 'changes_detected': 2}
+
+
+def test_record_run_increments_hour_and_day(db_manager, host_id):
+    """Test runs are added to their hourly and daily rollups"""
+    with db_manager.get_session() as session:
+        record_run(session, _run(host_id, datetime(2026, 10, 15, 9, 5), 90))
+        record_run(session, _run(host_id, datetime(2026, 10, 15, 9, 50), None, status='failed'))
+        record_run(session, _run(host_id, datetime(2026, 10, 15, 10, 5), 70))
+        record_run(session, _run(host_id, datetime(2026, 10, 15, 10, 6), None, status='skipped'))
+    
+    with db_manager.get_session() as session:
+        hours = {r.period_start.hour: r for r in session.query(HealthRollup).filter_by(period='hour')}
+        assert (hours[9].run_count, hours[9].failed_count, hours[9].health_avg) == (2, 1, 90)
+        assert (hours[10].run_count, hours[10].health_min, hours[10].health_max) == (1, 70, 70)
+        
+        day = session.query(HealthRollup).filter_by(period='day').one()
+        assert (day.run_count, day.health_min, day.health_max) == (3, 70, 90)
+        assert (day.anomalies_total, day.changes_total) == (3, 6)
+
+
+def test_load_series_falls_back_to_raw_runs(db_manager, host_id):
+    """Test rolled-up hours come from rollups and later hours from raw runs"""
+    with db_manager.get_session() as session:
+        # 09:00 is rolled up (the raw run below it must not be counted twice)
+        session.add(HealthRollup(host_id=host_id, period='hour', period_start=datetime(2026, 10, 16, 9),
+                                 run_count=4, failed_count=1, health_count=3, health_sum=240,
+                                 health_min=60, health_max=90))
+        for run_date, score in ((datetime(2026, 10, 16, 9, 10), 10), (datetime(2026, 10, 16, 11, 5), 50),
+                                (datetime(2026, 10, 16, 12, 10), 100)):
+            session.add(MonitoringRun(host_id=host_id, run_date=run_date, status='success',
+                                      health_score=score))
+    
+    with db_manager.get_session() as session:
+        points = load_series(session, [host_id], datetime(2026, 10, 16, 8), 'hour', now=NOW)[host_id]
+    
+    assert [p['period_start'].hour for p in points] == [9, 11, 12]
+    assert (points[0]['run_count'], points[0]['health_avg']) == (4, 80)
+    assert points[1]['health_avg'] == 50
+    
+    total = summarize(points)
+    assert (total['run_count'], total['failed_count'], total['health_min'], total['health_max']) == (6, 1, 50, 100)
+    assert total['health_avg'] == pytest.approx(390 / 5)
+
+
+def test_load_series_without_rollups(db_manager, host_id):
+    """Test hosts without rollups are aggregated from raw runs per day"""
+    with db_manager.get_session() as session:
+        for day in (14, 15, 15):
+            session.add(MonitoringRun(host_id=host_id, run_date=datetime(2026, 10, day, 6), status='success',
+                                      health_score=80))
+    
+    with db_manager.get_session() as session:
+        points = load_series(session, [host_id], datetime(2026, 10, 1), 'day', now=NOW)[host_id]
+    
+    assert [(p['period_start'].day, p['run_count']) for p in points] == [(14, 1), (15, 2)]
+
+
+def test_load_series_reads_raw_runs_before_first_rollup(db_manager, host_id):
+    """Test runs recorded before the first rollup of a host still count"""
+    with db_manager.get_session() as session:
+        for day in (12, 13, 14):
+            session.add(MonitoringRun(host_id=host_id, run_date=datetime(2026, 10, day, 6), status='success',
+                                      health_score=day))
+        record_run(session, _run(host_id, datetime(2026, 10, 15, 9), 90))
+        session.add(MonitoringRun(host_id=host_id, run_date=datetime(2026, 10, 15, 9), status='success',
+                                  health_score=90))
+    
+    with db_manager.get_session() as session:
+        points = load_series(session, [host_id], datetime(2026, 10, 1), 'day', now=NOW)[host_id]
+    
+    assert [(p['period_start'].day, p['run_count']) for p in points] == [(12, 1), (13, 1), (14, 1), (15, 1)]
+    assert points[0]['health_avg'] == 12
@@ -0,0 +1,110 @@
+"""
+Unit tests for per-host health tracking (circuit breaker, adaptive timeouts)
+Last Updated: 10/16/2026 12:00:00 PM CDT
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from dthostmon.core.host_health import HostHealthTracker
+from dthostmon.core.orchestrator import MonitoringOrchestrator
+from dthostmon.models.database import Host, MonitoringRun
+
+
+class _Clock:
+    """Manually advanced clock"""
+    
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+def test_circuit_opens_after_threshold(clock):
+    """Test consecutive failures open the circuit and skip the host"""
+    tracker = HostHealthTracker(failure_threshold=3, cooldown=300, clock=clock)
+    
+    for _ in range(2):
+        tracker.record_failure('db01')
+    assert tracker.allow('db01') == (True, False)
+    
+    tracker.record_failure('db01')
+    assert tracker.allow('db01') == (False, False)
+    assert tracker.status('db01')['circuit_open'] is True
+
+
+def test_half_open_probe_and_backoff(clock):
+    """Test a probe after the cool-down; failed probes double the cool-down"""
+    tracker = HostHealthTracker(failure_threshold=1, cooldown=100, max_cooldown=250, clock=clock)
+    tracker.record_failure('db01')
+    
+    clock.now += 100
+    assert tracker.allow('db01') == (True, True)
+    assert tracker.allow('db01') == (False, False)  # Only one probe at a time
+    
+    tracker.record_failure('db01')
+    assert tracker.status('db01')['retry_in'] == 200
+    
+    clock.now += 200
+    assert tracker.allow('db01') == (True, True)
+    tracker.record_failure('db01')
+    assert tracker.status('db01')['retry_in'] == 250  # Capped by max_cooldown
+    
+    clock.now += 250
+    assert tracker.allow('db01') == (True, True)
+    tracker.record_success('db01', latency=0.1)
+    assert tracker.allow('db01') == (True, False)
+    assert tracker.status('db01')['consecutive_failures'] == 0
+
+
+def test_adaptive_connect_timeout():
+    """Test connect timeout follows the latency EWMA within bounds"""
+    tracker = HostHealthTracker(min_timeout=2, max_timeout=10, timeout_multiplier=4,
+                                latency_alpha=0.5)
+    
+    assert tracker.connect_timeout('web01') == 10  # Nothing observed yet
+    
+    tracker.record_success('web01', latency=0.2)
+    assert tracker.connect_timeout('web01') == 2  # Floor
+    
+    tracker.record_success('web01', latency=1.8)
+    assert tracker.connect_timeout('web01') == pytest.approx(4.0)  # EWMA 1.0 x 4
+    
+    tracker.record_success('web01', latency=30)
+    assert tracker.connect_timeout('web01') == 10  # Ceiling
+    
+    tracker.record_success('web01')  # Pooled reuse does not move the EWMA
+    assert tracker.status('web01')['latency_ewma'] == pytest.approx(15.5)
+
+
+def test_seed_from_history(db_manager):
+    """Test circuit state is restored from failed runs since the last success"""
+    now = datetime.utcnow()
+    with db_manager.get_session() as session:
+        down = Host(name='down01', hostname='10.0.0.1', user='monitor')
+        flaky = Host(name='flaky01', hostname='10.0.0.2', user='monitor')
+        session.add_all([down, flaky])
+        session.flush()
+        statuses = {down.id: ['success', 'failed', 'failed', 'skipped', 'failed'],
+                    flaky.id: ['failed', 'failed', 'failed', 'success']}
+        for host_id, history in statuses.items():
+            for minutes_ago, status in zip(range(len(history), 0, -1), history):
+                session.add(MonitoringRun(host_id=host_id, status=status,
+                                          run_date=now - timedelta(minutes=minutes_ago)))
+        host_data = [{'id': down.id, 'name': 'down01'}, {'id': flaky.id, 'name': 'flaky01'}]
+    
+    orchestrator = MonitoringOrchestrator.__new__(MonitoringOrchestrator)
+    orchestrator.db_manager = db_manager
+    orchestrator.health_tracker = HostHealthTracker(failure_threshold=3, cooldown=600)
+    
+    orchestrator._seed_health_tracker(host_data)
+    
+    assert orchestrator.health_tracker.status('down01')['consecutive_failures'] == 3
+    assert orchestrator.health_tracker.allow('down01') == (False, False)
+    assert orchestrator.health_tracker.status('flaky01')['consecutive_failures'] == 0
+    assert orchestrator.health_tracker.allow('flaky01') == (True, False)
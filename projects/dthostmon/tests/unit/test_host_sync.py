@@ -0,0 +1,65 @@
+"""
+Unit tests for the incremental host sync
+Last Updated: 10/16/2026 12:00:00 PM CDT
+"""
+
+from sqlalchemy import event
+from dthostmon.core.host_sync import host_fingerprint, sync_hosts
+from dthostmon.models.database import Host
+
+
+def _config_host(name, **overrides):
+    host = {'name': name, 'hostname': f'{name}.example.com', 'user': 'monitor',
+            'tags': ['web'], 'logs': ['/var/log/syslog']}
+    host.update(overrides)
+    return host
+
+
+def test_fingerprint_tracks_synced_columns():
+    """Test the fingerprint changes with synced settings only"""
+    base = host_fingerprint(_config_host('web01'))
+    assert host_fingerprint(_config_host('web01', port=22)) == base
+    assert host_fingerprint(_config_host('web01', port=2222)) != base
+    assert host_fingerprint(_config_host('web01', logs=['/var/log/auth.log'])) != base
+
+
+def test_sync_inserts_then_skips_unchanged(db_manager):
+    """Test the first sync inserts hosts and a second one writes nothing"""
+    config_hosts = [_config_host('web01'), _config_host('web02', port=2222)]
+    with db_manager.get_session() as session:
+        assert sync_hosts(session, config_hosts) == {'unchanged': 0, 'upserted': 2, 'disabled': 0}
+    
+    statements = []
+    event.listen(db_manager.engine, 'before_cursor_execute',
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    with db_manager.get_session() as session:
+        assert sync_hosts(session, config_hosts) == {'unchanged': 2, 'upserted': 0, 'disabled': 0}
+    
+    assert not [s for s in statements if s.lstrip().upper().startswith('INSERT')]
+    with db_manager.get_session() as session:
+        assert session.query(Host).filter(Host.name == 'web02').one().port == 2222
+
+
+def test_sync_updates_changed_and_disables_removed(db_manager):
+    """Test changed hosts are upserted and config hosts no longer configured are disabled"""
+    with db_manager.get_session() as session:
+        sync_hosts(session, [_config_host('web01'), _config_host('web02')])
+        session.add(Host(name='registered', hostname='10.0.0.9', user='monitor', enabled=True))
+    with db_manager.get_session() as session:
+        created_at = session.query(Host).filter(Host.name == 'web01').one().created_at
+    
+    with db_manager.get_session() as session:
+        stats = sync_hosts(session, [_config_host('web01', hostname='10.0.0.1')])
+    
+    assert stats == {'unchanged': 0, 'upserted': 1, 'disabled': 1}
+    with db_manager.get_session() as session:
+        hosts = {h.name: h for h in session.query(Host).all()}
+        assert hosts['web01'].hostname == '10.0.0.1'
+        assert hosts['web01'].created_at == created_at
+        assert not hosts['web02'].enabled
+        assert hosts['registered'].enabled  # Not config-managed
+    
+    # Re-adding a disabled host enables it again
+    with db_manager.get_session() as session:
+        sync_hosts(session, [_config_host('web01', hostname='10.0.0.1'), _config_host('web02')])
+        assert session.query(Host).filter(Host.name == 'web02').one().enabled
@@ -0,0 +1,121 @@
+"""
+Unit tests for the local log pre-classifier
+Last Updated: 10/16/2026 12:00:00 PM CDT
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+from dthostmon.core.baseline_cache import BaselineCache
+from dthostmon.core.log_classifier import LogClassifier
+from dthostmon.core.orchestrator import MonitoringOrchestrator
+from dthostmon.models.database import Host, KnownLogTemplate
+
+QUIET = "\n".join(f"Oct 16 10:{i:02d}:00 web01 CRON[{1000 + i}]: (root) CMD (run-parts /etc/cron.hourly)"
+                  for i in range(20))
+
+
+@pytest.fixture
+def host_id(db_manager):
+    with db_manager.get_session() as session:
+        host = Host(name='web01', hostname='10.0.0.1', user='monitor')
+        session.add(host)
+        session.flush()
+        return host.id
+
+
+@pytest.fixture
+def classifier(db_manager):
+    return LogClassifier(db_manager)
+
+
+def test_scan_counts_lines_per_rule(classifier):
+    """Test every rule counts a line once and only flagged lines are sampled"""
+    text = "\n".join([
+        "sshd[1]: Failed password for root from 10.0.0.5 port 22 ssh2",
+        "kernel: Out of memory: Killed process 4242 (java) error error",
+        "app: warning: disk almost full",
+        "app: all good",
+    ])
+    result = classifier.scan(text)
+    
+    assert result['matches'] == {'failed_login': 1, 'oom': 1, 'error': 1, 'warning': 1}
+    assert result['flagged'] == 2
+    assert result['lines'][1].startswith('kernel: Out of memory')
+    
+    # A higher threshold leaves only the OOM line
+    critical = LogClassifier(None, min_severity='critical')
+    assert critical.scan(text)['flagged'] == 1
+
+
+def test_new_templates_until_known(classifier, host_id):
+    """Test templates stay new until remembered and later runs with the same shapes are clean"""
+    logs = [{'path': '/var/log/syslog', 'content': QUIET}]
+    first = classifier.classify(host_id, logs)
+    assert first['suspicious']
+    assert first['new_templates'] == 1
+    assert classifier.classify(host_id, logs)['new_templates'] == 1
+    classifier.remember(host_id, first['templates'])
+    
+    # Same template, different variable fields
+    later = QUIET.replace('10:', '11:').replace('CRON[1', 'CRON[2')
+    second = classifier.classify(host_id, [{'path': '/var/log/syslog', 'content': later}])
+    assert not second['suspicious']
+    assert second['new_templates'] == 0
+    
+    third = classifier.classify(host_id, [{'path': '/var/log/syslog',
+                                           'content': later + "\nsystemd[1]: Started Daily apt upgrade."}])
+    assert third['suspicious']
+    assert third['new_lines'] == ["systemd[1]: Started Daily apt upgrade."]
+    assert len(third['templates']) == 2
+
+
+def test_prune_forgets_old_templates(db_manager, classifier, host_id):
+    """Test templates not seen within the TTL are deleted"""
+    verdict = classifier.classify(host_id, [{'path': '/var/log/syslog', 'content': QUIET}])
+    classifier.remember(host_id, verdict['templates'])
+    assert classifier.prune() == 0
+    assert classifier.prune(datetime.utcnow() + timedelta(days=31)) == 1
+    with db_manager.get_session() as session:
+        assert session.query(KnownLogTemplate).count() == 0
+
+
+def test_deterministic_analysis(classifier, host_id):
+    """Test clean hosts get an INFO analysis with minor matches noted"""
+    classifier.new_templates = False
+    logs = [{'path': '/var/log/syslog', 'content': QUIET + "\napp: warning: cache cold"}]
+    verdict = classifier.classify(host_id, logs)
+    assert not verdict['suspicious']
+    
+    analysis = classifier.analysis({'name': 'web01'}, logs, verdict)
+    assert analysis['severity'] == 'INFO'
+    assert analysis['health_score'] == 99
+    assert analysis['anomalies'] == []
+    assert '1 lower-severity matches (warning)' in analysis['summary']
+
+
+def test_orchestrator_sends_only_suspicious_hosts_to_ai(db_manager, classifier, host_id):
+    """Test the analysis stage calls the AI analyzer only for flagged hosts"""
+    orchestrator = MonitoringOrchestrator.__new__(MonitoringOrchestrator)
+    orchestrator.log_classifier = classifier
+    orchestrator._pending_templates = {}
+    orchestrator.baseline_cache = BaselineCache(db_manager)
+    orchestrator.ai_analyzer = Mock()
+    orchestrator.ai_analyzer.analyze_logs.return_value = {'health_score': 60, 'severity': 'WARN'}
+    host = {'id': host_id, 'name': 'web01'}
+    logs = [{'path': '/var/log/syslog', 'content': QUIET}]
+    
+    # New templates are only remembered once the analysis has been saved
+    assert orchestrator._analyze_host(host, logs)['health_score'] == 60
+    assert orchestrator._analyze_host(host, logs)['health_score'] == 60
+    assert orchestrator.ai_analyzer.analyze_logs.call_count == 2
+    with db_manager.get_session() as session:
+        assert session.query(KnownLogTemplate).count() == 0
+    
+    classifier.remember(host_id, orchestrator._pending_templates.pop(host_id))
+    assert orchestrator._analyze_host(host, logs)['severity'] == 'INFO'
+    assert orchestrator.ai_analyzer.analyze_logs.call_count == 2
+    
+    logs[0]['content'] += "\nsshd[9]: error: kex_exchange_identification: Connection closed"
+    orchestrator._analyze_host(host, logs)
+    assert orchestrator.ai_analyzer.analyze_logs.call_count == 3
@@ -0,0 +1,77 @@
+"""
+Unit tests for delta-encoded log history
+Last Updated: 10/16/2026 12:00:00 PM CDT
+"""
+
+import pytest
+from dthostmon.models.blob_store import content_digest, delete_runs, store_blobs
+from dthostmon.models.log_history import (load_delta_bases, plan_snapshot, reconstruct_entries,
+                                          reconstruct_entry)
+from dthostmon.models.database import Host, MonitoringRun, LogEntry
+
+
+def _store(session, host_id, text, path='/var/log/syslog'):
+    """Store one snapshot the way the orchestrator does in delta mode"""
+    base = load_delta_bases(session, host_id, [path]).get(path)
+    plan = plan_snapshot(text, base, keyframe_interval=10)
+    plan['blob_hash'] = store_blobs(session, [plan.pop('stored')])[0]
+    run = MonitoringRun(host_id=host_id, status='success')
+    session.add(run)
+    session.flush()
+    entry = LogEntry(monitoring_run_id=run.id, log_file_path=path, **plan)
+    session.add(entry)
+    session.flush()
+    return run.id, entry.id
+
+
+@pytest.fixture
+def host_id(db_manager):
+    with db_manager.get_session() as session:
+        host = Host(name='web01', hostname='10.0.0.1', user='monitor')
+        session.add(host)
+        session.flush()
+        return host.id
+
+
+def test_plan_snapshot_append_and_keyframes():
+    """Test appends become deltas, anything else and long chains become keyframes"""
+    base = {'id': 7, 'text_hash': content_digest('one\n'), 'text_length': 4, 'delta_depth': 0}
+    
+    plan = plan_snapshot('one\ntwo\n', base, keyframe_interval=5)
+    assert plan['stored'] == 'two\n'
+    assert (plan['delta_base_id'], plan['delta_prefix_length'], plan['delta_depth']) == (7, 4, 1)
+    assert plan['text_hash'] == content_digest('one\ntwo\n')
+    
+    assert plan_snapshot('other\n', base, keyframe_interval=5)['delta_base_id'] is None
+    assert plan_snapshot('on', base, keyframe_interval=5)['delta_base_id'] is None
+    assert plan_snapshot('one\ntwo\n', dict(base, delta_depth=4), keyframe_interval=5)['stored'] == 'one\ntwo\n'
+    assert plan_snapshot('one\ntwo\n', base, keyframe_interval=0)['delta_base_id'] is None
+
+
+def test_reconstruct_entries(db_manager, host_id):
+    """Test every version of a delta chain is rebuilt"""
+    snapshots = ['l1\n', 'l1\nl2\n', 'l1\nl2\nl3\n']
+    with db_manager.get_session() as session:
+        entry_ids = [_store(session, host_id, text)[1] for text in snapshots]
+    
+    with db_manager.get_session() as session:
+        assert reconstruct_entries(session, entry_ids) == dict(zip(entry_ids, snapshots))
+        assert reconstruct_entry(session, entry_ids[1]) == 'l1\nl2\n'
+
+
+def test_delete_runs_materializes_dependents(db_manager, host_id):
+    """Test pruning the keyframe of a chain keeps later versions readable"""
+    with db_manager.get_session() as session:
+        first_run, _ = _store(session, host_id, 'l1\n')
+        _, second = _store(session, host_id, 'l1\nl2\n')
+        _, third = _store(session, host_id, 'l1\nl2\nl3\n')
+    
+    with db_manager.get_session() as session:
+        delete_runs(session, [first_run])
+    
+    with db_manager.get_session() as session:
+        entry = session.query(LogEntry).filter(LogEntry.id == second).one()
+        assert entry.delta_base_id is None
+        assert entry.blob.content == 'l1\nl2\n'
+        assert reconstruct_entries(session, [second, third]) == {second: 'l1\nl2\n',
+                                                                 third: 'l1\nl2\nl3\n'}
@@ -0,0 +1,50 @@
+"""
+Unit tests for per-log retrieval policies
+Last Updated: 10/16/2026 12:00:00 PM CDT
+"""
+
+import pytest
+from datetime import datetime
+from dthostmon.utils import ConfigurationError
+from dthostmon.utils.log_policy import parse_size, resolve_since, normalize_log_entry, split_log_entry
+
+
+def test_parse_size_units():
+    """Test byte sizes with and without binary units"""
+    assert parse_size(4096) == 4096
+    assert parse_size("512K") == 512 * 1024
+    assert parse_size("2MB") == 2 * 1024 * 1024
+    assert parse_size("1GiB") == 1024 ** 3
+    
+    with pytest.raises(ConfigurationError):
+        parse_size("0")
+
+
+def test_resolve_since_formats():
+    """Test durations, timestamps and epoch values resolve to epoch seconds"""
+    now = 1_000_000
+    
+    assert resolve_since("24h", now=now) == now - 86400
+    assert resolve_since("30m", now=now) == now - 1800
+    assert resolve_since(1234) == 1234
+    assert resolve_since("2025-11-14T12:00:00+00:00") == int(
+        datetime.fromisoformat("2025-11-14T12:00:00+00:00").timestamp()
+    )
+    assert resolve_since(None) is None
+    
+    with pytest.raises(ConfigurationError):
+        resolve_since("yesterday")
+
+
+def test_normalize_log_entry_rejects_unknown_keys():
+    """Test typos in policy keys are reported instead of ignored"""
+    with pytest.raises(ConfigurationError, match="tail_line"):
+        normalize_log_entry({'path': '/var/log/syslog', 'tail_line': 10})
+
+
+def test_split_log_entry():
+    """Test entries split into path and policy"""
+    assert split_log_entry('/var/log/syslog') == ('/var/log/syslog', {})
+    assert split_log_entry({'path': '/var/log/syslog', 'tail_lines': 10}) == (
+        '/var/log/syslog', {'tail_lines': 10}
+    )
@@ -0,0 +1,99 @@
+"""
+Unit tests for log template mining
+Last Updated: 10/16/2026 12:00:00 PM CDT
+"""
+
+import io
+
+from dthostmon.core.ai_analyzer import AIAnalyzer
+from dthostmon.core.log_templates import TemplateMiner, fit_logs, mask_line, summarize_log, template_text
+
+SSH_LINES = [
+    f"Oct 16 12:{i:02d}:01 web01 sshd[{1000 + i}]: Accepted publickey for user{i % 3} from 10.0.0.{i} port {40000 + i} ssh2"
+    for i in range(50)
+]
+OOM_LINE = "Oct 16 13:00:00 web01 kernel: Out of memory: Killed process 1234 (java)"
+
+
+def test_mask_line_replaces_variable_fields():
+    """Test numbers, IPs and hex values are masked"""
+    assert mask_line("conn from 10.1.2.3:22 pid 42 addr 0xdeadbeef") == "conn from <IP> pid <NUM> addr <HEX>"
+
+
+def test_miner_clusters_lines_into_templates():
+    """Test similar lines share a template with wildcards where they differ"""
+    miner = TemplateMiner()
+    clusters = {miner.add(line)['id'] for line in SSH_LINES}
+    assert len(clusters) == 1
+    assert template_text(miner.clusters[0]) == (
+        "Oct <NUM> <NUM> web01 sshd[<NUM>]: Accepted publickey for <*> from <IP> port <NUM> ssh2"
+    )
+    assert miner.add(OOM_LINE)['id'] != miner.clusters[0]['id']
+
+
+def test_summarize_counts_repeats_and_keeps_rare_lines():
+    """Test repeated lines collapse into one counted line at their last occurrence"""
+    summary = summarize_log("\n".join(SSH_LINES[:25] + [OOM_LINE] + SSH_LINES[25:]))
+    lines = summary.splitlines()
+    assert lines[0] == OOM_LINE
+    assert lines[1].startswith("[50x] ")
+    
+    marked = summarize_log(OOM_LINE, known_templates=set())
+    assert marked.endswith("[new]")
+
+
+def test_budget_drops_templates_before_rare_lines():
+    """Test over-budget logs keep rare and recent lines"""
+    noise = [f"Oct 16 12:00:{i:02d} web01 CRON[{i}]: (root) CMD (job {i})" for i in range(30)]
+    content = "\n".join(SSH_LINES + noise + [OOM_LINE])
+    summary = summarize_log(content, max_chars=len(OOM_LINE) + 100)
+    assert summary.startswith("... (")
+    assert summary.endswith(OOM_LINE)
+    assert len(summary) <= len(OOM_LINE) + 100
+
+
+def test_fit_logs_shares_budget():
+    """Test small logs keep their summary and large ones split the rest"""
+    # Lines of different lengths never share a template
+    big = "\n".join(" ".join(["word"] * n) for n in range(1, 40))
+    fitted = dict(fit_logs([('/var/log/small', 'one line'), ('/var/log/big', big)], 200))
+    assert fitted['/var/log/small'] == 'one line'
+    assert len(fitted['/var/log/big']) <= 192
+    assert fitted['/var/log/big'].startswith('... (')
+
+
+def test_analyzer_prompt_covers_every_log():
+    """Test template mode includes all logs, not just the first five"""
+    analyzer = AIAnalyzer({'log_templates': {'enabled': True, 'budget_chars': 5000}})
+    logs = [{'path': f'/var/log/app{i}.log', 'content': "\n".join(SSH_LINES)} for i in range(8)]
+    
+    prompt = analyzer._build_analysis_prompt({'name': 'web01', 'tags': []}, logs, None)
+    
+    assert all(f'/var/log/app{i}.log' in prompt for i in range(8))
+    assert '[50x]' in prompt
+    assert analyzer.prompt_version.endswith('-templates')
+    
+    # String values from environment substitution are parsed
+    assert AIAnalyzer({'log_templates': {'enabled': 'false'}}).log_templates is False
+    assert AIAnalyzer({'log_templates': {'enabled': 'true'}}).log_templates is True
+
+
+class _LineOnlySpool(io.BytesIO):
+    """Spool file that fails when read in full"""
+    
+    def read(self, *args):
+        raise AssertionError('spool read in full')
+
+
+def test_analyzer_mines_spilled_logs_by_line():
+    """Test template mode feeds spilled logs to the miner line by line"""
+    analyzer = AIAnalyzer({'log_templates': {'enabled': True, 'budget_chars': 5000}})
+    content = "\n".join(SSH_LINES + [OOM_LINE]) + "\n"
+    logs = [{'path': '/var/log/auth.log', 'content': SSH_LINES[0],
+             'spool': _LineOnlySpool(content.encode('utf-8'))}]
+    
+    prompt = analyzer._build_analysis_prompt({'name': 'web01', 'tags': []}, logs, None)
+    
+    assert '[50x]' in prompt
+    assert OOM_LINE in prompt
+    assert summarize_log(iter(content.splitlines())) == summarize_log(content)
@@ -0,0 +1,166 @@
+"""
+Unit tests for history retention, rollups and compaction
+Last Updated: 10/16/2026 12:00:00 PM CDT
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+from dthostmon.core.maintenance import MaintenanceJob
+from dthostmon.models.blob_store import store_blobs
+from dthostmon.models.health_series import load_series, record_run
+from dthostmon.models.database import (Host, MonitoringRun, LogEntry, LogBlob, Baseline,
+                                       DetectedChange, HealthRollup)
+
+NOW = datetime(2026, 10, 16, 12, 30)
+
+
+def _job(db_manager, **settings):
+    values = {'maintenance.raw_days': 30, 'maintenance.batch_size': 2}
+    values.update({f'maintenance.{k}': v for k, v in settings.items()})
+    config = Mock()
+    config.get.side_effect = lambda key, default=None: values.get(key, default)
+    return MaintenanceJob(config, db_manager)
+
+
+@pytest.fixture
+def host_id(db_manager):
+    with db_manager.get_session() as session:
+        host = Host(name='web01', hostname='10.0.0.1', user='monitor')
+        session.add(host)
+        session.flush()
+        return host.id
+
+
+def _add_run(session, host_id, run_date, health_score, status='success', content=None):
+    run = MonitoringRun(host_id=host_id, run_date=run_date, status=status, health_score=health_score,
+                        anomalies_detected=1, changes_detected=2)
+    session.add(run)
+    session.flush()
+    if content is not None:
+        session.add(LogEntry(monitoring_run_id=run.id, log_file_path='/var/log/syslog',
+                             blob_hash=store_blobs(session, [content])[0]))
+        session.add(DetectedChange(monitoring_run_id=run.id, change_type='log_modified'))
+    return run.id
+
+
+def test_rollups_hourly_and_daily(db_manager, host_id):
+    """Test runs are summarized per hour and per day, skipped runs ignored"""
+    with db_manager.get_session() as session:
+        _add_run(session, host_id, datetime(2026, 10, 15, 9, 5), 90)
+        _add_run(session, host_id, datetime(2026, 10, 15, 9, 50), 70)
+        _add_run(session, host_id, datetime(2026, 10, 15, 10, 5), None, status='failed')
+        _add_run(session, host_id, datetime(2026, 10, 15, 10, 20), None, status='skipped')
+        _add_run(session, host_id, datetime(2026, 10, 16, 12, 10), 50)  # Current hour: not yet
+    
+    job = _job(db_manager)
+    assert job.update_rollups(NOW) == 3
+    
+    with db_manager.get_session() as session:
+        hours = {r.period_start.hour: r for r in session.query(HealthRollup).filter_by(period='hour')}
+        assert sorted(hours) == [9, 10]
+        assert (hours[9].run_count, hours[9].health_min, hours[9].health_max) == (2, 70, 90)
+        assert hours[9].health_avg == 80
+        assert (hours[10].run_count, hours[10].failed_count, hours[10].health_avg) == (1, 1, None)
+        
+        day = session.query(HealthRollup).filter_by(period='day').one()
+        assert day.period_start == datetime(2026, 10, 15)
+        assert (day.run_count, day.failed_count, day.health_sum, day.changes_total) == (3, 1, 160, 6)
+    
+    # Re-running replaces instead of double counting
+    job.update_rollups(NOW + timedelta(hours=1))
+    with db_manager.get_session() as session:
+        day = session.query(HealthRollup).filter_by(period='day', period_start=datetime(2026, 10, 15)).one()
+        assert day.run_count == 3
+        assert session.query(HealthRollup).filter_by(period='hour').count() == 3
+
+
+def test_rollups_backfill_runs_before_first_rollup(db_manager, host_id):
+    """Test history recorded before the first rollup is rolled up and served by the series"""
+    with db_manager.get_session() as session:
+        for days in range(1, 10):
+            _add_run(session, host_id, NOW - timedelta(days=days), 80)
+        # A run saved by the monitor creates the first (current) rollups
+        now = NOW - timedelta(minutes=10)
+        _add_run(session, host_id, now, 90)
+        record_run(session, {'host_id': host_id, 'run_date': now, 'status': 'success', 'health_score': 90})
+    
+    _job(db_manager, rollup_recompute_hours=48).update_rollups(NOW + timedelta(hours=1))
+    
+    with db_manager.get_session() as session:
+        points = load_series(session, [host_id], NOW - timedelta(days=30), 'day', now=NOW)[host_id]
+    assert len(points) == 10
+    assert sum(point['run_count'] for point in points) == 10
+
+
+def test_rollups_replace_window_and_skip_current_day(db_manager, host_id):
+    """Test recomputed windows drop stale rollups, leaving purged hours and today alone"""
+    with db_manager.get_session() as session:
+        session.add_all([
+            # No runs behind these any more
+            HealthRollup(host_id=host_id, period='hour', period_start=datetime(2026, 10, 16, 9), run_count=5),
+            HealthRollup(host_id=host_id, period='hour', period_start=datetime(2026, 10, 6, 12), run_count=7)
+        ])
+        earlier = datetime(2026, 10, 16, 8, 15)
+        _add_run(session, host_id, earlier, 70)
+        record_run(session, {'host_id': host_id, 'run_date': NOW, 'status': 'success', 'health_score': 90})
+    
+    _job(db_manager, raw_days=7).update_rollups(NOW)
+    
+    with db_manager.get_session() as session:
+        hours = {r.period_start: r.run_count for r in session.query(HealthRollup).filter_by(period='hour')}
+        assert hours == {datetime(2026, 10, 16, 8): 1, datetime(2026, 10, 6, 12): 7, datetime(2026, 10, 16, 12): 1}
+        # Today is still maintained by record_run only
+        today = session.query(HealthRollup).filter_by(period='day', period_start=datetime(2026, 10, 16)).one()
+        assert today.run_count == 1
+
+
+def test_run_expires_history_in_batches(db_manager, host_id):
+    """Test expired runs, entries, changes, baselines and blobs are removed, rollups kept"""
+    old = NOW - timedelta(days=40)
+    with db_manager.get_session() as session:
+        for minutes in range(5):
+            _add_run(session, host_id, old + timedelta(minutes=minutes), 80, content=f'old {minutes}\n')
+        _add_run(session, host_id, NOW - timedelta(days=1), 95, content='old 0\n')
+        session.add_all([
+            Baseline(host_id=host_id, log_file_path='/var/log/syslog', content_hash='a',
+                     is_active=False, created_at=old),
+            Baseline(host_id=host_id, log_file_path='/var/log/syslog', content_hash='b',
+                     is_active=True, created_at=old)
+        ])
+    
+    stats = _job(db_manager).run(NOW)
+    
+    assert stats['runs_deleted'] == 5
+    assert stats['baselines_deleted'] == 1
+    assert stats['blobs_deleted'] == 4
+    with db_manager.get_session() as session:
+        assert session.query(MonitoringRun).count() == 1
+        assert session.query(LogEntry).count() == 1
+        assert session.query(DetectedChange).count() == 1
+        assert [b.content for b in session.query(LogBlob)] == ['old 0\n']
+        assert session.query(Baseline).one().is_active
+        old_day = session.query(HealthRollup).filter_by(period='day', period_start=_day(old)).one()
+        assert old_day.run_count == 5
+
+
+def test_expired_rollups_deleted(db_manager, host_id):
+    """Test hourly and daily rollups follow their own retention"""
+    with db_manager.get_session() as session:
+        # Runs within raw_days are recomputed into their rollups
+        _add_run(session, host_id, NOW - timedelta(days=10), 80)
+        for period, days in (('hour', 100), ('hour', 10), ('day', 800), ('day', 100)):
+            session.add(HealthRollup(host_id=host_id, period=period,
+                                     period_start=NOW - timedelta(days=days)))
+    
+    stats = _job(db_manager, hourly_days=90, daily_days=730).run(NOW)
+    
+    assert stats['rollups_deleted'] == 2
+    with db_manager.get_session() as session:
+        ages = {(r.period, (NOW - r.period_start).days) for r in session.query(HealthRollup)}
+        assert {('day', 100), ('hour', 10)} <= ages
+        assert not {('day', 800), ('hour', 100)} & ages
+
+
+def _day(moment):
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -0,0 +1,153 @@
+"""
+Unit tests for the orchestrator persistence stage
+Last Updated: 10/16/2026 12:00:00 PM CDT
+"""
+
+import pytest
+from datetime import datetime
+from sqlalchemy import event
+from dthostmon.core.baseline_cache import BaselineCache
+from dthostmon.core.orchestrator import MonitoringOrchestrator
+from dthostmon.models.database import (Host, MonitoringRun, LogEntry, LogBlob, Baseline,
+                                       DetectedChange, HealthRollup)
+
+
+def _log(path, content, content_hash):
+    return {
+        'path': path,
+        'content': content,
+        'hash': content_hash,
+        'line_count': content.count('\n'),
+        'file_size': len(content),
+        'retrieved_at': datetime.utcnow()
+    }
+
+
+@pytest.fixture
+def orchestrator(db_manager):
+    """Orchestrator with only the database wired up"""
+    orchestrator = MonitoringOrchestrator.__new__(MonitoringOrchestrator)
+    orchestrator.db_manager = db_manager
+    orchestrator.baseline_cache = BaselineCache(db_manager)
+    orchestrator.tail_mode = False
+    orchestrator.delta_storage = False
+    orchestrator.delta_keyframe_interval = 20
+    return orchestrator
+
+
+@pytest.fixture
+def host_id(db_manager):
+    with db_manager.get_session() as session:
+        host = Host(name='web01', hostname='10.0.0.1', user='monitor')
+        session.add(host)
+        session.flush()
+        session.add(Baseline(host_id=host.id, log_file_path='/var/log/syslog',
+                             content_hash='old', line_count=1, is_active=True))
+        session.add(Baseline(host_id=host.id, log_file_path='/var/log/auth.log',
+                             content_hash='same', line_count=1, is_active=True))
+        return host.id
+
+
+def test_persist_host_results_single_commit(orchestrator, db_manager, host_id):
+    """Test run, entries, changes, baselines and last_seen are written in one transaction"""
+    logs = [
+        _log('/var/log/syslog', 'changed\n', 'new'),
+        _log('/var/log/auth.log', 'same\n', 'same'),
+        _log('/var/log/kern.log', 'fresh\n', 'kern')
+    ]
+    analysis = {'health_score': 80, 'anomalies': ['x'], 'summary': 'ok', 'severity': 'WARN'}
+    
+    orchestrator.baseline_cache.load([host_id])
+    commits = []
+    event.listen(db_manager.engine, 'commit', lambda conn: commits.append(conn))
+    
+    run_record, changes = orchestrator._persist_host_results(host_id, logs, analysis, 1.5)
+    
+    assert len(commits) == 1
+    assert run_record['id'] is not None
+    assert run_record['changes_detected'] == 2
+    assert run_record['alert_level'] == 'WARN'
+    assert sorted(c['change_type'] for c in changes) == ['log_modified', 'new_log']
+    
+    with db_manager.get_session() as session:
+        run = session.query(MonitoringRun).filter(MonitoringRun.id == run_record['id']).one()
+        assert run.status == 'success'
+        assert run.anomalies_detected == 1
+        assert session.query(LogEntry).filter(LogEntry.monitoring_run_id == run.id).count() == 3
+        assert session.query(DetectedChange).filter(DetectedChange.monitoring_run_id == run.id).count() == 2
+        
+        active = {
+            b.log_file_path: b.content_hash
+            for b in session.query(Baseline).filter(Baseline.is_active == True).all()
+        }
+        assert active == {'/var/log/syslog': 'new', '/var/log/auth.log': 'same',
+                          '/var/log/kern.log': 'kern'}
+        assert session.query(Host).filter(Host.id == host_id).one().last_seen == run.run_date
+
+        rollups = session.query(HealthRollup).filter(HealthRollup.host_id == host_id).all()
+        assert sorted(r.period for r in rollups) == ['day', 'hour']
+        assert all((r.run_count, r.health_sum, r.changes_total) == (1, 80, 2) for r in rollups)
+
+
+def test_persist_host_results_rolls_back_on_error(orchestrator, db_manager, host_id):
+    """Test a failure part-way through leaves no partial run behind"""
+    logs = [_log('/var/log/syslog', 'changed\n', 'new')]
+    orchestrator.tail_mode = True
+    
+    def fail(session, host_id, logs):
+        raise RuntimeError('boom')
+    orchestrator._write_tail_states = fail
+    
+    with pytest.raises(RuntimeError):
+        orchestrator._persist_host_results(host_id, logs, {'health_score': 90}, 1.0)
+    
+    with db_manager.get_session() as session:
+        assert session.query(MonitoringRun).count() == 0
+        assert session.query(LogEntry).count() == 0
+        assert session.query(HealthRollup).count() == 0
+        baseline = session.query(Baseline).filter(Baseline.log_file_path == '/var/log/syslog').one()
+        assert baseline.content_hash == 'old' and baseline.is_active
+
+
+def test_persisted_content_is_deduplicated(orchestrator, db_manager, host_id):
+    """Test repeated identical content is stored once as a blob"""
+    for _ in range(3):
+        orchestrator._persist_host_results(host_id, [_log('/var/log/syslog', 'same\n', 'h')],
+                                           {'health_score': 90}, 1.0)
+    
+    with db_manager.get_session() as session:
+        entries = session.query(LogEntry).all()
+        assert len(entries) == 3
+        assert all(e.content is None and e.text == 'same\n' for e in entries)
+        blob = session.query(LogBlob).one()
+        assert blob.ref_count == 3
+
+
+def test_delta_storage_round_trip(orchestrator, db_manager, host_id):
+    """Test appended snapshots are stored as deltas and rebuilt in full"""
+    orchestrator.delta_storage = True
+    orchestrator.delta_keyframe_interval = 3
+    snapshots = ['a\n', 'a\nb\n', 'a\nb\nc\n', 'a\nb\nc\nd\n', 'rotated\n']
+    for text in snapshots:
+        orchestrator._persist_host_results(host_id, [_log('/var/log/syslog', text, text)],
+                                           {'health_score': 90}, 1.0)
+    
+    with db_manager.get_session() as session:
+        entries = session.query(LogEntry).order_by(LogEntry.id).all()
+        assert [e.delta_depth for e in entries] == [0, 1, 2, 0, 0]
+        assert [e.blob.content for e in entries][:3] == ['a\n', 'b\n', 'c\n']
+        assert [e.text for e in entries] == snapshots
+
+
+def test_baselines_written_only_when_hash_changes(orchestrator, db_manager, host_id):
+    """Test unchanged logs keep their baseline row and the cache follows commits"""
+    orchestrator.baseline_cache.load([host_id])
+    logs = [_log('/var/log/syslog', 'changed\n', 'new'), _log('/var/log/auth.log', 'same\n', 'same')]
+    
+    for _ in range(3):
+        orchestrator._persist_host_results(host_id, logs, {'health_score': 90}, 1.0)
+    
+    with db_manager.get_session() as session:
+        assert session.query(Baseline).filter(Baseline.log_file_path == '/var/log/auth.log').count() == 1
+        assert session.query(Baseline).filter(Baseline.log_file_path == '/var/log/syslog').count() == 2
+    assert orchestrator.baseline_cache.get(host_id)['/var/log/syslog']['hash'] == 'new'
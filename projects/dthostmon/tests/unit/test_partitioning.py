@@ -0,0 +1,96 @@
+"""
+Unit tests for monthly partitioning of the history tables
+Last Updated: 10/16/2026 12:00:00 PM CDT
+"""
+
+import pytest
+from datetime import datetime
+from contextlib import contextmanager
+from unittest.mock import Mock, patch
+from dthostmon.core.maintenance import MaintenanceJob
+from dthostmon.models.partitioning import (PartitionManager, PartitioningError, month_start,
+                                           partition_bounds, partition_name)
+
+NOW = datetime(2026, 10, 16, 12, 30)
+
+
+def test_month_start_offsets():
+    """Test month arithmetic across year boundaries"""
+    assert month_start(NOW) == datetime(2026, 10, 1)
+    assert month_start(NOW, 3) == datetime(2027, 1, 1)
+    assert month_start(NOW, -10) == datetime(2025, 12, 1)
+
+
+def test_partition_name_round_trip():
+    """Test partition names encode their range"""
+    name = partition_name('monitoring_runs', datetime(2026, 12, 1))
+    assert name == 'monitoring_runs_y2026m12'
+    assert partition_bounds(name) == (datetime(2026, 12, 1), datetime(2027, 1, 1))
+    assert partition_bounds('monitoring_runs_default') is None
+
+
+def test_convert_requires_postgres(db_manager):
+    """Test conversion is refused on SQLite"""
+    manager = PartitionManager(db_manager)
+    assert not manager.supported
+    with pytest.raises(PartitioningError):
+        manager.convert('monitoring_runs')
+
+
+def _job(db_manager, partitioning):
+    values = {'database.partitioning': partitioning, 'maintenance.batch_size': 10}
+    config = Mock()
+    config.get.side_effect = lambda key, default=None: values.get(key, default)
+    config._to_bool.side_effect = bool
+    return MaintenanceJob(config, db_manager)
+
+
+def test_maintain_drops_partitions_instead_of_rows(db_manager):
+    """Test partitioned history is expired by dropping months"""
+    job = _job(db_manager, True)
+    job.partitions = Mock(supported=True)
+    job.partitions.is_partitioned.return_value = True
+    job.partitions.drop_expired.return_value = ['monitoring_runs_y2026m08']
+    
+    stats = job.run(NOW)
+    
+    job.partitions.ensure_partitions.assert_called_once_with(NOW)
+    job.partitions.drop_expired.assert_called_once_with(datetime(2026, 9, 16, 12, 30))
+    assert stats['partitions_dropped'] == 1
+    assert stats['runs_deleted'] == 0
+
+
+def test_maintain_deletes_rows_without_partitions(db_manager):
+    """Test SQLite (or unconverted tables) keep the batched delete path"""
+    assert _job(db_manager, False).partitions is None
+    
+    job = _job(db_manager, True)
+    assert not job.partitioned
+    stats = job.run(NOW)
+    assert 'partitions_dropped' not in stats
+    assert stats['runs_deleted'] == 0
+
+
+def test_release_entries_commits_per_id_range():
+    """Test blob references of a dropped partition are released in id ranges, one transaction each"""
+    sessions = []
+    
+    @contextmanager
+    def get_session():
+        session = Mock()
+        session.execute.return_value.one.return_value = (1, 5)
+        sessions.append(session)
+        yield session
+    
+    manager = PartitionManager(Mock(get_session=get_session), batch_size=2)
+    with patch('dthostmon.models.partitioning.materialize_dependents') as materialize:
+        manager._release_entries('log_entries_y2026m08', datetime(2026, 8, 1), datetime(2026, 9, 1))
+    
+    materialize.assert_called_once()
+    assert len(sessions) == 4
+    assert [session.execute.call_args_list[0].args[1] for session in sessions[1:]] == [
+        {'start': 1, 'end': 3}, {'start': 3, 'end': 5}, {'start': 5, 'end': 7}
+    ]
+    # Released entries lose their blob reference, so a retry skips them
+    assert all('SET blob_hash = NULL' in str(session.execute.call_args_list[1].args[0])
+               for session in sessions[1:])
@@ -223,14 +223,13 @@ def test_retrieve_log_file_not_connected(ssh_config):
         client.retrieve_log_file("/var/log/syslog")
 
 
+@patch.object(SSHClient, 'execute_command_raw')
 @patch.object(SSHClient, 'execute_command')
-def test_retrieve_log_file_success(mock_exec, ssh_config):
+def test_retrieve_log_file_success(mock_exec, mock_raw, ssh_config):
     """Test successful log file retrieval"""
     # First call checks if file exists
-    mock_exec.side_effect = [
-        ("OK", "", 0),  # File exists check
-        ("Nov 14 12:00:01 test CRON[1234]: (root) CMD\nNov 14 12:00:02 test test", "", 0)  # File contents
-    ]
+    mock_exec.return_value = ("OK", "", 0)
+    mock_raw.return_value = (b"Nov 14 12:00:01 test CRON[1234]: (root) CMD\nNov 14 12:00:02 test test", "", 0)
     
     client = SSHClient(**ssh_config)
     client.connected = True
@@ -261,13 +260,12 @@ def test_retrieve_log_file_not_found(mock_exec, ssh_config):
     assert result['error'] == 'File not accessible'
 
 
+@patch.object(SSHClient, 'execute_command_raw')
 @patch.object(SSHClient, 'execute_command')
-def test_retrieve_log_file_read_error(mock_exec, ssh_config):
+def test_retrieve_log_file_read_error(mock_exec, mock_raw, ssh_config):
     """Test log file retrieval when read fails"""
-    mock_exec.side_effect = [
-        ("OK", "", 0),  # File exists check
-        Exception("Read failed")  # File read fails
-    ]
+    mock_exec.return_value = ("OK", "", 0)  # File exists check
+    mock_raw.side_effect = Exception("Read failed")  # File read fails
     
     client = SSHClient(**ssh_config)
     client.connected = True
@@ -276,14 +274,14 @@ def test_retrieve_log_file_read_error(mock_exec, ssh_config):
         client.retrieve_log_file("/var/log/syslog")
 
 
+@patch.object(SSHClient, 'execute_command_raw')
 @patch.object(SSHClient, 'execute_command')
-def test_retrieve_multiple_logs_basic(mock_exec, ssh_config):
+def test_retrieve_multiple_logs_basic(mock_exec, mock_raw, ssh_config):
     """Test retrieving multiple log files"""
-    mock_exec.side_effect = [
-        ("OK", "", 0),  # syslog exists
-        ("syslog content", "", 0),  # syslog contents
-        ("OK", "", 0),  # auth.log exists
-        ("auth.log content", "", 0),  # auth.log contents
+    mock_exec.return_value = ("OK", "", 0)  # Both files exist
+    mock_raw.side_effect = [
+        (b"syslog content", "", 0),  # syslog contents
+        (b"auth.log content", "", 0),  # auth.log contents
     ]
     
     client = SSHClient(**ssh_config)
@@ -335,14 +333,15 @@ def test_retrieve_multiple_logs_glob_no_match(mock_exec, ssh_config):
     assert len(results) == 0
 
 
+@patch.object(SSHClient, 'execute_command_raw')
 @patch.object(SSHClient, 'execute_command')
-def test_retrieve_multiple_logs_partial_failure(mock_exec, ssh_config):
+def test_retrieve_multiple_logs_partial_failure(mock_exec, mock_raw, ssh_config):
     """Test retrieving multiple logs when some fail"""
     mock_exec.side_effect = [
         ("OK", "", 0),  # syslog exists
-        ("syslog content", "", 0),  # syslog contents
         ("FAIL", "", 1),  # auth.log doesn't exist
     ]
+    mock_raw.return_value = (b"syslog content", "", 0)  # syslog contents
     
     client = SSHClient(**ssh_config)
     client.connected = True
@@ -374,14 +373,13 @@ def test_ssh_client_context_manager(mock_ssh_key):
                 assert client.connected is False
 
 
+@patch.object(SSHClient, 'execute_command_raw')
 @patch.object(SSHClient, 'execute_command')
-def test_log_file_hash_consistency(mock_exec, ssh_config):
+def test_log_file_hash_consistency(mock_exec, mock_raw, ssh_config):
     """Test that log file hash is consistent for same content"""
-    log_content = "Test log line 1\nTest log line 2\n"
-    mock_exec.side_effect = [
-        ("OK", "", 0),  # File exists
-        (log_content, "", 0),  # File contents
-    ]
+    log_content = b"Test log line 1\nTest log line 2\n"
+    mock_exec.return_value = ("OK", "", 0)  # File exists
+    mock_raw.return_value = (log_content, "", 0)  # File contents
     
     client = SSHClient(**ssh_config)
     client.connected = True
@@ -389,26 +387,20 @@ def test_log_file_hash_consistency(mock_exec, ssh_config):
     result = client.retrieve_log_file("/var/log/test.log")
     hash1 = result['hash']
     
-    # Retrieve same file again
-    mock_exec.side_effect = [
-        ("OK", "", 0),  # File exists
-        (log_content, "", 0),  # Same contents
-    ]
-    
+    # Retrieve same file again (same contents)
     result2 = client.retrieve_log_file("/var/log/test.log")
     hash2 = result2['hash']
     
     assert hash1 == hash2
 
 
+@patch.object(SSHClient, 'execute_command_raw')
 @patch.object(SSHClient, 'execute_command')
-def test_log_file_utf8_handling(mock_exec, ssh_config):
+def test_log_file_utf8_handling(mock_exec, mock_raw, ssh_config):
     """Test log file retrieval with UTF-8 special characters"""
     log_content = "Test with Unicode: café, naïve, 中文\n"
-    mock_exec.side_effect = [
-        ("OK", "", 0),  # File exists
-        (log_content, "", 0),  # File with UTF-8 content
-    ]
+    mock_exec.return_value = ("OK", "", 0)  # File exists
+    mock_raw.return_value = (log_content.encode('utf-8'), "", 0)  # File with UTF-8 content
     
     client = SSHClient(**ssh_config)
     client.connected = True
@@ -418,3 +410,524 @@ def test_log_file_utf8_handling(mock_exec, ssh_config):
     assert result['content'] == log_content
     assert 'café' in result['content']
     assert result['file_size'] > 0
+
+
+@patch.object(SSHClient, 'execute_command')
+def test_retrieve_log_tail_first_run(mock_exec, ssh_config):
+    """Test tail retrieval without previous state reads the whole file"""
+    mock_exec.return_value = ("OK 1234 12 0\nline1\nline2\n", "", 0)
+    
+    client = SSHClient(**ssh_config)
+    client.connected = True
+    
+    result = client.retrieve_log_tail("/var/log/syslog")
+    
+    assert result['content'] == "line1\nline2\n"
+    assert result['line_count'] == 2
+    assert result['file_size'] == 12
+    assert result['rotated'] is False
+    assert result['tail_state'] == {
+        'inode': '1234', 'offset': 12, 'file_size': 12, 'hash': result['hash']
+    }
+
+
+@patch.object(SSHClient, 'execute_command')
+def test_retrieve_log_tail_appended_bytes(mock_exec, ssh_config):
+    """Test tail retrieval continues from offset with a rolling hash"""
+    mock_exec.return_value = ("OK 1234 18 12\nline3\n", "", 0)
+    state = {'inode': '1234', 'offset': 12, 'file_size': 12, 'hash': 'abc'}
+    
+    client = SSHClient(**ssh_config)
+    client.connected = True
+    
+    result = client.retrieve_log_tail("/var/log/syslog", state)
+    
+    import hashlib
+    assert result['content'] == "line3\n"
+    assert result['hash'] == hashlib.sha256(b"abc:line3\n").hexdigest()
+    assert result['tail_state']['offset'] == 18
+    assert "start=12" in mock_exec.call_args[0][0]
+
+
+@patch.object(SSHClient, 'execute_command')
+def test_retrieve_log_tail_no_new_bytes_keeps_hash(mock_exec, ssh_config):
+    """Test unchanged file keeps the previous hash so no change is detected"""
+    mock_exec.return_value = ("OK 1234 12 12\n", "", 0)
+    state = {'inode': '1234', 'offset': 12, 'file_size': 12, 'hash': 'abc'}
+    
+    client = SSHClient(**ssh_config)
+    client.connected = True
+    
+    result = client.retrieve_log_tail("/var/log/syslog", state)
+    
+    assert result['content'] == ""
+    assert result['hash'] == 'abc'
+
+
+@patch.object(SSHClient, 'execute_command')
+def test_retrieve_log_tail_detects_rotation(mock_exec, ssh_config):
+    """Test inode change restarts from offset 0 and flags rotation"""
+    mock_exec.return_value = ("OK 9999 6 0\nfresh\n", "", 0)
+    state = {'inode': '1234', 'offset': 12, 'file_size': 12, 'hash': 'abc'}
+    
+    client = SSHClient(**ssh_config)
+    client.connected = True
+    
+    result = client.retrieve_log_tail("/var/log/syslog", state)
+    
+    import hashlib
+    assert result['rotated'] is True
+    assert result['hash'] == hashlib.sha256(b"fresh\n").hexdigest()
+    assert result['tail_state']['inode'] == '9999'
+
+
+@patch.object(SSHClient, 'execute_command')
+def test_retrieve_log_tail_not_accessible(mock_exec, ssh_config):
+    """Test tail retrieval of unreadable file"""
+    mock_exec.return_value = ("FAIL\n", "", 0)
+    
+    client = SSHClient(**ssh_config)
+    client.connected = True
+    
+    result = client.retrieve_log_tail("/var/log/secure")
+    
+    assert result['content'] is None
+    assert result['error'] == 'File not accessible'
+
+
+@patch.object(SSHClient, 'execute_command')
+def test_retrieve_multiple_logs_tail_mode(mock_exec, ssh_config):
+    """Test retrieve_multiple_logs uses tail retrieval when states are given"""
+    mock_exec.return_value = ("OK 1 4 0\nabc\n", "", 0)
+    
+    client = SSHClient(**ssh_config)
+    client.connected = True
+    
+    results = client.retrieve_multiple_logs(["/var/log/syslog"], tail_states={})
+    
+    assert len(results) == 1
+    assert 'tail_state' in results[0]
+    assert mock_exec.call_count == 1
+
+
+def _batch_frame(status, path, body=b"", size=None, inode="1", start=0):
+    """Build one length-prefixed frame as emitted by the batch script"""
+    size = len(body) + start if size is None else size
+    header = f"@@DTHOSTMON {status} {len(body)} {size} {inode} {start} {path}\n"
+    return header.encode('utf-8') + body
+
+
+@patch.object(SSHClient, 'execute_command_raw')
+def test_retrieve_logs_batched_single_round_trip(mock_exec, ssh_config):
+    """Test batched retrieval splits frames into per-file results in order"""
+    mock_exec.return_value = (
+        _batch_frame("OK", "/var/log/syslog", b"line1\nline2\n")
+        + _batch_frame("OK", "/home/user 1/.bash_history", "café\n".encode('utf-8'))
+        + _batch_frame("FAIL", "/var/log/auth.log"),
+        "", 0
+    )
+    
+    client = SSHClient(**ssh_config)
+    client.connected = True
+    
+    results = client.retrieve_logs_batched(
+        ["/var/log/syslog", "/home/*/.bash_history", "/var/log/auth.log"]
+    )
+    
+    assert mock_exec.call_count == 1
+    assert [r['path'] for r in results] == [
+        "/var/log/syslog", "/home/user 1/.bash_history", "/var/log/auth.log"
+    ]
+    assert results[0]['content'] == "line1\nline2\n"
+    assert results[0]['line_count'] == 2
+    assert results[1]['content'] == "café\n"
+    assert results[1]['file_size'] == len("café\n".encode('utf-8'))
+    assert results[2]['error'] == 'File not accessible'
+
+
+@patch.object(SSHClient, 'execute_command_raw')
+def test_retrieve_logs_batched_tail_mode(mock_exec, ssh_config):
+    """Test batched retrieval passes tail offsets and returns tail states"""
+    mock_exec.return_value = (
+        _batch_frame("OK", "/var/log/syslog", b"new\n", inode="7", start=10), "", 0
+    )
+    states = {"/var/log/syslog": {'inode': '7', 'offset': 10, 'hash': 'abc'}}
+    
+    client = SSHClient(**ssh_config)
+    client.connected = True
+    
+    results = client.retrieve_logs_batched(["/var/log/syslog"], tail_states=states)
+    
+    assert "/var/log/syslog) echo 7 10" in mock_exec.call_args[0][0]
+    assert results[0]['content'] == "new\n"
+    assert results[0]['tail_state']['offset'] == 14
+
+
+@patch.object(SSHClient, 'retrieve_multiple_logs')
+@patch.object(SSHClient, 'execute_command_raw')
+def test_retrieve_logs_batched_falls_back(mock_exec, mock_multiple, ssh_config):
+    """Test malformed batch output falls back to per-file retrieval"""
+    mock_exec.return_value = (b"sh: stat: not found\n", "", 1)
+    mock_multiple.return_value = []
+    
+    client = SSHClient(**ssh_config)
+    client.connected = True
+    
+    client.retrieve_logs_batched(["/var/log/syslog"])
+    
+    mock_multiple.assert_called_once_with(["/var/log/syslog"], tail_states=None)
+
+
+@patch.object(SSHClient, 'retrieve_multiple_logs')
+@patch.object(SSHClient, 'execute_command_raw')
+def test_retrieve_logs_batched_truncated_frame_falls_back(mock_exec, mock_multiple, ssh_config):
+    """Test a frame body shorter than its declared length falls back to per-file retrieval"""
+    frame = _batch_frame("OK", "/var/log/syslog", b"line1\nline2\n")
+    mock_exec.return_value = (frame[:-4], "", 0)
+    mock_multiple.return_value = []
+    
+    client = SSHClient(**ssh_config)
+    client.connected = True
+    
+    client.retrieve_logs_batched(["/var/log/syslog"])
+    
+    mock_multiple.assert_called_once_with(["/var/log/syslog"], tail_states=None)
+
+
+@patch.object(SSHClient, 'retrieve_multiple_logs')
+@patch.object(SSHClient, 'execute_command_raw')
+def test_retrieve_logs_batched_malformed_header_falls_back(mock_exec, mock_multiple, ssh_config):
+    """Test a frame header with a non-numeric length falls back to per-file retrieval"""
+    mock_exec.return_value = (b"@@DTHOSTMON OK abc 12 1 0 /var/log/syslog\nline1\nline2\n", "", 0)
+    mock_multiple.return_value = []
+    
+    client = SSHClient(**ssh_config)
+    client.connected = True
+    
+    client.retrieve_logs_batched(["/var/log/syslog"])
+    
+    mock_multiple.assert_called_once_with(["/var/log/syslog"], tail_states=None)
+
+
+@patch.object(SSHClient, 'retrieve_multiple_logs')
+@patch.object(SSHClient, 'execute_command_raw')
+def test_retrieve_logs_batched_nonzero_exit_falls_back(mock_exec, mock_multiple, ssh_config):
+    """Test a failing batch script falls back even when its frames parse"""
+    mock_exec.return_value = (_batch_frame("OK", "/var/log/syslog", b"line1\n"), "sh: killed", 137)
+    mock_multiple.return_value = []
+    
+    client = SSHClient(**ssh_config)
+    client.connected = True
+    
+    client.retrieve_logs_batched(["/var/log/syslog"])
+    
+    mock_multiple.assert_called_once_with(["/var/log/syslog"], tail_states=None)
+
+
+class _FakeChannelFile:
+    """Minimal paramiko ChannelFile stand-in supporting chunked reads"""
+    
+    def __init__(self, data: bytes, exit_code: int = 0):
+        import io
+        self._buffer = io.BytesIO(data)
+        self.channel = Mock()
+        self.channel.recv_exit_status.return_value = exit_code
+    
+    def read(self, size=-1):
+        return self._buffer.read(size)
+
+
+def _compressed_client(ssh_config, responses):
+    """Build a connected client whose exec_command replays (stdout, exit_code) pairs"""
+    client = SSHClient(**ssh_config, compression='gzip')
+    client.client = Mock()
+    client.connected = True
+    client.client.exec_command.side_effect = [
+        (Mock(), _FakeChannelFile(stdout, code), _FakeChannelFile(b""))
+        for stdout, code in responses
+    ]
+    return client
+
+
+def test_retrieve_log_file_compressed(ssh_config):
+    """Test gzip transport decompresses while hashing in one pass"""
+    import gzip
+    import hashlib
+    content = ("Nov 14 12:00:01 host sshd[1]: Accepted publickey\n" * 500).encode('utf-8')
+    client = _compressed_client(ssh_config, [
+        (b"/usr/bin/gzip\n", 0),  # Remote compressor probe
+        (gzip.compress(content), 0)
+    ])
+    
+    result = client.retrieve_log_file("/var/log/auth.log")
+    
+    assert client._codec == 'gzip'
+    assert result['content'] == content.decode('utf-8')
+    assert result['hash'] == hashlib.sha256(content).hexdigest()
+    assert result['line_count'] == 500
+    assert result['file_size'] == len(content)
+    command = client.client.exec_command.call_args[0][0]
+    assert "gzip -1 -c < /var/log/auth.log" in command
+
+
+def test_retrieve_log_file_compressed_not_accessible(ssh_config):
+    """Test compressed transport reports unreadable files"""
+    client = _compressed_client(ssh_config, [
+        (b"/usr/bin/gzip\n", 0),
+        (b"", 3)
+    ])
+    
+    result = client.retrieve_log_file("/var/log/secure")
+    
+    assert result['content'] is None
+    assert result['error'] == 'File not accessible'
+
+
+@patch.object(SSHClient, 'execute_command_raw')
+@patch.object(SSHClient, 'execute_command')
+def test_compression_falls_back_to_plain(mock_exec, mock_raw, ssh_config):
+    """Test missing remote compressor falls back to plain transport"""
+    mock_exec.side_effect = [
+        ("", "", 0),  # No compressor found
+        ("OK", "", 0)
+    ]
+    mock_raw.return_value = (b"plain content", "", 0)
+    
+    client = SSHClient(**ssh_config, compression='auto')
+    client.connected = True
+    
+    result = client.retrieve_log_file("/var/log/syslog")
+    
+    assert client._codec is None
+    assert result['content'] == "plain content"
+
+
+def test_retrieve_multiple_logs_concurrent_channels_keep_order(ssh_config):
+    """Test logs fetched over several channels come back in configured order"""
+    import threading
+    import time
+    active = {'now': 0, 'peak': 0}
+    lock = threading.Lock()
+    
+    def fake_execute(command, timeout=30):
+        if command.startswith('ls '):
+            return ("/home/a/.bash_history\n/home/b/.bash_history", "", 0)
+        if command.startswith('test -r'):
+            return ("OK", "", 0)
+        with lock:
+            active['now'] += 1
+            active['peak'] = max(active['peak'], active['now'])
+        # Earlier files finish last to prove ordering is not completion order
+        time.sleep(0.05 if 'syslog' in command else 0.01)
+        with lock:
+            active['now'] -= 1
+        return (f"content of {command.split(' ', 1)[1]}".encode('utf-8'), "", 0)
+    
+    client = SSHClient(**ssh_config, max_channels=4)
+    client.connected = True
+    
+    with patch.object(SSHClient, 'execute_command', side_effect=fake_execute), \
+            patch.object(SSHClient, 'execute_command_raw', side_effect=fake_execute):
+        results = client.retrieve_multiple_logs(
+            ["/var/log/syslog", "/home/*/.bash_history", "/var/log/auth.log"]
+        )
+    
+    assert [r['path'] for r in results] == [
+        "/var/log/syslog", "/home/a/.bash_history", "/home/b/.bash_history", "/var/log/auth.log"
+    ]
+    assert results[0]['content'] == "content of '/var/log/syslog'"
+    assert active['peak'] > 1
+
+
+@patch.object(SSHClient, '_map_channels')
+def test_max_channels_capped_at_sshd_sessions(mock_map, ssh_config):
+    """Test channel counts above sshd's default MaxSessions are capped"""
+    from dthostmon.core.ssh_client import MAX_CHANNELS
+    mock_map.return_value = []
+    
+    client = SSHClient(**ssh_config, max_channels=64)
+    client.connected = True
+    assert client.max_channels == MAX_CHANNELS == 10
+    
+    client.retrieve_multiple_logs(["/var/log/syslog"], max_channels=32)
+    assert mock_map.call_args[0][2] == MAX_CHANNELS
+
+
+@patch.object(SSHClient, 'execute_command')
+def test_precheck_logs_single_command(mock_exec, ssh_config):
+    """Test precheck hashes every log (globs included) in one remote command"""
+    mock_exec.return_value = (
+        f"OK {'a' * 64} 120 /var/log/syslog\n"
+        f"OK {'b' * 64} 40 /home/a/.bash_history\n"
+        "FAIL - 0 /var/log/secure\n", "", 0
+    )
+    
+    client = SSHClient(**ssh_config)
+    client.connected = True
+    
+    results = client.precheck_logs(["/var/log/syslog", "/home/*/.bash_history", "/var/log/secure"])
+    
+    assert mock_exec.call_count == 1
+    assert 'sha256sum' in mock_exec.call_args[0][0]
+    assert [r['path'] for r in results] == [
+        "/var/log/syslog", "/home/a/.bash_history", "/var/log/secure"
+    ]
+    assert results[0]['hash'] == 'a' * 64
+    assert results[0]['file_size'] == 120
+    assert results[2]['error'] == 'File not accessible'
+
+
+@patch.object(SSHClient, 'retrieve_multiple_logs')
+@patch.object(SSHClient, 'execute_command')
+def test_retrieve_logs_with_precheck_skips_unchanged(mock_exec, mock_multiple, ssh_config):
+    """Test only logs whose hash differs from the baseline are downloaded"""
+    mock_exec.return_value = (
+        f"OK {'a' * 64} 120 /var/log/syslog\nOK {'c' * 64} 80 /var/log/auth.log\n", "", 0
+    )
+    mock_multiple.return_value = [{'path': '/var/log/auth.log', 'content': 'new', 'hash': 'c' * 64}]
+    
+    client = SSHClient(**ssh_config)
+    client.connected = True
+    
+    known = {
+        '/var/log/syslog': {'hash': 'a' * 64, 'line_count': 7},
+        '/var/log/auth.log': {'hash': 'b' * 64, 'line_count': 3},
+    }
+    results = client.retrieve_logs_with_precheck(["/var/log/syslog", "/var/log/auth.log"], known)
+    
+    mock_multiple.assert_called_once_with(['/var/log/auth.log'])
+    assert results[0]['unchanged'] is True
+    assert results[0]['content'] is None
+    assert results[0]['line_count'] == 7
+    assert results[0]['file_size'] == 120
+    assert results[1]['content'] == 'new'
+
+
+@patch.object(SSHClient, 'execute_command_raw')
+@patch.object(SSHClient, 'execute_command')
+def test_non_utf8_log_matches_remote_hash(mock_exec, mock_raw, ssh_config):
+    """Test logs with invalid UTF-8 hash their raw bytes, like the remote sha256sum"""
+    import hashlib
+    raw = b"Oct 16 sshd[1]: Invalid user \xff\xfeadmin from 10.0.0.5\n"
+    remote_hash = hashlib.sha256(raw).hexdigest()
+    mock_exec.return_value = ("OK", "", 0)
+    mock_raw.return_value = (raw, "", 0)
+    
+    client = SSHClient(**ssh_config)
+    client.connected = True
+    
+    result = client.retrieve_log_file("/var/log/auth.log")
+    assert result['hash'] == remote_hash
+    assert result['file_size'] == len(raw)
+    assert '\ufffd' in result['content']
+    
+    mock_raw.return_value = (_batch_frame("OK", "/var/log/auth.log", raw), "", 0)
+    assert client.retrieve_logs_batched(["/var/log/auth.log"])[0]['hash'] == remote_hash
+    
+    # The next cycle's precheck sees the same hash and skips the download
+    mock_exec.return_value = (f"OK {remote_hash} {len(raw)} /var/log/auth.log\n", "", 0)
+    results = client.retrieve_logs_with_precheck(
+        ["/var/log/auth.log"], {'/var/log/auth.log': {'hash': result['hash'], 'line_count': 1}}
+    )
+    assert results[0]['unchanged'] is True
+
+
+def _streaming_client(ssh_config, stdout, exit_code=0, spool_threshold=1024):
+    """Build a connected streaming client whose single exec_command returns stdout"""
+    client = SSHClient(**ssh_config, spool_threshold=spool_threshold)
+    client.client = Mock()
+    client.connected = True
+    client.client.exec_command.return_value = (
+        Mock(), _FakeChannelFile(stdout, exit_code), _FakeChannelFile(b"")
+    )
+    return client
+
+
+def test_retrieve_log_file_streaming_spills_large_log(ssh_config):
+    """Test logs above the spool threshold keep only a preview in memory"""
+    import hashlib
+    from dthostmon.core.ssh_client import read_log_content, release_log_spools
+    content = b"".join(
+        f"Nov 14 12:00:{i % 60:02d} host app[1]: {'ERROR disk full' if i % 100 == 0 else 'ok'}\n".encode()
+        for i in range(5000)
+    )
+    client = _streaming_client(ssh_config, content)
+    
+    result = client.retrieve_log_file("/var/log/app.log")
+    
+    assert result['content_truncated'] is True
+    assert len(result['content']) < len(content)
+    assert result['hash'] == hashlib.sha256(content).hexdigest()
+    assert result['line_count'] == 5000
+    assert result['file_size'] == len(content)
+    assert len(result['highlights']) == 50
+    assert result['highlights'][0].endswith("ERROR disk full")
+    assert read_log_content(result) == content.decode('utf-8')
+    assert "cat < /var/log/app.log" in client.client.exec_command.call_args[0][0]
+    
+    spool = result['spool']
+    release_log_spools([result])
+    assert spool.closed
+    assert 'spool' not in result
+
+
+def test_retrieve_log_file_streaming_small_log_inline(ssh_config):
+    """Test logs below the spool threshold are returned in full"""
+    from dthostmon.core.ssh_client import read_log_content
+    client = _streaming_client(ssh_config, b"line one\nwarning: two\n")
+    
+    result = client.retrieve_log_file("/var/log/syslog")
+    
+    assert result['content'] == "line one\nwarning: two\n"
+    assert 'spool' not in result
+    assert result['highlights'] == ["warning: two"]
+    assert read_log_content(result) == result['content']
+
+
+def test_stream_digest_highlights_across_chunks():
+    """Test highlight lines split across chunk boundaries are matched once"""
+    from dthostmon.core.ssh_client import _StreamDigest
+    digest = _StreamDigest()
+    
+    for chunk in (b"boot ok\nkernel: fat", b"al error in module\nfine\n", b"last line: fatal"):
+        digest.update(chunk)
+    digest.finish()
+    
+    assert digest.highlights == ["kernel: fatal error in module", "last line: fatal"]
+    assert digest.line_count == 4
+
+
+def test_retrieve_log_file_policy_enforced_remotely(ssh_config):
+    """Test tail_lines/max_bytes are applied by the remote command before transfer"""
+    client = _streaming_client(ssh_config, b"line 9\nline 10\n", spool_threshold=None)
+    
+    result = client.retrieve_log_file("/var/log/syslog", {'tail_lines': 2, 'max_bytes': 1024})
+    
+    command = client.client.exec_command.call_args[0][0]
+    assert "mb=1024; tl=2; since=-;" in command
+    assert "pol || exit 4" in command
+    assert result['content'] == "line 9\nline 10\n"
+    assert result['line_count'] == 2
+
+
+def test_retrieve_log_file_since_policy_skips(ssh_config):
+    """Test logs not modified since the cutoff are skipped without transfer"""
+    client = _streaming_client(ssh_config, b"", exit_code=4, spool_threshold=None)
+    
+    result = client.retrieve_log_file("/var/log/old.log", {'since': '24h'})
+    
+    assert result['content'] is None
+    assert result['error'] is None
+    assert result['skipped'] == "not modified since 24h"
+
+
+def test_batch_script_passes_policies(ssh_config):
+    """Test batched retrieval passes per-log policies to the remote emit function"""
+    client = SSHClient(**ssh_config)
+    
+    script = client._build_batch_script(
+        ["/var/log/auth.log", {'path': '/var/log/*.log', 'max_bytes': 2048}], None
+    )
+    
+    assert "emit /var/log/auth.log - - -" in script
+    assert 'emit "$f" 2048 - -' in script
@@ -0,0 +1,130 @@
+"""
+Unit tests for SSH connection pool
+Last Updated: 10/16/2026 12:00:00 PM CDT
+"""
+
+import threading
+
+import pytest
+from unittest.mock import Mock, patch
+from dthostmon.core.ssh_pool import SSHConnectionPool
+from dthostmon.core.ssh_client import SSHClient
+
+
+def _mock_connection(active=True):
+    """Mock paramiko SSHClient with a transport in the given state"""
+    transport = Mock()
+    transport.is_active.return_value = active
+    transport.is_authenticated.return_value = active
+    client = Mock()
+    client.get_transport.return_value = transport
+    return client
+
+
+def test_acquire_opens_connection_once():
+    """Test healthy pooled connection is reused instead of reconnecting"""
+    pool = SSHConnectionPool(keepalive_interval=15)
+    connection = _mock_connection()
+    connect = Mock(return_value=connection)
+    
+    first = pool.acquire('10.0.0.1', 22, 'monitor', connect)
+    second = pool.acquire('10.0.0.1', 22, 'monitor', connect)
+    
+    assert first is second is connection
+    assert connect.call_count == 1
+    connection.get_transport.return_value.set_keepalive.assert_called_once_with(15)
+    assert len(pool) == 1
+
+
+def test_acquire_reconnects_dead_connection():
+    """Test dead transport is closed and replaced lazily"""
+    pool = SSHConnectionPool()
+    dead = _mock_connection()
+    fresh = _mock_connection()
+    connect = Mock(side_effect=[dead, fresh])
+    
+    pool.acquire('10.0.0.1', 22, 'monitor', connect)
+    dead.get_transport.return_value.is_active.return_value = False
+    
+    result = pool.acquire('10.0.0.1', 22, 'monitor', connect)
+    
+    assert result is fresh
+    dead.close.assert_called_once()
+
+
+def test_pool_keys_by_host_port_user():
+    """Test different users on the same host get separate connections"""
+    pool = SSHConnectionPool()
+    connect = Mock(side_effect=[_mock_connection(), _mock_connection()])
+    
+    a = pool.acquire('10.0.0.1', 22, 'monitor', connect)
+    b = pool.acquire('10.0.0.1', 22, 'root', connect)
+    
+    assert a is not b
+    assert len(pool) == 2
+
+
+def test_prune_idle_and_close_all():
+    """Test idle connections are closed and close_all empties the pool"""
+    pool = SSHConnectionPool(max_idle=60)
+    old = _mock_connection()
+    recent = _mock_connection()
+    
+    with patch('dthostmon.core.ssh_pool.time.monotonic', return_value=0):
+        pool.acquire('10.0.0.1', 22, 'monitor', Mock(return_value=old))
+    with patch('dthostmon.core.ssh_pool.time.monotonic', return_value=100):
+        pool.acquire('10.0.0.2', 22, 'monitor', Mock(return_value=recent))
+        assert pool.prune_idle() == 1
+    
+    old.close.assert_called_once()
+    pool.close_all()
+    recent.close.assert_called_once()
+    assert len(pool) == 0
+
+
+def test_discard_and_prune_wait_for_concurrent_acquire():
+    """Test a connection being opened is neither pruned nor discarded before it is pooled"""
+    pool = SSHConnectionPool(max_idle=60)
+    connection = _mock_connection()
+    connecting = threading.Event()
+    release = threading.Event()
+    
+    def slow_connect():
+        connecting.set()
+        release.wait(5)
+        return connection
+    
+    with patch('dthostmon.core.ssh_pool.time.monotonic', return_value=0):
+        pool.acquire('10.0.0.1', 22, 'monitor', Mock(return_value=_mock_connection(active=False)))
+    with patch('dthostmon.core.ssh_pool.time.monotonic', return_value=100):
+        acquiring = threading.Thread(target=pool.acquire, args=('10.0.0.1', 22, 'monitor', slow_connect))
+        acquiring.start()
+        assert connecting.wait(5)
+        assert pool.prune_idle() == 0
+        
+        discarding = threading.Thread(target=pool.discard, args=('10.0.0.1', 22, 'monitor'))
+        discarding.start()
+        discarding.join(0.1)
+        assert discarding.is_alive()
+        
+        release.set()
+        acquiring.join(5)
+        discarding.join(5)
+    
+    connection.close.assert_called_once()
+    assert len(pool) == 0
+
+
+def test_ssh_client_uses_pool_and_keeps_connection_open():
+    """Test SSHClient acquires from the pool and does not close on disconnect"""
+    pool = SSHConnectionPool()
+    connection = _mock_connection()
+    
+    with patch.object(SSHClient, '_open_connection', return_value=connection) as mock_open:
+        with SSHClient('10.0.0.1', 22, 'monitor', '/tmp/key', pool=pool) as client:
+            assert client.client is connection
+        with SSHClient('10.0.0.1', 22, 'monitor', '/tmp/key', pool=pool) as client:
+            assert client.client is connection
+    
+    assert mock_open.call_count == 1
+    connection.close.assert_not_called()
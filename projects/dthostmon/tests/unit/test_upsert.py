@@ -0,0 +1,34 @@
+"""
+Unit tests for the dialect-aware upsert helper
+Last Updated: 10/16/2026 12:00:00 PM CDT
+"""
+
+import pytest
+from datetime import datetime
+from dthostmon.models.database import LogBlob
+from dthostmon.models.upsert import upsert
+
+
+def _blob(blob_hash, ref_count):
+    return {'hash': blob_hash, 'content': f'content {blob_hash}', 'size': 9, 'ref_count': ref_count,
+            'created_at': datetime(2026, 10, 16)}
+
+
+@pytest.mark.parametrize('dialect', ['sqlite', 'other'])
+def test_upsert_inserts_and_updates(db_manager, monkeypatch, dialect):
+    """Test new rows are inserted and existing rows updated, by ON CONFLICT and the fallback"""
+    # Databases without ON CONFLICT update each row, then insert the unmatched ones
+    monkeypatch.setattr(db_manager.engine.dialect, 'name', dialect)
+    
+    def write(rows, update_cols):
+        with db_manager.get_session() as session:
+            upsert(session, LogBlob, rows, [LogBlob.hash], update_cols)
+    
+    write([_blob('a', 1)], ['ref_count'])
+    write([_blob('a', 2), _blob('b', 1)],
+          {'ref_count': lambda new: LogBlob.ref_count + new.ref_count})
+    write([_blob('b', 5)], ['ref_count'])
+    
+    with db_manager.get_session() as session:
+        counts = dict(session.query(LogBlob.hash, LogBlob.ref_count).all())
+    assert counts == {'a': 3, 'b': 5}